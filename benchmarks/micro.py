@@ -0,0 +1,251 @@
+"""
+Microbenchmarks for the cogs' synchronous hot functions.
+
+Times the pure building blocks we call thousands of times a minute
+(rarity rolls, item names, achievement checks, drop message text, drop
+eligibility over big guilds, modelbag pages) with fixed seeds and
+synthetic data, so it runs offline in a few seconds.
+
+Every result is also expressed relative to a fixed pure-Python
+calibration loop timed in the same run. Baselines stored in
+micro_baseline.json are compared on that relative cost, so a faster or
+slower machine doesn't read as a change in the code:
+
+    python benchmarks/micro.py                    # run and compare to the baseline
+    python benchmarks/micro.py --only eligible    # just the matching benchmarks
+    python benchmarks/micro.py --update-baseline  # record this run as the new baseline
+
+Exits non-zero when a benchmark is more than --tolerance slower than its
+baseline (default: twice as slow; shared machines easily jitter by half,
+and the regressions this is for are multiples). Needs discord.py and Red installed (the cogs are imported unchanged).
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from model import model as model_mod  # noqa: E402
+from reason import reason as reason_mod  # noqa: E402
+from reason.achievements import get_unlocked_achievements  # noqa: E402
+
+BASELINE = Path(__file__).with_name("micro_baseline.json")
+
+
+# ---------------------------------------------------------------------------
+# Synthetic inputs
+# ---------------------------------------------------------------------------
+
+
+class FakeMember:
+    __slots__ = ("id", "bot", "mention", "display_name")
+
+    def __init__(self, member_id: int, bot: bool = False):
+        self.id = member_id
+        self.bot = bot
+        self.mention = f"<@{member_id}>"
+        self.display_name = f"member{member_id}"
+
+
+class FakePermissions:
+    __slots__ = ("view_channel",)
+
+    def __init__(self, view_channel: bool):
+        self.view_channel = view_channel
+
+
+class FakeChannel:
+    """About 80% of members can see it; the check itself is a dict lookup, so the loop is what's measured."""
+
+    def __init__(self, members: list[FakeMember]):
+        self._perms = {m.id: FakePermissions(m.id % 5 != 0) for m in members}
+
+    def permissions_for(self, member: FakeMember) -> FakePermissions:
+        return self._perms[member.id]
+
+
+class FakeGuild:
+    def __init__(self, size: int, rng: random.Random):
+        # 2% bots, like a typical community server
+        self.members = [FakeMember(10_000 + i, bot=rng.random() < 0.02) for i in range(size)]
+
+
+def _items(n: int, rng: random.Random) -> list[dict]:
+    items = []
+    for i in range(n):
+        rarity, _, emoji = model_mod.pick_rarity()
+        items.append({"name": model_mod.generate_item_for(rarity), "rarity": rarity, "emoji": emoji,
+                      "ts": 1_700_000_000 + rng.randrange(10_000_000)})
+    return items
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks: name -> setup(rng) returning the zero-argument call to time
+# ---------------------------------------------------------------------------
+
+
+def bench_pick_rarity(rng: random.Random) -> Callable[[], object]:
+    return model_mod.pick_rarity
+
+
+def bench_generate_item_for(rng: random.Random) -> Callable[[], object]:
+    rarities = [r[0] for r in model_mod.RARITY_WEIGHTS]
+    generate = model_mod.generate_item_for
+    return lambda: [generate(r) for r in rarities]  # one of each rarity per call
+
+
+def bench_unlocked_achievements(rng: random.Random) -> Callable[[], object]:
+    record = {"total_claims": 37, "streak": 6, "points": 420, "total_steals_success": 2, "total_ws": 11}
+    return lambda: get_unlocked_achievements(record)
+
+
+def bench_reason_message_content(rng: random.Random) -> Callable[[], object]:
+    member = FakeMember(1234)
+    # a typical line plus one long enough to need trimming
+    texts = ["I can't, my houseplant has a recital tonight.", "because " * 300]
+    build = reason_mod.Reason._build_reason_message_content
+    return lambda: [build(None, member=member, reason_text=t) for t in texts]
+
+
+def _bench_eligible(size: int) -> Callable[[random.Random], Callable[[], object]]:
+    def setup(rng: random.Random) -> Callable[[], object]:
+        guild = FakeGuild(size, rng)
+        channel = FakeChannel(guild.members)
+        # opted-out members as Config stores them: a plain list
+        opt_out = [m.id for m in rng.sample(guild.members, min(500, size // 20))]
+        eligible = reason_mod.Reason._eligible_members_for_channel
+        return lambda: eligible(None, guild=guild, channel=channel, opt_out=opt_out)
+
+    return setup
+
+
+def bench_modelbag_pages(rng: random.Random) -> Callable[[], object]:
+    items = _items(model_mod.INVENTORY_CAP, rng)
+    return lambda: model_mod.build_bag_pages("member", items)
+
+
+BENCHMARKS: dict[str, Callable[[random.Random], Callable[[], object]]] = {
+    "pick_rarity": bench_pick_rarity,
+    "generate_item_for": bench_generate_item_for,
+    "get_unlocked_achievements": bench_unlocked_achievements,
+    "build_reason_message_content": bench_reason_message_content,
+    "eligible_members_10k": _bench_eligible(10_000),
+    "eligible_members_100k": _bench_eligible(100_000),
+    "modelbag_pages_5000": bench_modelbag_pages,
+}
+
+
+# ---------------------------------------------------------------------------
+# Timing
+# ---------------------------------------------------------------------------
+
+
+def _calibration() -> int:
+    total = 0
+    for i in range(2000):
+        total += i * i % 7
+    return total
+
+
+def measure(fn: Callable[[], object], min_time: float, repeat: int) -> float:
+    """Best seconds per call over ``repeat`` runs of at least ``min_time`` each."""
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - t0
+        if elapsed >= min_time:
+            break
+        # aim just past min_time, at most 10x more calls per step
+        number = max(number + 1, int(number * min(10.0, 1.2 * min_time / max(elapsed, 1e-9))))
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - t0) / number)
+    return best
+
+
+def run(names: list[str], min_time: float, repeat: int, seed: int) -> dict:
+    calibration = measure(_calibration, min_time, repeat)
+    results = {}
+    for name in names:
+        random.seed(seed)  # the cogs draw from the module-level RNG
+        fn = BENCHMARKS[name](random.Random(seed))
+        seconds = measure(fn, min_time, repeat)
+        results[name] = {"us_per_call": seconds * 1e6, "relative": seconds / calibration}
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "calibration_us": calibration * 1e6,
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    failures = []
+    for name, r in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            continue
+        ratio = r["relative"] / base["relative"]
+        if ratio > 1 + tolerance:
+            failures.append(f"{name} is {ratio:.2f}x its baseline (tolerance {1 + tolerance:.2f}x)")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--only", action="append", default=[], help="run benchmarks whose name contains this")
+    parser.add_argument("--min-time", type=float, default=0.05, help="seconds per timing run")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tolerance", type=float, default=1.0, help="allowed slowdown, as a fraction of the baseline")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--json", type=Path, help="also write the full result here")
+    args = parser.parse_args()
+
+    names = [n for n in BENCHMARKS if not args.only or any(o in n for o in args.only)]
+    if not names:
+        print(f"no benchmark matches {args.only}; have {', '.join(BENCHMARKS)}")
+        return 2
+    current = run(names, args.min_time, args.repeat, args.seed)
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+
+    print(f"calibration {current['calibration_us']:.1f}us (python {current['python']}, {current['machine']})")
+    for name, r in current["results"].items():
+        line = f"  {name:<30} {r['us_per_call']:>12.2f}us  {r['relative']:>10.3f}x cal"
+        base = baseline.get("results", {}).get(name)
+        if base is not None:
+            line += f"  baseline {base['relative']:>10.3f}x  ({r['relative'] / base['relative']:.2f})"
+        print(line)
+    if args.json:
+        args.json.write_text(json.dumps(current, indent=2))
+
+    if args.update_baseline:
+        if baseline and args.only:
+            # keep entries for benchmarks that weren't run
+            baseline["results"].update(current["results"])
+            current = {**current, "results": baseline["results"]}
+        args.baseline.write_text(json.dumps(current, indent=2) + "\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    failures = compare(current, baseline, args.tolerance)
+    for f in failures:
+        print(f"FAIL: {f}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,519 @@
+"""
+Offline button-storm benchmark for the Reason cog.
+
+Fires thousands of synthetic clicks (reroll, claim, W/L, steal, mute) at
+PersistentReasonView and ReasonGameView through fake interactions, with an
+in-memory Config standing in for Red's storage. Nothing touches the network.
+
+Reports acknowledgement latency percentiles per button, storage operations
+per click (including the write-behind flushes), message edits per click
+and event-loop lag, then
+checks every member's stored points against a ledger rebuilt from the
+responses, so a lost update shows up as a mismatch.
+
+Needs discord.py and Red installed (the cog is imported unchanged):
+
+    python benchmarks/reason_button_storm.py --clicks 5000 --seed 1
+    python benchmarks/reason_button_storm.py --thresholds benchmarks/storm_thresholds.json
+
+Exits non-zero when a threshold is exceeded or any update was lost in any
+run. Where a flush lands relative to unload varies from run to run, so a
+single clean run proves little; ``--runs`` repeats the storm with seeds
+``seed, seed + 1, ...`` and every one has to pass.
+"""
+
+import argparse
+import asyncio
+import copy
+import json
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from reason import reason as reason_mod  # noqa: E402
+
+# ---------------------------------------------------------------------------
+# In-memory Config
+# ---------------------------------------------------------------------------
+
+_MISSING = object()
+
+
+class MemoryStore:
+    """Records keyed by (category, *primary key); every access counts as one storage op."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.records: dict[tuple, dict] = {}
+        self.reads = 0
+        self.writes = 0
+
+    async def _io(self) -> None:
+        # Always yield, so handlers interleave the way they would on a real driver.
+        await asyncio.sleep(self.latency)
+
+    async def read(self, key: tuple, defaults: dict, field: str | None = None):
+        self.reads += 1
+        await self._io()
+        record = self.records.get(key, {})
+        if field is None:
+            return copy.deepcopy({**defaults, **record})
+        return copy.deepcopy(record.get(field, defaults.get(field)))
+
+    async def write(self, key: tuple, value, field: str | None = None) -> None:
+        self.writes += 1
+        await self._io()
+        if field is None:
+            self.records[key] = copy.deepcopy(value) if value is not _MISSING else {}
+        elif value is _MISSING:
+            self.records.get(key, {}).pop(field, None)
+        else:
+            self.records.setdefault(key, {})[field] = copy.deepcopy(value)
+
+
+class _MemCtx:
+    def __init__(self, value: "MemValue"):
+        self._value = value
+
+    def __await__(self):
+        return self._value._get().__await__()
+
+    async def __aenter__(self):
+        self._raw = await self._value._get()
+        return self._raw
+
+    async def __aexit__(self, *exc):
+        await self._value.set(self._raw)
+
+
+class MemValue:
+    def __init__(self, store: MemoryStore, key: tuple, field: str, defaults: dict):
+        self._store, self._key, self._field, self._defaults = store, key, field, defaults
+
+    def __call__(self) -> _MemCtx:
+        return _MemCtx(self)
+
+    async def _get(self):
+        return await self._store.read(self._key, self._defaults, self._field)
+
+    async def set(self, value) -> None:
+        await self._store.write(self._key, value, self._field)
+
+    async def clear(self) -> None:
+        await self._store.write(self._key, _MISSING, self._field)
+
+
+class MemGroup:
+    def __init__(self, store: MemoryStore, key: tuple, defaults: dict):
+        self._store, self._key, self._defaults = store, key, defaults
+
+    def __getattr__(self, name: str) -> MemValue:
+        if name.startswith("_") or name not in self._defaults:
+            raise AttributeError(name)
+        return MemValue(self._store, self._key, name, self._defaults)
+
+    async def all(self) -> dict:
+        return await self._store.read(self._key, self._defaults)
+
+    async def set(self, value: dict) -> None:
+        await self._store.write(self._key, value)
+
+    async def clear(self) -> None:
+        await self._store.write(self._key, _MISSING)
+
+    async def get_raw(self, key: str, default=None):
+        value = await self._store.read(self._key, self._defaults, key)
+        return default if value is None else value
+
+    async def set_raw(self, key: str, *, value) -> None:
+        await self._store.write(self._key, value, key)
+
+    async def clear_raw(self, key: str) -> None:
+        await self._store.write(self._key, _MISSING, key)
+
+
+class MemoryConfig:
+    """The subset of Red's Config API the cogs use, backed by a MemoryStore."""
+
+    store: MemoryStore  # set by the benchmark before the cog is built
+
+    def __init__(self):
+        self._guild: dict = {}
+        self._member: dict = {}
+        self._global: dict = {}
+        self._custom: dict[str, dict] = {}
+
+    @classmethod
+    def get_conf(cls, cog, identifier: int, force_registration: bool = False) -> "MemoryConfig":
+        return cls()
+
+    def register_guild(self, **defaults) -> None:
+        self._guild.update(defaults)
+
+    def register_member(self, **defaults) -> None:
+        self._member.update(defaults)
+
+    def register_global(self, **defaults) -> None:
+        self._global.update(defaults)
+
+    def init_custom(self, name: str, identifier_count: int) -> None:
+        self._custom.setdefault(name, {})
+
+    def register_custom(self, name: str, **defaults) -> None:
+        self._custom[name].update(defaults)
+
+    def custom(self, name: str, *identifiers: str) -> MemGroup:
+        return MemGroup(self.store, ("CUSTOM", name, *identifiers), self._custom[name])
+
+    def guild_from_id(self, guild_id: int) -> MemGroup:
+        return MemGroup(self.store, ("GUILD", guild_id), self._guild)
+
+    def guild(self, guild) -> MemGroup:
+        return self.guild_from_id(guild.id)
+
+    def member_from_ids(self, guild_id: int, member_id: int) -> MemGroup:
+        return MemGroup(self.store, ("MEMBER", guild_id, member_id), self._member)
+
+    def member(self, member) -> MemGroup:
+        return self.member_from_ids(member.guild.id, member.id)
+
+    async def all_guilds(self) -> dict:
+        self.store.reads += 1
+        return {
+            key[1]: copy.deepcopy({**self._guild, **rec})
+            for key, rec in self.store.records.items() if key[0] == "GUILD"
+        }
+
+    async def all_members(self, guild=None) -> dict:
+        self.store.reads += 1
+        out: dict = {}
+        for key, rec in self.store.records.items():
+            if key[0] == "MEMBER" and (guild is None or key[1] == guild.id):
+                out.setdefault(key[1], {})[key[2]] = copy.deepcopy({**self._member, **rec})
+        return out[guild.id] if guild is not None else out
+
+    def __getattr__(self, name: str) -> MemValue:
+        if name.startswith("_") or name not in self._global:
+            raise AttributeError(name)
+        return MemValue(self.store, ("GLOBAL",), name, self._global)
+
+
+# ---------------------------------------------------------------------------
+# Fake discord objects
+# ---------------------------------------------------------------------------
+
+
+class FakeMember:
+    bot = False
+
+    def __init__(self, guild: "FakeGuild", member_id: int):
+        self.guild = guild
+        self.id = member_id
+        self.name = self.display_name = f"member{member_id}"
+        self.mention = f"<@{member_id}>"
+
+
+class FakeGuild:
+    def __init__(self, guild_id: int, member_count: int):
+        self.id = guild_id
+        self.name = f"guild{guild_id}"
+        self.members = [FakeMember(self, 1000 + i) for i in range(member_count)]
+        self._by_id = {m.id: m for m in self.members}
+
+    def get_member(self, member_id: int):
+        return self._by_id.get(member_id)
+
+    def get_channel(self, channel_id: int):
+        return None
+
+
+class FakeChannel:
+    def __init__(self, channel_id: int):
+        self.id = channel_id
+
+
+class FakeMessage:
+    def __init__(self, message_id: int, channel: FakeChannel):
+        self.id = message_id
+        self.channel = channel
+        self.edits = 0
+
+    async def edit(self, **kwargs) -> None:
+        self.edits += 1
+
+
+class FakeResponse:
+    def __init__(self):
+        self.acked_at: float | None = None
+        self.content = ""
+
+    def _ack(self, content: str = "") -> None:
+        if self.acked_at is not None:
+            raise RuntimeError("interaction responded to twice")
+        self.acked_at = time.perf_counter()
+        self.content = content
+
+    def is_done(self) -> bool:
+        return self.acked_at is not None
+
+    async def send_message(self, content: str = "", **kwargs) -> None:
+        self._ack(content)
+
+    async def edit_message(self, **kwargs) -> None:
+        self._ack()
+
+    async def defer(self, **kwargs) -> None:
+        self._ack()
+
+
+class FakeInteraction:
+    def __init__(self, *, user: FakeMember, message: FakeMessage, custom_id: str):
+        self.user = user
+        self.guild = user.guild
+        self.message = message
+        self.response = FakeResponse()
+        self.data = {"custom_id": custom_id}
+
+
+class FakeBot:
+    def __init__(self, guild: FakeGuild):
+        self.guilds = [guild]
+        self._never = asyncio.Event()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return asyncio.get_running_loop()
+
+    async def wait_until_ready(self) -> None:
+        # Keeps the scheduled drop and announcement loops parked for the run.
+        await self._never.wait()
+
+    def get_guild(self, guild_id: int):
+        return self.guilds[0] if self.guilds[0].id == guild_id else None
+
+    def add_view(self, view) -> None:
+        pass
+
+
+# ---------------------------------------------------------------------------
+# Storm
+# ---------------------------------------------------------------------------
+
+# (button attribute, custom_id, weight, clicked by the drop's target)
+BUTTONS = [
+    ("reroll", "reason_reroll", 15, True),
+    ("claim", "reason_claim", 30, True),
+    ("rate_w", "reason_w", 20, True),
+    ("rate_l", "reason_l", 10, True),
+    ("steal", "reason_steal", 20, False),
+    ("mute_drops", "reason_mute", 5, False),
+]
+_GAIN = re.compile(r"\+(\d+) pts")
+_STOLE = re.compile(r"Stole (\d+) pts")
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def monitor_lag(samples: list[float], stop: asyncio.Event, interval: float = 0.005) -> None:
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(time.perf_counter() - t0 - interval)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    random.seed(args.seed)
+    rng = random.Random(args.seed)
+    store = MemoryStore(args.storage_latency_ms / 1000)
+    MemoryConfig.store = store
+    tmp = tempfile.TemporaryDirectory()
+    reason_mod.Config = MemoryConfig
+    reason_mod.cog_data_path = lambda cog=None, raw_name=None: Path(tmp.name)
+
+    guild = FakeGuild(1, args.members)
+    bot = FakeBot(guild)
+    cog = reason_mod.Reason(bot)
+    await cog.cog_load()
+    await cog._leaderboard_task
+    persistent = reason_mod.PersistentReasonView(cog)
+    pool = await cog._reason_pool(guild)
+
+    # Half the drops are live game views, half only exist as persisted state
+    # (as after a restart) and go through the persistent view.
+    drops = []
+    states = {}
+    for i in range(args.drops):
+        target = rng.choice(guild.members)
+        text = pool.choice()
+        message = FakeMessage(10_000 + i, FakeChannel(20_000 + i))
+        if i % 2:
+            view = reason_mod.ReasonGameView(cog, target_user_id=target.id, reason_text=text, pool=pool)
+            view.message = message
+        else:
+            view = persistent
+            states[str(message.id)] = {
+                "target_user_id": target.id, "reason_text": text,
+                "rerolls_left": 2, "claimed": False, "rated": False,
+            }
+        drops.append((view, message, target))
+    await cog._cold(guild.id).drop_states.set(states)
+
+    expected = {m.id: 0 for m in guild.members}
+    latencies: dict[str, list[float]] = {b[1]: [] for b in BUTTONS}
+    durations: list[float] = []
+    errors: list[str] = []
+    weights = [b[2] for b in BUTTONS]
+
+    async def click(view, message: FakeMessage, target: FakeMember) -> None:
+        attr, custom_id, _, by_target = rng.choices(BUTTONS, weights=weights)[0]
+        user = target if by_target else rng.choice(guild.members)
+        interaction = FakeInteraction(user=user, message=message, custom_id=custom_id)
+        t0 = time.perf_counter()
+        try:
+            if await view.interaction_check(interaction):
+                await getattr(view, attr).callback(interaction)
+        except Exception as e:
+            errors.append(f"{custom_id}: {type(e).__name__}: {e}")
+            return
+        durations.append(time.perf_counter() - t0)
+        if interaction.response.acked_at is None:
+            errors.append(f"{custom_id}: never acknowledged")
+            return
+        latencies[custom_id].append(interaction.response.acked_at - t0)
+        content = interaction.response.content
+        stole = _STOLE.search(content)
+        if stole:
+            expected[user.id] += int(stole.group(1))
+            expected[target.id] -= int(stole.group(1))
+        elif custom_id in ("reason_claim", "reason_w", "reason_l"):
+            gain = _GAIN.search(content)
+            if gain:
+                expected[user.id] += int(gain.group(1))
+
+    lag: list[float] = []
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(monitor_lag(lag, stop))
+    ops_before = store.reads + store.writes
+
+    started = time.perf_counter()
+    tasks = []
+    for _ in range(args.clicks):
+        tasks.append(asyncio.create_task(click(*rng.choice(drops))))
+        # Poisson arrivals at --rate clicks per second.
+        await asyncio.sleep(rng.expovariate(args.rate))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await lag_task
+    await cog.cog_unload()  # flushes votes, write-behind member records and queued edits
+    edits = sum(message.edits for _, message, _ in drops)
+    ops = store.reads + store.writes - ops_before
+
+    lost = []
+    for member_id, points in expected.items():
+        stored = store.records.get(("MEMBER", guild.id, member_id), {}).get("points", 0)
+        if stored != points:
+            lost.append((member_id, points, stored))
+    tmp.cleanup()
+
+    all_latencies = [v for vals in latencies.values() for v in vals]
+    return {
+        "clicks": args.clicks,
+        "elapsed_s": elapsed,
+        "errors": errors,
+        "ack_ms": {
+            name: {"n": len(v), "p50": percentile(v, 50) * 1000, "p95": percentile(v, 95) * 1000,
+                   "p99": percentile(v, 99) * 1000, "max": max(v, default=0) * 1000}
+            for name, v in [("all", all_latencies), *latencies.items()]
+        },
+        "handler_p99_ms": percentile(durations, 99) * 1000,
+        "ops_per_click": ops / max(1, args.clicks),
+        "storage_reads": store.reads,
+        "storage_writes": store.writes,
+        "edits_per_click": edits / max(1, args.clicks),
+        "loop_lag_ms": {"p50": percentile(lag, 50) * 1000, "p99": percentile(lag, 99) * 1000,
+                        "max": max(lag, default=0) * 1000},
+        "lost_updates": len(lost),
+        "lost_examples": lost[:5],
+    }
+
+
+def check(result: dict, thresholds: dict) -> list[str]:
+    failures = []
+    limits = {
+        "ack_p99_ms": result["ack_ms"]["all"]["p99"],
+        "ops_per_click": result["ops_per_click"],
+        "loop_lag_p99_ms": result["loop_lag_ms"]["p99"],
+    }
+    for name, value in limits.items():
+        if name in thresholds and value > thresholds[name]:
+            failures.append(f"{name} {value:.2f} > {thresholds[name]}")
+    if result["lost_updates"]:
+        failures.append(f"{result['lost_updates']} members lost updates, e.g. {result['lost_examples']}")
+    if result["errors"]:
+        failures.append(f"{len(result['errors'])} handler errors, e.g. {result['errors'][:3]}")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--clicks", type=int, default=3000)
+    parser.add_argument("--rate", type=float, default=1000.0, help="mean clicks per second")
+    parser.add_argument("--members", type=int, default=200)
+    parser.add_argument("--drops", type=int, default=100)
+    parser.add_argument("--storage-latency-ms", type=float, default=0.5, help="simulated cost of each Config op")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--runs", type=int, default=5, help="repeat with seeds seed..seed+runs-1; all must pass")
+    parser.add_argument("--thresholds", type=Path, default=Path(__file__).with_name("storm_thresholds.json"))
+    parser.add_argument("--json", type=Path, help="also write the full result here")
+    args = parser.parse_args()
+
+    thresholds = json.loads(args.thresholds.read_text()) if args.thresholds.exists() else {}
+    results = []
+    failed = 0
+    for i in range(args.runs):
+        if i:
+            print()
+        result = asyncio.run(run(argparse.Namespace(**{**vars(args), "seed": args.seed + i})))
+        results.append(result)
+        failed += report(result, thresholds)
+    if args.json:
+        args.json.write_text(json.dumps(results[0] if args.runs == 1 else results, indent=2))
+    if args.runs > 1:
+        print(f"\n{args.runs - failed}/{args.runs} runs passed")
+    return 1 if failed else 0
+
+
+def report(result: dict, thresholds: dict) -> bool:
+    """Print one run's result; returns whether it failed."""
+    ack = result["ack_ms"]
+    print(f"{result['clicks']} clicks in {result['elapsed_s']:.2f}s")
+    for name, s in ack.items():
+        print(f"  ack {name:<14} n={s['n']:<5} p50={s['p50']:.2f}ms p95={s['p95']:.2f}ms "
+              f"p99={s['p99']:.2f}ms max={s['max']:.2f}ms")
+    print(f"  handler p99     {result['handler_p99_ms']:.2f}ms")
+    print(f"  storage ops     {result['ops_per_click']:.2f}/click "
+          f"({result['storage_reads']} reads, {result['storage_writes']} writes)")
+    print(f"  message edits   {result['edits_per_click']:.2f}/click")
+    lag = result["loop_lag_ms"]
+    print(f"  loop lag        p50={lag['p50']:.2f}ms p99={lag['p99']:.2f}ms max={lag['max']:.2f}ms")
+    print(f"  lost updates    {result['lost_updates']}")
+    failures = check(result, thresholds)
+    for f in failures:
+        print(f"FAIL: {f}")
+    return bool(failures)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,473 @@
+"""
+Replay recorded traffic through the Model and Reason cogs offline.
+
+Takes one or more traces written by `modeldebug traceon` / `reasondebug
+traceon` (trace.jsonl in each cog's data folder) and feeds the events to
+the unchanged cogs, against the in-memory Config from
+reason_button_storm.py and fake Discord objects. Drops go through the
+cogs' own send paths (a fake channel hands back the recorded message id,
+and a Reason drop's channel is visible only to the recorded target), then
+`model` messages and commands, hybrid commands and Reason button clicks
+arrive at their recorded offsets:
+
+    python benchmarks/replay_trace.py model_trace.jsonl reason_trace.jsonl
+    python benchmarks/replay_trace.py trace.jsonl --speed 1      # real time
+    python benchmarks/replay_trace.py trace.jsonl --speed 20     # 20x faster
+    python benchmarks/replay_trace.py trace.jsonl --speed max    # no waiting between events
+
+The module RNG is seeded (--seed), so rarity rolls, reason draws and steal
+rolls are the same on every run of the same trace. At higher speeds the
+gaps that cooldowns measure shrink with the trace, so compare runs at the
+same --speed; --claim-window replays Model claims under arbitration
+(earliest message wins) instead of the claim lock. Reason drops keep the dispatcher's send pacing (a second
+per channel), as they would live. Commands that take arguments the trace
+doesn't keep (search, pack, channel settings) are counted but not
+replayed.
+
+Reports per-event handler latency, claim outcomes, storage operations,
+REST calls the cogs would have made and event-loop lag. Needs discord.py
+and Red installed.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+from collections import Counter
+from pathlib import Path
+
+import discord
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from model import model as model_mod  # noqa: E402
+from reason import reason as reason_mod  # noqa: E402
+from reason_button_storm import FakeResponse, MemoryConfig, MemoryStore, monitor_lag, percentile  # noqa: E402
+
+BUTTONS = {
+    "reason_reroll": "reroll",
+    "reason_claim": "claim",
+    "reason_w": "rate_w",
+    "reason_l": "rate_l",
+    "reason_steal": "steal",
+    "reason_mute": "mute_drops",
+}
+# Commands whose only argument is an optional member (defaulting to the caller).
+MODEL_COMMANDS = {"model": "model_cmd", "modelbag": "modelbag"}
+REASON_COMMANDS = {"reason wallet": "reason_wallet", "reason stats": "reason_stats",
+                   "reason top": "reason_top", "reason rank": "reason_rank"}
+
+
+def load_events(paths: list[Path]) -> list[dict]:
+    """Every event from every trace, tagged with its cog and ordered by wall-clock time."""
+    events = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if header.get("trace") != 1:
+                raise ValueError(f"{path} is not a trace file")
+            for line in f:
+                if line.strip():
+                    ev = json.loads(line)
+                    ev["cog"] = header["cog"]
+                    ev["at"] = header["started_at"] + ev["t"]
+                    events.append(ev)
+    events.sort(key=lambda e: e["at"])
+    return events
+
+
+# ---------------------------------------------------------------------------
+# Fake discord objects
+# ---------------------------------------------------------------------------
+
+
+class Rest:
+    """Counts the REST calls the cogs make, by kind."""
+
+    def __init__(self):
+        self.calls: Counter = Counter()
+
+
+class FakeMember:
+    bot = False
+
+    def __init__(self, guild: "FakeGuild", member_id: int):
+        self.guild = guild
+        self.id = member_id
+        self.name = self.display_name = f"member{member_id}"
+        self.mention = f"<@{member_id}>"
+
+
+class FakeMessage:
+    def __init__(self, rest: Rest, message_id: int, *, guild=None, channel=None, author=None, content: str = ""):
+        self.rest = rest
+        self.id = message_id
+        self.guild, self.channel, self.author, self.content = guild, channel, author, content
+
+    async def edit(self, **kwargs) -> None:
+        self.rest.calls["edit"] += 1
+
+    async def add_reaction(self, emoji: str) -> None:
+        self.rest.calls["reaction"] += 1
+
+    async def reply(self, *args, **kwargs) -> "FakeMessage":
+        self.rest.calls["reply"] += 1
+        return FakeMessage(self.rest, 0, guild=self.guild, channel=self.channel)
+
+
+class FakePermissions:
+    def __init__(self, view_channel: bool):
+        self.view_channel = view_channel
+
+
+class FakeChannel(discord.abc.GuildChannel):
+    """Sends come back with ``next_message_id``; only ``visible_to`` passes permissions_for."""
+
+    def __init__(self, rest: Rest, guild: "FakeGuild", channel_id: int):
+        self.rest = rest
+        self.guild = guild
+        self.id = channel_id
+        self.name = f"channel{channel_id}"
+        self.next_message_id = 0
+        self.visible_to: int | None = None
+
+    def permissions_for(self, member) -> FakePermissions:  # type: ignore[override]
+        return FakePermissions(member.id == self.visible_to)
+
+    async def send(self, *args, **kwargs) -> FakeMessage:
+        self.rest.calls["send"] += 1
+        return FakeMessage(self.rest, self.next_message_id, guild=self.guild, channel=self)
+
+    def get_partial_message(self, message_id: int) -> FakeMessage:
+        return FakeMessage(self.rest, message_id, guild=self.guild, channel=self)
+
+
+class FakeGuild:
+    """Members and channels appear the first time the trace mentions them."""
+
+    def __init__(self, rest: Rest, guild_id: int):
+        self.rest = rest
+        self.id = guild_id
+        self.name = f"guild{guild_id}"
+        self._members: dict[int, FakeMember] = {}
+        self._channels: dict[int, FakeChannel] = {}
+
+    @property
+    def members(self) -> list[FakeMember]:
+        return list(self._members.values())
+
+    def member(self, member_id: int) -> FakeMember:
+        m = self._members.get(member_id)
+        if m is None:
+            m = self._members[member_id] = FakeMember(self, member_id)
+        return m
+
+    def channel(self, channel_id: int) -> FakeChannel:
+        c = self._channels.get(channel_id)
+        if c is None:
+            c = self._channels[channel_id] = FakeChannel(self.rest, self, channel_id)
+        return c
+
+    def get_member(self, member_id: int):
+        return self._members.get(member_id)
+
+    def get_channel(self, channel_id: int):
+        return self._channels.get(channel_id)
+
+
+class FakeInteraction:
+    def __init__(self, *, user: FakeMember, message: FakeMessage, channel_id: int, custom_id: str):
+        self.user = user
+        self.guild = user.guild
+        self.message = message
+        self.channel_id = channel_id
+        self.response = FakeResponse()
+        self.data = {"custom_id": custom_id}
+
+
+class FakeContext:
+    def __init__(self, rest: Rest, *, guild: FakeGuild, channel: FakeChannel, author: FakeMember,
+                 message: FakeMessage | None, slash: bool, interaction_id: int = 0):
+        self.rest = rest
+        self.guild, self.channel, self.author, self.message = guild, channel, author, message
+        self.interaction = SimpleNamespace(id=interaction_id) if slash else None
+        self.invoked_subcommand = None
+
+    async def send(self, *args, **kwargs) -> FakeMessage:
+        self.rest.calls["send"] += 1
+        return FakeMessage(self.rest, 0, guild=self.guild, channel=self.channel)
+
+    async def reply(self, *args, **kwargs) -> FakeMessage:
+        self.rest.calls["reply"] += 1
+        return FakeMessage(self.rest, 0, guild=self.guild, channel=self.channel)
+
+    async def defer(self, *args, **kwargs) -> None:
+        self.rest.calls["defer"] += 1
+
+
+class FakeBot:
+    def __init__(self, rest: Rest):
+        self.rest = rest
+        self._guilds: dict[int, FakeGuild] = {}
+        self._never = asyncio.Event()
+
+    @property
+    def guilds(self) -> list[FakeGuild]:
+        return list(self._guilds.values())
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return asyncio.get_running_loop()
+
+    async def wait_until_ready(self) -> None:
+        # Keeps the cogs' own schedulers parked; drops come from the trace.
+        await self._never.wait()
+
+    def guild(self, guild_id: int) -> FakeGuild:
+        g = self._guilds.get(guild_id)
+        if g is None:
+            g = self._guilds[guild_id] = FakeGuild(self.rest, guild_id)
+        return g
+
+    def get_guild(self, guild_id: int):
+        return self._guilds.get(guild_id)
+
+    def add_view(self, view) -> None:
+        pass
+
+
+# ---------------------------------------------------------------------------
+# Replay
+# ---------------------------------------------------------------------------
+
+
+class Replayer:
+    def __init__(self, bot: FakeBot, model, reason, claim_window: float = 0.0):
+        self.bot, self.model, self.reason = bot, model, reason
+        self.claim_window = claim_window
+        self.persistent = reason_mod.PersistentReasonView(reason)
+        self.game_views: dict[int, reason_mod.ReasonGameView] = {}
+        self.handled: Counter = Counter()
+        self.skipped: Counter = Counter()
+        self.latencies: dict[str, list[float]] = {}
+        self.errors: list[str] = []
+
+    async def dispatch(self, ev: dict) -> None:
+        kind = f"{ev['cog']}:{ev['event']}"
+        if ev["event"] == "command":
+            kind += f":{ev['name']}"
+        if ev.get("guild") is None:
+            self.skipped[kind] += 1
+            return
+        handler = getattr(self, f"_{ev['cog']}_{ev['event']}", None)
+        if handler is None:
+            self.skipped[kind] += 1
+            return
+        t0 = time.perf_counter()
+        try:
+            done = await handler(ev, self.bot.guild(ev["guild"]))
+        except Exception as e:
+            self.errors.append(f"{kind}: {type(e).__name__}: {e}")
+            return
+        if done is False:
+            self.skipped[kind] += 1
+            return
+        self.handled[kind] += 1
+        self.latencies.setdefault(kind, []).append(time.perf_counter() - t0)
+
+    def _ctx(self, ev: dict, guild: FakeGuild) -> FakeContext:
+        channel = guild.channel(ev["channel"])
+        author = guild.member(ev["user"])
+        message = None if ev.get("slash") else FakeMessage(
+            self.bot.rest, ev.get("message") or 0, guild=guild, channel=channel, author=author
+        )
+        return FakeContext(self.bot.rest, guild=guild, channel=channel, author=author, message=message,
+                           slash=bool(ev.get("slash")), interaction_id=ev.get("message") or 0)
+
+    # ---- Model ----
+
+    async def _model_drop(self, ev: dict, guild: FakeGuild):
+        channel = guild.channel(ev["channel"])
+        gconf = self.model.config.guild(guild)
+        if await gconf.drop_channel_id() != channel.id:
+            await gconf.drop_channel_id.set(channel.id)
+        if await gconf.claim_window() != self.claim_window:
+            await gconf.claim_window.set(self.claim_window)
+        state = self.model._states.get(guild.id)
+        if state and state.active_message_id and state.claimed_by is None:
+            return False  # the replay left the previous drop unrevealed
+        # `modeldebug dropnow` is the scheduled runner's send without its random sleep.
+        channel.next_message_id = ev["message"]
+        # its "debug drop sent" confirmation isn't drop traffic, so it goes to a throwaway counter
+        ctx = FakeContext(Rest(), guild=guild, channel=channel, author=None, message=None, slash=True)
+        await self.model.model_debug.callback(self.model, ctx, "dropnow")
+
+    async def _model_attempt(self, ev: dict, guild: FakeGuild):
+        channel = guild.channel(ev["channel"])
+        author = guild.member(ev["user"])
+        message = FakeMessage(self.bot.rest, ev["message"], guild=guild, channel=channel, author=author, content="model")
+        await self.model.on_message(message)
+
+    async def _model_command(self, ev: dict, guild: FakeGuild):
+        name = MODEL_COMMANDS.get(ev["name"])
+        if name is None:
+            return False
+        await getattr(self.model, name).callback(self.model, self._ctx(ev, guild))
+
+    # ---- Reason ----
+
+    async def _reason_drop(self, ev: dict, guild: FakeGuild):
+        channel = guild.channel(ev["channel"])
+        guild.member(ev["target"])
+        channel.next_message_id = ev["message"]
+        channel.visible_to = ev["target"]  # so the real eligibility check picks the recorded target
+        sent = await self.reason._send_reason_drop(guild=guild, channel_id=channel.id, title=ev.get("source") or "Reason")
+        channel.visible_to = None
+        if not sent:
+            return False  # e.g. the target opted out earlier in the replay
+        for view in list(reason_mod._game_views):
+            if view.message is not None and view.message.id == ev["message"]:
+                self.game_views[ev["message"]] = view
+
+    async def _reason_click(self, ev: dict, guild: FakeGuild):
+        attr = BUTTONS.get(ev.get("button"))
+        if attr is None or ev.get("message") is None:
+            return False
+        game = self.game_views.get(ev["message"])
+        if ev.get("view") == "game" and game is not None and not game.is_finished():
+            view, message = game, game.message
+        else:
+            view = self.persistent
+            message = FakeMessage(self.bot.rest, ev["message"], guild=guild, channel=guild.channel(ev["channel"]))
+        interaction = FakeInteraction(
+            user=guild.member(ev["user"]), message=message, channel_id=ev["channel"], custom_id=ev["button"]
+        )
+        if await view.interaction_check(interaction):
+            await getattr(view, attr).callback(interaction)
+        if not interaction.response.is_done():
+            raise RuntimeError(f"{ev['button']} never acknowledged")
+
+    async def _reason_command(self, ev: dict, guild: FakeGuild):
+        name = REASON_COMMANDS.get(ev["name"])
+        if name is None:
+            return False
+        await getattr(self.reason, name).callback(self.reason, self._ctx(ev, guild))
+
+
+def _counter_values(family) -> dict[str, int]:
+    return {",".join(k) or "total": c.value for k, c in family.children.items()}
+
+
+async def run(args: argparse.Namespace) -> dict:
+    events = load_events(args.traces)
+    random.seed(args.seed)
+    store = MemoryStore(args.storage_latency_ms / 1000)
+    MemoryConfig.store = store
+    tmp = tempfile.TemporaryDirectory()
+    for mod in (model_mod, reason_mod):
+        mod.Config = MemoryConfig
+        mod.cog_data_path = lambda cog=None, raw_name=None: Path(tmp.name)
+
+    rest = Rest()
+    bot = FakeBot(rest)
+    model = model_mod.Model(bot)
+    await model.cog_load()
+    reason = reason_mod.Reason(bot)
+    await reason.cog_load()
+    await reason._leaderboard_task
+    replayer = Replayer(bot, model, reason, claim_window=args.claim_window)
+    attempts_before = _counter_values(model_mod.CLAIM_ATTEMPTS)
+    claims_before = reason_mod.CLAIMS.labels().value
+    ops_before = store.reads + store.writes
+
+    lag: list[float] = []
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(monitor_lag(lag, stop))
+    started = time.perf_counter()
+    origin = events[0]["at"] if events else 0.0
+    tasks = []
+    for ev in events:
+        if args.speed != "max":
+            delay = (ev["at"] - origin) / float(args.speed) - (time.perf_counter() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        if ev["event"] == "drop":
+            # Later events may refer to the drop's message, so it is posted before moving on.
+            await replayer.dispatch(ev)
+        else:
+            tasks.append(asyncio.create_task(replayer.dispatch(ev)))
+            if args.speed == "max":
+                await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await lag_task
+    await reason.cog_unload()
+    await model.cog_unload()
+    ops = store.reads + store.writes - ops_before
+    tmp.cleanup()
+
+    attempts_after = _counter_values(model_mod.CLAIM_ATTEMPTS)
+    all_latencies = [v for vals in replayer.latencies.values() for v in vals]
+    return {
+        "events": len(events),
+        "traced_seconds": (events[-1]["at"] - origin) if events else 0.0,
+        "elapsed_s": elapsed,
+        "handled": dict(replayer.handled),
+        "skipped": dict(replayer.skipped),
+        "errors": replayer.errors,
+        "handler_ms": {
+            kind: {"n": len(v), "p50": percentile(v, 50) * 1000, "p99": percentile(v, 99) * 1000,
+                   "max": max(v, default=0) * 1000}
+            for kind, v in sorted([("all", all_latencies), *replayer.latencies.items()])
+        },
+        "model_attempts": {k: v - attempts_before.get(k, 0) for k, v in attempts_after.items()},
+        "reason_claims": reason_mod.CLAIMS.labels().value - claims_before,
+        "storage_ops": ops,
+        "storage_ops_per_event": ops / max(1, sum(replayer.handled.values())),
+        "rest_calls": dict(rest.calls),
+        "loop_lag_ms": {"p50": percentile(lag, 50) * 1000, "p99": percentile(lag, 99) * 1000,
+                        "max": max(lag, default=0) * 1000},
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("traces", type=Path, nargs="+", help="trace.jsonl files from either cog")
+    parser.add_argument("--speed", default="max", help="'max', or how many times faster than recorded (1 = real time)")
+    parser.add_argument("--storage-latency-ms", type=float, default=0.5, help="simulated cost of each Config op")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--claim-window", type=float, default=0.0,
+                        help="Model claim arbitration window in seconds (0 = first through the lock wins)")
+    parser.add_argument("--json", type=Path, help="also write the full result here")
+    args = parser.parse_args()
+    if args.speed != "max" and float(args.speed) <= 0:
+        parser.error("--speed must be 'max' or a positive number")
+
+    result = asyncio.run(run(args))
+    print(f"{result['events']} events ({result['traced_seconds']:.1f}s traced) replayed in {result['elapsed_s']:.2f}s")
+    for kind, s in result["handler_ms"].items():
+        print(f"  {kind:<28} n={s['n']:<6} p50={s['p50']:.2f}ms p99={s['p99']:.2f}ms max={s['max']:.2f}ms")
+    if result["skipped"]:
+        print(f"  skipped         {result['skipped']}")
+    print(f"  model attempts  {result['model_attempts']}")
+    print(f"  reason claims   {result['reason_claims']}")
+    print(f"  storage ops     {result['storage_ops']} ({result['storage_ops_per_event']:.2f}/event)")
+    print(f"  REST calls      {result['rest_calls']}")
+    lag = result["loop_lag_ms"]
+    print(f"  loop lag        p50={lag['p50']:.2f}ms p99={lag['p99']:.2f}ms max={lag['max']:.2f}ms")
+    for e in result["errors"][:10]:
+        print(f"ERROR: {e}")
+    if args.json:
+        args.json.write_text(json.dumps(result, indent=2))
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,9 @@
+"""
+Helpers both cogs use: Config profiling, stale-record collection, SQLite
+storage, metrics, event traces, leases, memory reports and paced outbound
+edits.
+
+Downloader installs this library with either cog as
+``cog_shared.itscube_common``; each cog's ``__init__`` makes it importable
+as ``itscube_common`` whichever way the cog was loaded.
+"""
@@ -0,0 +1,189 @@
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, Iterable
+
+import discord
+from redbot.core import Config
+
+
+def _size(value) -> int:
+    return len(json.dumps(value, default=str))
+
+
+def local_shards(bot) -> set[int]:
+    """Ids of the shards this process is connected to."""
+    shards = getattr(bot, "shards", None)  # AutoShardedClient
+    if shards:
+        return set(shards)
+    return {bot.shard_id or 0}
+
+
+def shard_of(guild_id: int, shard_count: int) -> int:
+    return (guild_id >> 22) % max(1, shard_count)
+
+
+@dataclass
+class SweepReport:
+    started_at: float = 0.0
+    duration: float = 0.0
+    guilds_removed: int = 0
+    members_removed: int = 0
+    entries_pruned: int = 0  # cog-specific leftovers inside live guilds
+    pending: int = 0  # departed, still inside the grace period
+    bytes_reclaimed: int = 0
+
+    def summary(self) -> str:
+        return (
+            f"{self.guilds_removed} guilds, {self.members_removed} members, "
+            f"{self.entries_pruned} entries removed ({self.bytes_reclaimed / 1024:.1f} KiB); "
+            f"{self.pending} waiting out the grace period; took {self.duration:.1f}s"
+        )
+
+
+class StaleRecordCollector:
+    """
+    Archives and deletes Config records for guilds the bot left and members
+    who left their guild.
+
+    The first sweep that finds a record departed stamps it in the global
+    ``gc_marks``; it is only removed once that stamp is ``GRACE`` seconds old,
+    and the stamp is dropped if the member or guild comes back. Members are
+    only judged in fully chunked guilds, since otherwise a missing member may
+    just be uncached. Guild data a cog keeps outside the guild scope (a
+    custom group) is swept with the guild when ``extra_guilds`` returns it;
+    ``all_members`` replaces the Config member scan for cogs that keep member
+    records elsewhere.
+    A sweep only judges guilds on shards this process runs: for any other
+    guild ``get_guild`` returns None even though the guild is live. In a
+    shard cluster each process sweeps its own shards, and the marks of the
+    rest are left as they are.
+    Removed records are appended to a JSON-lines archive
+    first. Work is paced (a pause every ``BATCH`` records) so a sweep never
+    hogs the event loop or the storage backend.
+    """
+
+    GRACE = 30 * 86400
+    BATCH = 100
+    PAUSE = 1.0
+
+    def __init__(
+        self,
+        bot,
+        config: Config,
+        archive_path: Path,
+        *,
+        clear_member: Callable[[int, int], Awaitable[None]],
+        clear_guild: Callable[[int], Awaitable[None]],
+        prune_guild: Callable[[discord.Guild, dict], Awaitable[tuple[int, int]]] | None = None,
+        extra_guilds: Callable[[], Awaitable[dict[int, dict]]] | None = None,
+        all_members: Callable[[], Awaitable[dict[int, dict[int, dict]]]] | None = None,
+    ):
+        self.bot = bot
+        self.config = config
+        self.archive_path = archive_path
+        self.clear_member = clear_member
+        self.clear_guild = clear_guild
+        self.prune_guild = prune_guild
+        self.extra_guilds = extra_guilds
+        self.all_members = all_members or config.all_members
+        self.last_report: SweepReport | None = None
+        self._lock = asyncio.Lock()
+        self._marks: dict[str, float] = {}
+        self._seen: set[str] = set()
+        self._now = 0.0
+        self._ops = 0
+
+    def departed(self, key: str) -> bool:
+        """Note ``key`` as missing this sweep; True once it has been missing for the whole grace period."""
+        self._seen.add(key)
+        first = self._marks.setdefault(key, self._now)
+        if self._now - first >= self.GRACE:
+            self._seen.discard(key)  # removed now, so no mark to keep
+            return True
+        return False
+
+    async def _pace(self) -> None:
+        self._ops += 1
+        if self._ops % self.BATCH == 0:
+            await asyncio.sleep(self.PAUSE)
+
+    def _archive(self, entry: dict) -> None:
+        with open(self.archive_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, default=str) + "\n")
+
+    async def _remove(self, entry: dict, report: SweepReport) -> None:
+        entry["removed_at"] = self._now
+        await asyncio.to_thread(self._archive, entry)
+        report.bytes_reclaimed += _size(entry)
+
+    async def sweep(self, shards: Iterable[int] | None = None) -> SweepReport:
+        """Sweep the guilds on ``shards`` (default: every shard this process runs)."""
+        async with self._lock:
+            report = SweepReport(started_at=time.time())
+            self._now = report.started_at
+            self._seen = set()
+            local = local_shards(self.bot)
+            swept = local if shards is None else local & set(shards)
+            shard_count = self.bot.shard_count or 1
+
+            def ours(guild_id: int) -> bool:
+                return shard_of(guild_id, shard_count) in swept
+
+            self._marks = dict(await self.config.gc_marks())
+            all_guilds = await self.config.all_guilds()
+            all_members = await self.all_members()
+            extras = await self.extra_guilds() if self.extra_guilds is not None else {}
+
+            for guild_id in set(all_guilds) | set(all_members) | set(extras):
+                if not ours(guild_id):
+                    continue
+                guild = self.bot.get_guild(guild_id)
+                members = all_members.get(guild_id, {})
+                if guild is None:
+                    if not self.departed(str(guild_id)):
+                        report.pending += 1
+                        continue
+                    entry = {"guild_id": guild_id, "guild": all_guilds.get(guild_id), "members": members}
+                    if guild_id in extras:
+                        entry["extra"] = extras[guild_id]
+                    await self._remove(entry, report)
+                    for member_id in members:
+                        await self.clear_member(guild_id, member_id)
+                        await self._pace()
+                    await self.clear_guild(guild_id)
+                    report.guilds_removed += 1
+                    report.members_removed += len(members)
+                    continue
+
+                if self.prune_guild is not None:
+                    data = {**all_guilds.get(guild_id, {}), **extras.get(guild_id, {})}
+                    removed, nbytes = await self.prune_guild(guild, data)
+                    report.entries_pruned += removed
+                    report.bytes_reclaimed += nbytes
+                await self._pace()
+                if not guild.chunked:
+                    continue
+                for member_id, data in members.items():
+                    if guild.get_member(member_id) is not None:
+                        continue
+                    if not self.departed(f"{guild_id}:{member_id}"):
+                        report.pending += 1
+                        continue
+                    await self._remove({"guild_id": guild_id, "member_id": member_id, "member": data}, report)
+                    await self.clear_member(guild_id, member_id)
+                    report.members_removed += 1
+                    await self._pace()
+
+            # Marks on our shards not seen this sweep belong to members/guilds that
+            # came back or were removed. Other shards' marks are re-read just before
+            # the write and kept, since their processes sweep those.
+            stored = await self.config.gc_marks()
+            marks = {k: v for k, v in stored.items() if not ours(int(k.partition(":")[0]))}
+            marks.update((k, v) for k, v in self._marks.items() if k in self._seen)
+            await self.config.gc_marks.set(marks)
+            report.duration = time.time() - report.started_at
+            self.last_report = report
+            return report
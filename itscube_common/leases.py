@@ -0,0 +1,92 @@
+import os
+import socket
+import sqlite3
+import time
+from collections.abc import Iterable
+from pathlib import Path
+
+from .sqlitestore import SQLiteStore
+
+_LEASE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS leases (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Take the lease if it is free, expired or already ours; leave it alone otherwise.
+_TAKE = (
+    "INSERT INTO leases (name, owner, expires) VALUES (?, ?, ?) "
+    "ON CONFLICT (name) DO UPDATE SET owner = excluded.owner, expires = excluded.expires "
+    "WHERE leases.owner = excluded.owner OR leases.expires <= ?"
+)
+
+
+class LeaseStore:
+    """
+    Expiring ownership leases in an SQLite file shared by every process of
+    the bot on this host.
+
+    Each process calls ``renew`` with the names it wants (one per guild, or
+    one per shard) every ``ttl / 3`` seconds: it keeps what it already holds,
+    takes anything free or expired, and gives up names it no longer asks
+    for. A process that dies stops renewing, so its leases pass to the next
+    process that renews after ``ttl``. ``holds`` is answered from memory and
+    stops trusting a lease ``ttl / 3`` before it expires, so a process whose
+    event loop stalled can't act on a lease someone else may already hold.
+    """
+
+    TTL = 90.0
+
+    def __init__(self, path: Path, ttl: float = TTL, owner: str | None = None):
+        self.db = SQLiteStore(path, _LEASE_SCHEMA)
+        self.ttl = ttl
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+        self._held: dict[str, float] = {}  # name -> expiry we last wrote
+
+    @property
+    def held(self) -> list[str]:
+        return sorted(self._held)
+
+    def holds(self, name: str) -> bool:
+        expires = self._held.get(name)
+        return expires is not None and time.time() < expires - self.ttl / 3
+
+    async def renew(self, names: Iterable[str]) -> set[str]:
+        """Take or extend the leases on ``names``, release the rest of ours; returns what we hold."""
+        wanted = set(names)
+
+        def renew(conn: sqlite3.Connection) -> dict[str, float]:
+            now = time.time()
+            expires = now + self.ttl
+            # IMMEDIATE takes the write lock up front, so two processes can't both see a lease as free.
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(_TAKE, [(name, self.owner, expires, now) for name in wanted])
+                rows = conn.execute("SELECT name, expires FROM leases WHERE owner = ?", (self.owner,)).fetchall()
+                stale = [(name, self.owner) for name, _ in rows if name not in wanted]
+                conn.executemany("DELETE FROM leases WHERE name = ? AND owner = ?", stale)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return {name: exp for name, exp in rows if name in wanted}
+
+        self._held = await self.db.run(renew)
+        return set(self._held)
+
+    async def release_all(self) -> None:
+        """Give up every lease now, so other processes don't wait out the TTL."""
+        self._held = {}
+        await self.db.run(lambda conn: conn.execute("DELETE FROM leases WHERE owner = ?", (self.owner,)))
+
+    async def owners(self) -> dict[str, int]:
+        """Live leases per owning process."""
+        rows = await self.db.run(lambda conn: conn.execute(
+            "SELECT owner, COUNT(*) FROM leases WHERE expires > ? GROUP BY owner", (time.time(),)
+        ).fetchall())
+        return dict(rows)
+
+    async def close(self) -> None:
+        await self.db.close()
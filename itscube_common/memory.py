@@ -0,0 +1,120 @@
+import os
+import sys
+import tracemalloc
+from collections import deque
+
+# Top-level packages whose classes approx_size looks inside; see follow_package.
+_FOLLOWED = {__name__.partition(".")[0]}
+_CONTAINERS = (list, tuple, set, frozenset, deque)
+
+
+def follow_package(name: str) -> None:
+    """Have ``approx_size`` count the attributes of ``name``'s classes (a cog's own), as it does this library's."""
+    _FOLLOWED.add(name.partition(".")[0])
+
+
+def approx_size(obj, *, skip: tuple[type, ...] = (), max_objects: int = 200_000) -> int:
+    """
+    Bytes held by ``obj`` and what it reaches, as ``sys.getsizeof`` counts them.
+
+    Follows builtin containers, and the attributes of classes from this
+    library and the packages passed to ``follow_package``; objects from
+    other libraries (discord.py models, asyncio primitives) count only
+    their own header, and ``skip`` types (shared things reported on their
+    own) aren't counted at all. Shared objects
+    are counted once. Stops after ``max_objects`` objects, so the answer
+    is a lower bound for very large structures.
+    """
+    seen: set[int] = set()
+    stack = [obj]
+    total = 0
+    while stack and len(seen) < max_objects:
+        o = stack.pop()
+        if id(o) in seen or (skip and isinstance(o, skip)):
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o)
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, _CONTAINERS):
+            stack.extend(o)
+        elif type(o).__module__.partition(".")[0] in _FOLLOWED:
+            attrs = getattr(o, "__dict__", None)
+            if attrs is not None:
+                stack.append(attrs)
+            for name in getattr(type(o), "__slots__", ()):
+                value = getattr(o, name, None)
+                if value is not None:
+                    stack.append(value)
+    return total
+
+
+def fmt_bytes(n: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if abs(n) < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GiB"
+
+
+def process_rss() -> int | None:
+    """Resident set size of this process, where /proc is available."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class MemoryTracer:
+    """
+    tracemalloc snapshots, each diffed against the one before.
+
+    tracemalloc is process-wide and slows every allocation, so it runs only
+    between ``start`` and ``stop``; a tracer doesn't stop tracing it didn't
+    start (another cog may be using it).
+    """
+
+    def __init__(self):
+        self._last: tracemalloc.Snapshot | None = None
+        self._started = False
+
+    @property
+    def active(self) -> bool:
+        return self._last is not None and tracemalloc.is_tracing()
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ))
+
+    def start(self, frames: int = 1) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            self._started = True
+        self._last = self._snapshot()
+
+    def diff(self, limit: int = 10) -> list[str]:
+        """The biggest changes by source line since the previous call; this snapshot becomes the baseline."""
+        current = self._snapshot()
+        stats = current.compare_to(self._last, "lineno")
+        self._last = current
+        lines = []
+        for stat in stats[:limit]:
+            frame = stat.traceback[0]
+            sign = "+" if stat.size_diff >= 0 else ""
+            lines.append(
+                f"`{os.path.basename(frame.filename)}:{frame.lineno}` {sign}{fmt_bytes(stat.size_diff)} "
+                f"({stat.count_diff:+d} blocks, {fmt_bytes(stat.size)} now)"
+            )
+        traced, peak = tracemalloc.get_traced_memory()
+        lines.append(f"traced {fmt_bytes(traced)}, peak {fmt_bytes(peak)}")
+        return lines
+
+    def stop(self) -> None:
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+        self._last = None
@@ -0,0 +1,254 @@
+import bisect
+import functools
+import math
+import os
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable
+
+# Seconds; wide enough for a button ack (sub-ms) up to a slow REST call.
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: tuple[tuple[str, str], ...] = ()) -> str:
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _num(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        self.value += amount
+
+
+class GaugeChild:
+    __slots__ = ("value", "fn")
+
+    def __init__(self):
+        self.value = 0.0
+        self.fn: Callable[[], float] | None = None
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def set_function(self, fn: Callable[[], float]) -> None:
+        """Read ``fn()`` at export time instead of a stored value."""
+        self.fn = fn
+
+    def get(self) -> float:
+        if self.fn is None:
+            return self.value
+        try:
+            return self.fn()
+        except Exception:
+            return math.nan
+
+
+class HistogramChild:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (``inf`` past the last bucket)."""
+        total = self.count
+        if not total:
+            return 0.0
+        rank = q * total
+        seen = 0
+        for bound, n in zip((*self.bounds, math.inf), self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return math.inf
+
+    def timed(self, fn):
+        """Decorate a coroutine function to observe its run time."""
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                self.observe(time.perf_counter() - t0)
+
+        return wrapper
+
+
+class _Family(ABC):
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = labels
+        self.children: dict[tuple[str, ...], object] = {}
+
+    @abstractmethod
+    def _new(self):
+        """A fresh child for one set of label values."""
+
+    @abstractmethod
+    def render(self) -> list[str]:
+        """Sample lines in the Prometheus text format."""
+
+    def labels(self, *values) -> object:
+        """The child for these label values; hot paths should look it up once and keep it."""
+        key = tuple(str(v) for v in values)
+        child = self.children.get(key)
+        if child is None:
+            if len(key) != len(self.label_names):
+                raise ValueError(f"{self.name} takes labels {self.label_names}")
+            child = self.children[key] = self._new()
+        return child
+
+
+class Counter(_Family):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, help, labels)
+        if not labels:
+            self.inc = self.labels().inc
+
+    def _new(self) -> CounterChild:
+        return CounterChild()
+
+    def render(self) -> list[str]:
+        return [f"{self.name}{_labels(self.label_names, k)} {c.value}" for k, c in self.children.items()]
+
+
+class Gauge(_Family):
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, help, labels)
+        if not labels:
+            child = self.labels()
+            self.set, self.set_function = child.set, child.set_function
+
+    def _new(self) -> GaugeChild:
+        return GaugeChild()
+
+    def render(self) -> list[str]:
+        return [f"{self.name}{_labels(self.label_names, k)} {_num(c.get())}" for k, c in self.children.items()]
+
+
+class Histogram(_Family):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, help, labels)
+        if not labels:
+            child = self.labels()
+            self.observe, self.timed = child.observe, child.timed
+
+    def _new(self) -> HistogramChild:
+        return HistogramChild(self.buckets)
+
+    def render(self) -> list[str]:
+        lines = []
+        for key, h in self.children.items():
+            cumulative = 0
+            for bound, n in zip((*self.buckets, math.inf), h.counts):
+                cumulative += n
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, key, (('le', _num(bound)),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {_num(h.sum)}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    In-process counters, gauges and histograms, cheap enough to leave on.
+
+    Recording is an attribute add (counters) or a bisect over ~15 bucket
+    bounds (histograms) on a child looked up once, so hot paths pay a few
+    hundred nanoseconds at most. ``render`` produces the Prometheus text
+    format (call it on the event loop; children are added there).
+    """
+
+    def __init__(self):
+        self.families: dict[str, _Family] = {}
+        self.started_at = time.time()
+
+    def _add(self, family: _Family):
+        if family.name in self.families:
+            raise ValueError(f"metric {family.name} registered twice")
+        self.families[family.name] = family
+        return family
+
+    def counter(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self._add(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Gauge:
+        return self._add(Gauge(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help, labels, buckets))
+
+    def render(self) -> str:
+        out = []
+        for family in self.families.values():
+            out.append(f"# HELP {family.name} {family.help}")
+            out.append(f"# TYPE {family.name} {family.kind}")
+            out.extend(family.render())
+        return "\n".join(out) + "\n"
+
+    def summary(self) -> list[str]:
+        """One human-readable line per series, for the owner debug commands."""
+        lines = []
+        for family in self.families.values():
+            for key, child in sorted(family.children.items()):
+                label = ",".join(key)
+                name = f"{family.name}{{{label}}}" if label else family.name
+                if isinstance(child, HistogramChild):
+                    if not child.count:
+                        continue
+                    mean = child.sum / child.count
+                    lines.append(
+                        f"`{name}` n={child.count} mean={mean * 1000:.2f}ms "
+                        f"p50≤{child.quantile(0.5) * 1000:g}ms p99≤{child.quantile(0.99) * 1000:g}ms"
+                    )
+                elif isinstance(child, GaugeChild):
+                    lines.append(f"`{name}` {child.get():g}")
+                else:
+                    lines.append(f"`{name}` {child.value}")
+        return lines
+
+
+def write_textfile(path: Path, text: str) -> None:
+    """Replace ``path`` atomically, so node_exporter's textfile collector never reads half a file."""
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text)
+    os.replace(tmp, path)
@@ -0,0 +1,268 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+
+import discord
+
+EDIT = "PATCH /channels/{channel_id}/messages/{message_id}"
+REACTION = "PUT /channels/{channel_id}/messages/{message_id}/reactions/{emoji}/@me"
+
+# Lower goes first.
+URGENT, NORMAL, LOW, IDLE = 0, 1, 2, 3
+
+# (requests per second, burst) per channel; a little under what Discord allows
+# for each route, so the queue's pacing, not a 429, is what slows a busy channel.
+ROUTE_LIMITS: dict[str, tuple[float, int]] = {EDIT: (1.0, 5), REACTION: (4.0, 1)}
+DEFAULT_LIMIT = (5.0, 5)
+
+
+class _Bucket:
+    """Token bucket that reports how long until the next token instead of sleeping."""
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def wait_time(self, now: float) -> float:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        self.tokens -= 1
+
+
+@dataclass
+class _Job:
+    priority: int
+    seq: int
+    key: Hashable
+    route: tuple[str, int]
+    send: Callable[[dict], Awaitable[object]]  # called with the merged fields
+    fields: dict
+
+
+class OutboundQueue:
+    """
+    Background sender for REST calls nobody waits on: message edits after a
+    click, reactions, disabling buttons on timeout.
+
+    Calls share a ``key``; submitting a key that is still queued merges into
+    the queued call (later fields win, the higher priority is kept), so five
+    clicks on one drop within a second become one edit with the last
+    content. Queued calls go out by priority, then in order, each waiting for
+    a token from its route's per-channel bucket; a slow route doesn't hold up
+    the others, and two calls with the same key are never in flight at once.
+    When ``max_pending`` calls are queued, the least important one is shed.
+
+    Each route keeps its own heap of calls. Routes with a token sit in a
+    ready heap ordered by their best call and routes waiting for one in a
+    timer heap, so picking the next call never walks the calls held behind
+    a busy channel.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_pending: int = 1000,
+        concurrency: int = 4,
+        on_result: Callable[[str], None] | None = None,
+    ):
+        self.max_pending = max_pending
+        self.on_result = on_result  # "sent", "merged", "shed", "gone", "failed"
+        self._jobs: dict[Hashable, _Job] = {}
+        self._routes: dict[tuple[str, int], list[tuple[int, int, Hashable]]] = {}  # queued calls per route
+        self._ready: list[tuple[int, int, tuple[str, int]]] = []  # routes by their best call; may hold stale entries
+        self._timers: list[tuple[float, tuple[str, int]]] = []  # routes waiting for a token, by when
+        self._timed: set[tuple[str, int]] = set()
+        self._parked: set[Hashable] = set()  # queued while the same key is in flight
+        self._seq = itertools.count()
+        self._buckets: dict[tuple[str, int], _Bucket] = {}
+        self._inflight: set[Hashable] = set()
+        self._concurrency = concurrency
+        self._slots: asyncio.Semaphore | None = None
+        self._wake: asyncio.Event | None = None
+        self._worker: asyncio.Task | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    @property
+    def pending(self) -> int:
+        return len(self._jobs)
+
+    def _count(self, result: str) -> None:
+        if self.on_result is not None:
+            self.on_result(result)
+
+    def submit(
+        self,
+        key: Hashable,
+        route: tuple[str, int],
+        send: Callable[[dict], Awaitable[object]],
+        *,
+        priority: int = NORMAL,
+        **fields,
+    ) -> None:
+        job = self._jobs.get(key)
+        if job is not None:
+            job.fields.update(fields)
+            job.send = send
+            if priority < job.priority:
+                job.priority = priority
+                self._enqueue(job)
+            self._count("merged")
+            return
+        if len(self._jobs) >= self.max_pending:
+            worst = max(self._jobs.values(), key=lambda j: (j.priority, j.seq))
+            if priority >= worst.priority:
+                self._count("shed")
+                return
+            del self._jobs[worst.key]
+            self._count("shed")
+        job = _Job(priority, next(self._seq), key, route, send, dict(fields))
+        self._jobs[key] = job
+        self._enqueue(job)
+        if self._worker is None or self._worker.done():
+            self._slots = asyncio.Semaphore(self._concurrency)
+            self._wake = asyncio.Event()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+        self._wake.set()
+
+    def edit(self, message: discord.Message, *, priority: int = NORMAL, **fields) -> None:
+        """Queue ``message.edit(**fields)``, merged with any edit of it still waiting."""
+        self.submit(
+            ("edit", message.id), (EDIT, message.channel.id), lambda f: message.edit(**f), priority=priority, **fields
+        )
+
+    def react(self, message: discord.Message, emoji: str, *, priority: int = LOW) -> None:
+        self.submit(
+            ("react", message.id, emoji), (REACTION, message.channel.id),
+            lambda f: message.add_reaction(emoji), priority=priority,
+        )
+
+    def _bucket(self, route: tuple[str, int]) -> _Bucket:
+        bucket = self._buckets.get(route)
+        if bucket is None:
+            if len(self._buckets) > 4 * self.max_pending:
+                # Full buckets of idle channels carry no state worth keeping.
+                now = time.monotonic()
+                self._buckets = {r: b for r, b in self._buckets.items() if b.wait_time(now) or b.tokens < b.burst}
+            bucket = self._buckets[route] = _Bucket(*ROUTE_LIMITS.get(route[0], DEFAULT_LIMIT))
+        return bucket
+
+    def _enqueue(self, job: _Job) -> None:
+        heapq.heappush(self._routes.setdefault(job.route, []), (job.priority, job.seq, job.key))
+        self._schedule(job.route)
+
+    def _schedule(self, route: tuple[str, int]) -> None:
+        """List ``route`` as ready under its best call, unless it is waiting for a token."""
+        if route in self._timed:
+            return
+        job = self._head(route)
+        if job is not None:
+            heapq.heappush(self._ready, (job.priority, job.seq, route))
+
+    def _head(self, route: tuple[str, int]) -> _Job | None:
+        """The route's most important call that can go, dropping stale entries on the way."""
+        heap = self._routes.get(route)
+        while heap:
+            priority, seq, key = heap[0]
+            job = self._jobs.get(key)
+            if job is None or job.priority != priority or job.seq != seq:
+                heapq.heappop(heap)  # sent, shed, or re-queued at a higher priority
+            elif key in self._inflight:
+                heapq.heappop(heap)
+                self._parked.add(key)  # re-queued when that call finishes
+            else:
+                return job
+        self._routes.pop(route, None)
+        return None
+
+    def _next_ready(self) -> tuple[_Job | None, float | None]:
+        """Pop the most important call that can go now, or say how long until one can."""
+        now = time.monotonic()
+        while self._timers and self._timers[0][0] <= now:
+            _, route = heapq.heappop(self._timers)
+            self._timed.discard(route)
+            self._schedule(route)
+        while self._ready:
+            priority, seq, route = heapq.heappop(self._ready)
+            if route in self._timed:
+                continue  # listed again when its token is due
+            job = self._head(route)
+            if job is None:
+                continue
+            if job.priority != priority or job.seq != seq:
+                heapq.heappush(self._ready, (job.priority, job.seq, route))  # its best call changed
+                continue
+            bucket = self._bucket(route)
+            delay = bucket.wait_time(now)
+            if delay:
+                self._timed.add(route)
+                heapq.heappush(self._timers, (now + delay, route))
+                continue
+            bucket.take()
+            heapq.heappop(self._routes[route])
+            del self._jobs[job.key]
+            self._inflight.add(job.key)
+            self._schedule(route)
+            return job, None
+        return None, (self._timers[0][0] - now if self._timers else None)
+
+    async def _run(self) -> None:
+        while True:
+            await self._slots.acquire()
+            job, wait = self._next_ready()
+            if job is None:
+                self._slots.release()
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            task = asyncio.get_running_loop().create_task(self._send(job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, job: _Job) -> None:
+        try:
+            await job.send(job.fields)
+            self._count("sent")
+        except discord.NotFound:
+            self._count("gone")  # message deleted meanwhile
+        except Exception:
+            # Best effort by design (a reaction on a slash command's stand-in message always
+            # fails, for one); the count shows up in metrics.
+            self._count("failed")
+        finally:
+            self._inflight.discard(job.key)
+            if job.key in self._parked:
+                self._parked.discard(job.key)
+                queued = self._jobs.get(job.key)
+                if queued is not None:
+                    self._enqueue(queued)
+            self._slots.release()
+            self._wake.set()
+
+    async def close(self, timeout: float = 5.0) -> None:
+        """Give queued calls up to ``timeout`` seconds to go out, then drop the rest."""
+        deadline = time.monotonic() + timeout
+        while (self._jobs or self._tasks) and self._worker is not None and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        if self._worker is not None:
+            self._worker.cancel()
+        for task in list(self._tasks):
+            task.cancel()
+        self._jobs.clear()
+        self._routes.clear()
+        self._ready.clear()
+        self._timers.clear()
+        self._timed.clear()
+        self._parked.clear()
@@ -0,0 +1,282 @@
+import asyncio
+import json
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from redbot.core import Config
+from redbot.core.config import Group, Value
+
+# Group methods that touch storage, by direction.
+_GROUP_READS = ("all", "get_raw")
+_GROUP_WRITES = ("set_raw", "clear_raw", "clear_all")
+# Config-level bulk scans.
+_CONFIG_READS = ("all_guilds", "all_members", "all_users", "all_channels", "all_roles")
+_SCOPES = ("guild", "guild_from_id", "member", "member_from_ids", "user", "user_from_id", "channel", "role", "custom")
+
+
+def _size(value: Any) -> int:
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+@dataclass
+class OriginStats:
+    calls: int = 0  # handler invocations seen
+    reads: int = 0
+    writes: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    seconds: float = 0.0
+    slowest: float = 0.0
+    n_plus_one: int = 0  # invocations flagged for repeated single-field access
+    fields: Counter = field(default_factory=Counter)  # "MEMBER.points" -> accesses
+    repeated: Counter = field(default_factory=Counter)  # fields seen in flagged invocations
+
+
+class _Invocation:
+    """One run of a handler: which groups it has touched field by field."""
+
+    __slots__ = ("stats", "generation", "groups", "flagged")
+
+    def __init__(self, stats: OriginStats, generation: int):
+        self.stats = stats
+        self.generation = generation
+        self.groups: dict[tuple, list[str]] = {}
+        self.flagged = False
+
+
+_current: ContextVar[_Invocation | None] = ContextVar("config_origin", default=None)
+
+
+class ConfigProfiler:
+    """
+    Opt-in accounting of Config traffic, attributed to the handler that caused it.
+
+    Handlers call ``begin`` with a label (command, listener or button); every
+    Config access made in that task afterwards is charged to it. Accesses
+    from anything that didn't call ``begin`` are charged to the asyncio task.
+    A handler that reads or writes ``N_PLUS_ONE`` or more single fields of
+    one group (rather than one ``all()`` / one ``set()``) is flagged.
+    """
+
+    N_PLUS_ONE = 3
+
+    def __init__(self):
+        self.enabled = False
+        self.started_at = 0.0
+        self.stats: dict[str, OriginStats] = {}
+        self._generation = 0  # invocations begun before the last start() are stale
+
+    def start(self) -> None:
+        self.stats.clear()
+        self._generation += 1
+        self.started_at = time.time()
+        self.enabled = True
+
+    def stop(self) -> None:
+        self.enabled = False
+
+    def begin(self, origin: str) -> None:
+        if not self.enabled:
+            return
+        stats = self.stats.setdefault(origin, OriginStats())
+        stats.calls += 1
+        _current.set(_Invocation(stats, self._generation))
+
+    def record(self, *, write: bool, nbytes: int, elapsed: float, ident: tuple | None, single: bool) -> None:
+        inv = _current.get()
+        if inv is None or inv.generation != self._generation:
+            task = asyncio.current_task()
+            origin = f"task:{task.get_name()}" if task else "unattributed"
+            inv = _Invocation(self.stats.setdefault(origin, OriginStats()), self._generation)
+        stats = inv.stats
+        if write:
+            stats.writes += 1
+            stats.bytes_written += nbytes
+        else:
+            stats.reads += 1
+            stats.bytes_read += nbytes
+        stats.seconds += elapsed
+        stats.slowest = max(stats.slowest, elapsed)
+        if ident is None:
+            return
+        category, primary_key, identifiers = ident
+        label = ".".join((category, *identifiers)) if identifiers else category
+        stats.fields[label] += 1
+        if not single or not identifiers:
+            return
+        touched = inv.groups.setdefault((category, primary_key, identifiers[:-1]), [])
+        touched.append(label)
+        if len(touched) >= self.N_PLUS_ONE:
+            if not inv.flagged:
+                inv.flagged = True
+                stats.n_plus_one += 1
+            stats.repeated.update(touched if len(touched) == self.N_PLUS_ONE else touched[-1:])
+
+    def report(self, limit: int = 10) -> list[str]:
+        lines = []
+        ranked = sorted(self.stats.items(), key=lambda kv: kv[1].seconds, reverse=True)
+        for origin, s in ranked[:limit]:
+            per = max(1, s.calls)
+            line = (
+                f"**{origin}** ×{s.calls}: {s.reads / per:.1f} reads + {s.writes / per:.1f} writes per call, "
+                f"{(s.bytes_read + s.bytes_written) / 1024:.1f} KiB, {s.seconds * 1000:.0f} ms total, "
+                f"slowest {s.slowest * 1000:.1f} ms"
+            )
+            if s.n_plus_one:
+                hot = ", ".join(f for f, _ in s.repeated.most_common(4))
+                line += f"\n  ⚠️ N+1 in {s.n_plus_one} calls: {hot}"
+            lines.append(line)
+        return lines
+
+    def dump(self, path: Path) -> None:
+        data = {
+            "started_at": self.started_at,
+            "dumped_at": time.time(),
+            # asdict() would rebuild the Counters from (key, count) pairs, so copy fields by hand.
+            "origins": {origin: {k: dict(v) if isinstance(v, Counter) else v for k, v in vars(s).items()}
+                        for origin, s in self.stats.items()},
+        }
+        path.write_text(json.dumps(data, indent=2))
+
+
+class _ProfiledCall:
+    """Wraps Red's value context manager: awaiting it reads, ``async with`` reads then writes."""
+
+    __slots__ = ("_owner", "_cm", "_t0", "_value")
+
+    def __init__(self, owner: "_ProfiledValue", cm):
+        self._owner = owner
+        self._cm = cm
+
+    def __await__(self):
+        return self._read().__await__()
+
+    async def _read(self):
+        t0 = time.perf_counter()
+        value = await self._cm
+        self._owner._record(write=False, value=value, t0=t0)
+        return value
+
+    async def __aenter__(self):
+        self._t0 = time.perf_counter()
+        self._value = await self._cm.__aenter__()
+        self._owner._record(write=False, value=self._value, t0=self._t0)
+        return self._value
+
+    async def __aexit__(self, *exc):
+        t0 = time.perf_counter()
+        try:
+            return await self._cm.__aexit__(*exc)
+        finally:
+            self._owner._record(write=True, value=self._value, t0=t0)
+
+
+class _ProfiledValue:
+    __slots__ = ("_value", "_profiler", "_ident")
+
+    def __init__(self, value: Value, profiler: ConfigProfiler):
+        self._value = value
+        self._profiler = profiler
+        data = getattr(value, "identifier_data", None)
+        self._ident = (data.category, data.primary_key, tuple(data.identifiers)) if data is not None else None
+
+    def _record(self, *, write: bool, value: Any, t0: float) -> None:
+        self._profiler.record(
+            write=write,
+            nbytes=_size(value),
+            elapsed=time.perf_counter() - t0,
+            ident=self._ident,
+            single=not isinstance(self._value, Group),
+        )
+
+    def __call__(self, *args, **kwargs) -> _ProfiledCall:
+        return _ProfiledCall(self, self._value(*args, **kwargs))
+
+    async def set(self, value: Any, *args, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            return await self._value.set(value, *args, **kwargs)
+        finally:
+            self._record(write=True, value=value, t0=t0)
+
+    async def clear(self):
+        t0 = time.perf_counter()
+        try:
+            return await self._value.clear()
+        finally:
+            self._record(write=True, value=None, t0=t0)
+
+    def __getattr__(self, name: str):
+        return getattr(self._value, name)
+
+
+class _ProfiledGroup(_ProfiledValue):
+    __slots__ = ()
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._value, name)
+        if isinstance(attr, Value):
+            return _wrap(attr, self._profiler)
+        if name in _GROUP_READS or name in _GROUP_WRITES:
+            write = name in _GROUP_WRITES
+
+            async def timed(*args, **kwargs):
+                t0 = time.perf_counter()
+                result = None
+                try:
+                    result = await attr(*args, **kwargs)
+                    return result
+                finally:
+                    self._record(write=write, value=kwargs.get("value") if write else result, t0=t0)
+
+            return timed
+        return attr
+
+
+def _wrap(obj: Any, profiler: ConfigProfiler) -> Any:
+    if isinstance(obj, Group):
+        return _ProfiledGroup(obj, profiler)
+    if isinstance(obj, Value):
+        return _ProfiledValue(obj, profiler)
+    return obj
+
+
+class ProfiledConfig:
+    """
+    Stand-in for a cog's ``Config`` that hands out instrumented groups and
+    values while the profiler is on, and the real ones (one extra attribute
+    lookup, nothing else) while it is off.
+    """
+
+    __slots__ = ("_config", "_profiler")
+
+    def __init__(self, config: Config, profiler: ConfigProfiler):
+        self._config = config
+        self._profiler = profiler
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._config, name)
+        profiler = self._profiler
+        if not profiler.enabled:
+            return attr
+        if name in _SCOPES:
+            return lambda *args, **kwargs: _wrap(attr(*args, **kwargs), profiler)
+        if name in _CONFIG_READS:
+
+            async def timed(*args, **kwargs):
+                t0 = time.perf_counter()
+                result = await attr(*args, **kwargs)
+                profiler.record(
+                    write=False, nbytes=_size(result), elapsed=time.perf_counter() - t0, ident=None, single=False
+                )
+                return result
+
+            return timed
+        return _wrap(attr, profiler)
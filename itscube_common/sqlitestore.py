@@ -0,0 +1,81 @@
+import asyncio
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable
+
+
+class SQLiteStore:
+    """
+    One SQLite connection, used only from its own worker thread.
+
+    The database runs in WAL mode, so reads never wait on the writer. Writes
+    open a transaction that stays open until ``commit`` (or until
+    ``COMMIT_EVERY`` statements have gone through it); reads on the same
+    connection already see them, so callers get read-your-writes without
+    paying an fsync per append.
+    """
+
+    COMMIT_EVERY = 500
+
+    def __init__(self, path: Path, schema: str):
+        self.path = path
+        self._schema = schema
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"sqlite-{path.stem}")
+        self._conn: sqlite3.Connection | None = None
+        self._uncommitted = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")  # durable at checkpoints; WAL keeps it consistent
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.executescript(self._schema)
+            self._conn = conn
+        return self._conn
+
+    async def run(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Run ``fn(conn)`` on the worker thread (reads, or writes that commit themselves)."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: fn(self._connection()))
+
+    async def write(self, fn: Callable[[sqlite3.Connection], Any], statements: int = 1) -> Any:
+        """Run ``fn(conn)`` inside the open write transaction; if it raises, none of its changes stay."""
+
+        def step(conn: sqlite3.Connection) -> Any:
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+            # A savepoint per call, so a failure undoes this call and not the rest of the batch.
+            conn.execute("SAVEPOINT write")
+            try:
+                result = fn(conn)
+            except BaseException:
+                conn.execute("ROLLBACK TO write")
+                conn.execute("RELEASE write")
+                raise
+            conn.execute("RELEASE write")
+            self._uncommitted += statements
+            if self._uncommitted >= self.COMMIT_EVERY:
+                self._commit(conn)
+            return result
+
+        return await self.run(step)
+
+    def _commit(self, conn: sqlite3.Connection) -> None:
+        if conn.in_transaction:
+            conn.execute("COMMIT")
+        self._uncommitted = 0
+
+    async def commit(self) -> None:
+        await self.run(self._commit)
+
+    async def close(self) -> None:
+        def close(conn: sqlite3.Connection) -> None:
+            self._commit(conn)
+            conn.close()
+            self._conn = None
+
+        if self._conn is not None:
+            await self.run(close)
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,93 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import IO
+
+# Fields holding Discord ids; they are written as keyed hashes.
+_ID_FIELDS = frozenset({"guild", "channel", "user", "target"})
+# Snowflakes whose timestamp bits are kept (so ordering survives) and the rest hashed.
+_SNOWFLAKE_FIELDS = frozenset({"message"})
+_WORKER_BITS = (1 << 22) - 1
+
+
+class TraceRecorder:
+    """
+    Opt-in JSONL log of the events that reach the cog, for offline replay.
+
+    The first line is a header (cog name, wall-clock start); every other line
+    is ``{"t": seconds since start, "event": ..., ...}``. Ids go through a
+    keyed hash with a salt drawn per recording: a member keeps one id within
+    a trace but can't be matched across traces or back to Discord. Message
+    ids keep their timestamp bits, so they still sort in the order they were
+    sent. No message text or names are written.
+
+    Recording is one ``json.dumps`` and a buffered write per event; when off,
+    ``record`` returns on its first check.
+    """
+
+    def __init__(self, cog: str, max_events: int = 1_000_000):
+        self.cog = cog
+        self.max_events = max_events
+        self.path: Path | None = None
+        self.started_at = 0.0
+        self.events = 0
+        self._file: IO[str] | None = None
+        self._salt = b""
+        self._t0 = 0.0
+
+    @property
+    def active(self) -> bool:
+        return self._file is not None
+
+    def start(self, path: Path) -> None:
+        """Begin a new trace at ``path``, replacing any earlier one there."""
+        self.stop()
+        self._salt = os.urandom(16)
+        self._file = open(path, "w", encoding="utf-8", buffering=1 << 16)
+        self.path = path
+        self.events = 0
+        self.started_at = time.time()
+        self._t0 = time.monotonic()
+        self._write({"trace": 1, "cog": self.cog, "started_at": self.started_at})
+
+    def stop(self) -> int:
+        """Close the trace; returns how many events it holds."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._salt = b""
+        return self.events
+
+    def anon(self, value: int) -> int:
+        digest = hashlib.blake2b(str(value).encode(), key=self._salt, digest_size=6).digest()
+        return int.from_bytes(digest, "big")
+
+    def anon_snowflake(self, value: int) -> int:
+        return (value & ~_WORKER_BITS) | (self.anon(value) & _WORKER_BITS)
+
+    def record(self, event: str, **fields) -> None:
+        """Append one event; id fields (guild, channel, user, target, message) are anonymized."""
+        if self._file is None:
+            return
+        line = {"t": round(time.monotonic() - self._t0, 4), "event": event}
+        for key, value in fields.items():
+            if value is not None and key in _ID_FIELDS:
+                value = self.anon(value)
+            elif value is not None and key in _SNOWFLAKE_FIELDS:
+                value = self.anon_snowflake(value)
+            line[key] = value
+        try:
+            self._write(line)
+        except (OSError, ValueError) as e:
+            print(f"Error writing {self.cog} trace, stopping it: {e}")
+            self.stop()
+            return
+        self.events += 1
+        if self.events >= self.max_events:
+            print(f"{self.cog} trace reached {self.max_events} events, stopping it")
+            self.stop()
+
+    def _write(self, line: dict) -> None:
+        self._file.write(json.dumps(line, separators=(",", ":")) + "\n")  # type: ignore[union-attr]
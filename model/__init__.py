@@ -1,4 +1,18 @@
-from .model import Model
+import sys
+from pathlib import Path
+
+try:
+    # Downloader installs the repo's shared library as cog_shared.itscube_common.
+    import cog_shared.itscube_common as itscube_common
+except ModuleNotFoundError:
+    # Loaded from a checkout ([p]addpath, tests, benchmarks): the library sits next to the cog.
+    _root = str(Path(__file__).resolve().parent.parent)
+    if _root not in sys.path:
+        sys.path.append(_root)
+    import itscube_common
+sys.modules.setdefault("itscube_common", itscube_common)
+
+from .model import Model  # noqa: E402
 
 async def setup(bot):
     await bot.add_cog(Model(bot))
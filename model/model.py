@@ -1,11 +1,25 @@
 import asyncio
 import random
 import time
+import weakref
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
-from typing import Dict, Optional, Tuple, List
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, Set, Tuple, List
 
 import discord
+from discord.ext import tasks
 from redbot.core import commands, Config, checks
+from redbot.core.data_manager import cog_data_path
+
+from itscube_common.collector import StaleRecordCollector, local_shards
+from itscube_common.leases import LeaseStore
+from itscube_common.memory import MemoryTracer, approx_size, fmt_bytes, follow_package, process_rss
+from itscube_common.metrics import MetricsRegistry, write_textfile
+from itscube_common.outbound import OutboundQueue
+from itscube_common.profiler import ConfigProfiler, ProfiledConfig
+from itscube_common.trace import TraceRecorder
+
+from .storage import SQLiteInventory
 
 # ---------- helpers: rarity table & name generation ----------
 
@@ -77,6 +91,26 @@ def generate_item_for(rarity: str) -> str:
     adj, base, mat = random.choice(COMMON_ADJ), random.choice(COMMON_BASES), random.choice(MATERIALS)
     return f"{adj} {base}" if adj == "Default" else f"{adj} {mat} {base}"
 
+follow_package(__name__)  # let approx_size look inside this cog's classes
+
+# ---------- metrics ----------
+
+# Written to metrics.prom by metrics_loop and shown by `modeldebug stats`.
+METRICS = MetricsRegistry()
+DROPS_SENT = METRICS.counter("model_drops_sent_total", "Model drops posted", labels=("source",))
+CLAIM_ATTEMPTS = METRICS.counter("model_claim_attempts_total", "Reveal attempts by outcome", labels=("result",))
+CLAIM_SECONDS = METRICS.histogram("model_handle_claim_seconds", "_handle_claim run time")
+SCHEDULER_LAG = METRICS.histogram("model_scheduler_lag_seconds", "How late a drop runner woke from its sleep")
+ACTIVE_DROPS = METRICS.gauge("model_active_drops", "Drops waiting to be revealed")
+LIVE_VIEWS = METRICS.gauge("model_live_views", "modelbag paginators still listening for clicks")
+OUTBOUND = METRICS.counter("model_outbound_total", "Queued reactions by outcome", labels=("result",))
+OUTBOUND_PENDING = METRICS.gauge("model_outbound_pending", "Reactions waiting in the outbound queue")
+# children looked up once, so counting an attempt is a single attribute add
+_ATTEMPTS = {r: CLAIM_ATTEMPTS.labels(r) for r in ("won", "lost", "cooldown", "no_channel", "no_drop", "wrong_channel")}
+_OUTBOUND = {r: OUTBOUND.labels(r) for r in ("sent", "merged", "shed", "gone", "failed")}
+_bag_views: weakref.WeakSet = weakref.WeakSet()
+LIVE_VIEWS.set_function(lambda: sum(1 for v in list(_bag_views) if not v.is_finished()))
+
 # ---------- state containers ----------
 
 @dataclass
@@ -88,15 +122,67 @@ class DropState:
     claim_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
     waiting_for_claim: Optional[asyncio.Event] = None
     task: Optional[asyncio.Task] = None
+    # (snowflake, ctx) of claims collected while an arbitration window is open; None otherwise
+    claim_attempts: Optional[List[Tuple[int, object]]] = None
+
+CLAIM_WINDOW_MAX = 3.0  # seconds; longer and the reveal feels laggy
+
+def _attempt_snowflake(ctx) -> int:
+    """When Discord received a claim: its message id, or the interaction id for a slash command."""
+    message = getattr(ctx, "message", None)
+    return message.id if message is not None else ctx.interaction.id
 
 # ---------- Pagination View ----------
 
+INVENTORY_CAP = 5000  # newest items kept per member
+BAG_PAGE_SIZE = 10
+
+def build_bag_page(display_name: str, chunk: List[dict], start: int, total: int) -> discord.Embed:
+    """One modelbag page: ``chunk`` holds items ``start``.. (0-based) of ``total``, newest first."""
+    desc_lines = []
+    for idx, it in enumerate(chunk, start=start+1):
+        ts = it.get("ts", 0)
+        dt = discord.utils.format_dt(discord.utils.snowflake_time(ts) if isinstance(ts, int) else discord.utils.utcnow(), style='R') if ts else ""
+        rarity = it.get("rarity", "?")
+        emoji = it.get("emoji", "•")
+        name  = it.get("name", "Unknown")
+        # absolute time formatting without Snowflake util; fallback:
+        when = f"<t:{ts}:R>" if isinstance(ts, int) and ts > 0 else ""
+        desc_lines.append(f"**{idx}.** {emoji} **{name}** — *{rarity}* {when}")
+
+    e = discord.Embed(
+        title=f"{display_name}'s Models",
+        description="\n".join(desc_lines),
+        color=discord.Color.blurple()
+    )
+    e.set_footer(text=f"Items {start+1}-{min(start+BAG_PAGE_SIZE, total)} / {total}")
+    return e
+
+def build_bag_pages(display_name: str, items: List[dict]) -> List[discord.Embed]:
+    """Every modelbag page for a Config-stored inventory, newest first."""
+    items = sorted(items, key=lambda x: x.get("ts", 0), reverse=True)
+    total = len(items)
+    return [
+        build_bag_page(display_name, items[i:i+BAG_PAGE_SIZE], i, total)
+        for i in range(0, total, BAG_PAGE_SIZE)
+    ]
+
 class BagPaginator(discord.ui.View):
-    def __init__(self, owner_id: int, pages: List[discord.Embed], timeout: int = 120):
+    """Pages are built up front, or (with ``load_page``) on first view, with ``None`` until then."""
+
+    def __init__(
+        self,
+        owner_id: int,
+        pages: List[Optional[discord.Embed]],
+        timeout: int = 120,
+        load_page: Optional[Callable[[int], Awaitable[discord.Embed]]] = None,
+    ):
         super().__init__(timeout=timeout)
         self.owner_id = owner_id
         self.pages = pages
+        self.load_page = load_page
         self.index = 0
+        _bag_views.add(self)
 
     async def update(self, interaction: discord.Interaction):
         for child in self.children:
@@ -106,6 +192,8 @@ class BagPaginator(discord.ui.View):
             self.prev_button.disabled = True  # type: ignore
         if self.index >= len(self.pages) - 1:
             self.next_button.disabled = True  # type: ignore
+        if self.pages[self.index] is None and self.load_page is not None:
+            self.pages[self.index] = await self.load_page(self.index)
         await interaction.response.edit_message(embed=self.pages[self.index], view=self)
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
@@ -136,6 +224,7 @@ class Model(commands.Cog):
         "min_interval": 1800,    # 30min
         "max_interval": 3600,    # 60min
         "user_attempt_cooldown": 2.0,  # seconds between attempts per user
+        "claim_window": 0.0,  # seconds to collect claims before picking the earliest; 0 = first through wins
     }
 
     member_defaults = {
@@ -151,12 +240,304 @@ class Model(commands.Cog):
         self.config = Config.get_conf(self, identifier=0xC0DEB00F, force_registration=True)
         self.config.register_guild(**self.guild_defaults)
         self.config.register_member(**self.member_defaults)
+        self.config.register_global(
+            gc_marks={},  # {"guild_id" or "guild_id:member_id": first seen departed}
+            inventory_backend="config",  # or "sqlite": items and counters in inventory.sqlite3
+            # "guild" or "shard": processes sharing this data folder split drop scheduling
+            # through leases in leases.sqlite3; "off" when one process runs every guild.
+            cluster_leases="off",
+        )
+        # pass-through until `modeldebug profileon`
+        self._profiler = ConfigProfiler()
+        self.config = ProfiledConfig(self.config, self._profiler)
+        # off until `modeldebug traceon`; see benchmarks/replay_trace.py
+        self._trace = TraceRecorder("model")
+        self._memtrace = MemoryTracer()  # `modeldebug memtrace`
         self._states: Dict[int, DropState] = {}
-
-    def cog_unload(self):
+        # attempt reactions are best effort: queued behind reveals, paced per channel
+        self._outbound = OutboundQueue(on_result=lambda r: _OUTBOUND[r].inc())
+        OUTBOUND_PENDING.set_function(lambda: self._outbound.pending)
+        # Set in cog_load when inventory_backend is "sqlite". Claims write concurrently;
+        # `modeldebug sqlite` closes the gate and waits for the ones in flight to finish.
+        self._inventory: Optional[SQLiteInventory] = None
+        self._storage_open = asyncio.Event()
+        self._storage_open.set()
+        self._storage_idle = asyncio.Event()
+        self._storage_idle.set()
+        self._storage_writers = 0
+        self._switch_lock = asyncio.Lock()
+        # Set in cog_load when cluster_leases is on; None means this process owns every guild.
+        self._leases: Optional[LeaseStore] = None
+        self._lease_scope = "off"
+        self._collector = StaleRecordCollector(
+            bot,
+            self.config,
+            cog_data_path(self) / "gc_archive.jsonl",
+            clear_member=self._forget_member,
+            clear_guild=self._forget_guild,
+        )
+        ACTIVE_DROPS.set_function(
+            lambda: sum(1 for s in self._states.values() if s.active_message_id and s.claimed_by is None)
+        )
+        self.gc_loop.start()
+        self.inventory_commit_loop.start()
+        self.metrics_loop.start()
+        self.lease_loop.start()
+
+    async def cog_load(self):
+        if await self.config.inventory_backend() == "sqlite":
+            self._inventory = SQLiteInventory(cog_data_path(self) / "inventory.sqlite3")
+        scope = await self.config.cluster_leases()
+        if scope != "off":
+            self._lease_scope = scope
+            self._leases = LeaseStore(cog_data_path(self) / "leases.sqlite3")
+
+    async def cog_unload(self):
+        self.gc_loop.cancel()
+        self.inventory_commit_loop.cancel()
+        self.metrics_loop.cancel()
+        self.lease_loop.cancel()
+        await self._outbound.close()
         for state in self._states.values():
             if state.task and not state.task.done():
                 state.task.cancel()
+        if self._inventory is not None:
+            await self._inventory.close()
+        if self._leases is not None:
+            await self._leases.release_all()  # hand our guilds over now rather than after the TTL
+            await self._leases.close()
+        self._trace.stop()
+        self._memtrace.stop()
+
+    @tasks.loop(seconds=5)
+    async def inventory_commit_loop(self):
+        # SQLite appends are committed in batches; this bounds how long one stays uncommitted.
+        if self._inventory is not None:
+            try:
+                await self._inventory.commit()
+            except Exception as e:
+                print(f"Error committing model inventory: {e}")
+
+    @tasks.loop(seconds=60)
+    async def metrics_loop(self):
+        try:
+            text = METRICS.render()
+            await asyncio.to_thread(write_textfile, cog_data_path(self) / "metrics.prom", text)
+        except Exception as e:
+            print(f"Error writing model metrics: {e}")
+
+    # ---------- cluster leases ----------
+
+    def _lease_name(self, guild: discord.Guild) -> str:
+        return f"shard:{guild.shard_id}" if self._lease_scope == "shard" else f"guild:{guild.id}"
+
+    def _owns(self, guild: discord.Guild) -> bool:
+        """Whether this process schedules drops (and takes reveals) for ``guild``."""
+        return self._leases is None or self._leases.holds(self._lease_name(guild))
+
+    def _gc_leases(self) -> Set[str]:
+        # One GC lease per shard: its holder sweeps that shard's guilds. Only a
+        # process running the shard can tell its live guilds from departed ones.
+        return {f"gc:{s}" for s in local_shards(self.bot)}
+
+    def _gc_shards(self) -> Optional[Set[int]]:
+        """Shards this process sweeps: all of its own, or those whose GC lease it holds."""
+        if self._leases is None:
+            return None
+        return {s for s in local_shards(self.bot) if self._leases.holds(f"gc:{s}")}
+
+    async def _renew_leases(self) -> None:
+        if self._leases is not None:
+            await self._leases.renew({self._lease_name(g) for g in self.bot.guilds} | self._gc_leases())
+            self._end_orphaned_drops()
+
+    def _end_orphaned_drops(self) -> None:
+        """
+        End the unclaimed drops of guilds whose lease moved away. The drop's
+        state lives in this process, which no longer takes claims for the
+        guild, so nobody could reveal it; the runner wakes and the new
+        holder schedules the next drop.
+        """
+        for guild_id, state in self._states.items():
+            guild = self.bot.get_guild(guild_id)
+            if guild is None or self._owns(guild) or not state.active_message_id or state.claimed_by is not None:
+                continue
+            channel = guild.get_channel(state.channel_id) if state.channel_id else None
+            if channel is not None:  # where the drop was posted, so it takes messages
+                embed = discord.Embed(
+                    title="The Model Faded",
+                    description="⬛ *It slipped away before anyone revealed it.*",
+                    color=discord.Color.dark_grey(),
+                )
+                self._outbound.edit(channel.get_partial_message(state.active_message_id), embed=embed)
+            state.active_message_id = None
+            state.drop_started_at = None
+            if state.waiting_for_claim:
+                state.waiting_for_claim.set()
+
+    @tasks.loop(seconds=LeaseStore.TTL / 3)
+    async def lease_loop(self):
+        try:
+            await self._renew_leases()
+        except Exception as e:
+            print(f"Error renewing model leases: {e}")
+
+    @lease_loop.before_loop
+    async def before_lease_loop(self):
+        await self.bot.wait_until_ready()
+
+    async def _set_cluster_leases(self, scope: str) -> None:
+        old = self._leases
+        self._leases = None
+        if old is not None:
+            await old.release_all()
+            await old.close()
+        self._lease_scope = scope
+        if scope != "off":
+            leases = LeaseStore(cog_data_path(self) / "leases.sqlite3")
+            await leases.renew({self._lease_name(g) for g in self.bot.guilds} | self._gc_leases())
+            self._leases = leases
+            self._end_orphaned_drops()
+        await self.config.cluster_leases.set(scope)
+
+    # ---------- memory report ----------
+
+    def _memory_report(self) -> List[str]:
+        states = list(self._states.values())
+        runners = sum(1 for s in states if s.task and not s.task.done())
+        active = sum(1 for s in states if s.active_message_id and s.claimed_by is None)
+        views = list(_bag_views)
+        live = [v for v in views if not v.is_finished()]
+        loaded = [e for v in views for e in v.pages if e is not None]
+        # embeds keep their data in discord.py objects; their dict form is a fair size estimate
+        pages_size = approx_size([e.to_dict() for e in loaded])
+        rss = process_rss()
+        return [
+            f"process RSS {fmt_bytes(rss) if rss is not None else 'n/a'}",
+            f"`DropState` {len(states)} ({active} active), ~{fmt_bytes(approx_size(states))}",
+            f"runner tasks {runners} running, {len(states) - runners} stopped",
+            f"`BagPaginator` {len(live)} live, {len(views) - len(live)} finished but not collected; "
+            f"{len(loaded)} pages loaded, ~{fmt_bytes(pages_size)}",
+            f"inventory backend {'sqlite' if self._inventory else 'config'}",
+        ]
+
+    # ---------- inventory storage ----------
+
+    async def _switch_inventory_backend(self, name: str) -> int:
+        """Move every member's items and counters between Config and SQLite; returns members moved."""
+        async with self._switch_lock:
+            self._storage_open.clear()
+            try:
+                await self._storage_idle.wait()
+                return await self._move_inventories(name)
+            finally:
+                self._storage_open.set()
+
+    @asynccontextmanager
+    async def _inventory_write(self) -> AsyncIterator[None]:
+        """Shared side of the backend switch: any number of claims at once, none during a move."""
+        while not self._storage_open.is_set():
+            await self._storage_open.wait()
+        # no await between the check and the count, so a switch can't start in between
+        self._storage_writers += 1
+        self._storage_idle.clear()
+        try:
+            yield
+        finally:
+            self._storage_writers -= 1
+            if not self._storage_writers:
+                self._storage_idle.set()
+
+    async def _move_inventories(self, name: str) -> int:
+        moved = 0
+        if name == "sqlite":
+            inventory = SQLiteInventory(cog_data_path(self) / "inventory.sqlite3")
+            try:
+                all_members = await self.config.all_members()
+                for guild_id, members in all_members.items():
+                    for member_id, data in members.items():
+                        counters = {k: v for k, v in data.items() if k == "claims" or k.startswith("rarity_")}
+                        items = sorted(data.get("items") or [], key=lambda x: x.get("ts", 0))
+                        if not items and not any(counters.values()):
+                            continue
+                        await inventory.import_member(guild_id, member_id, items, counters)
+                        moved += 1
+                    await asyncio.sleep(0)
+                await inventory.commit()
+            except Exception:
+                await inventory.close()
+                raise
+            self._inventory = inventory
+            await self.config.inventory_backend.set(name)
+            # Only the moved fields; last_attempt stays in Config.
+            for guild_id, members in all_members.items():
+                for member_id, data in members.items():
+                    mconf = self.config.member_from_ids(guild_id, member_id)
+                    for k in data:
+                        if k in ("items", "claims") or k.startswith("rarity_"):
+                            await mconf.clear_raw(k)
+            return moved
+
+        inventory = self._inventory
+        if inventory is None:
+            return 0
+        exported = await inventory.export_members()
+        for guild_id, members in exported.items():
+            for member_id, data in members.items():
+                mconf = self.config.member_from_ids(guild_id, member_id)
+                for k, v in data.items():
+                    await mconf.set_raw(k, value=v)
+                moved += 1
+            await asyncio.sleep(0)
+        self._inventory = None
+        await self.config.inventory_backend.set(name)
+        await inventory.clear_all()
+        await inventory.close()
+        return moved
+
+    # ---------- stale record collection ----------
+
+    async def _forget_member(self, guild_id: int, member_id: int):
+        await self.config.member_from_ids(guild_id, member_id).clear()
+        if self._inventory is not None:
+            await self._inventory.delete_member(guild_id, member_id)
+
+    async def _forget_guild(self, guild_id: int):
+        state = self._states.pop(guild_id, None)
+        if state and state.task and not state.task.done():
+            state.task.cancel()
+        await self.config.guild_from_id(guild_id).clear()
+        if self._inventory is not None:
+            await self._inventory.delete_guild(guild_id)
+
+    @tasks.loop(hours=6)
+    async def gc_loop(self):
+        shards = self._gc_shards()
+        if shards is not None and not shards:
+            return
+        try:
+            report = await self._collector.sweep(shards)
+        except Exception as e:
+            print(f"Error collecting stale model records: {e}")
+            return
+        if report.guilds_removed or report.members_removed:
+            print(f"Model GC: {report.summary()}")
+
+    @gc_loop.before_loop
+    async def before_gc_loop(self):
+        await self.bot.wait_until_ready()
+
+    async def cog_before_invoke(self, ctx: commands.Context):
+        self._profiler.begin(f"command:{ctx.command.qualified_name}")
+        self._trace.record(
+            "command",
+            name=ctx.command.qualified_name,
+            slash=ctx.interaction is not None,
+            guild=ctx.guild.id if ctx.guild else None,
+            channel=ctx.channel.id,
+            user=ctx.author.id,
+            message=ctx.message.id,  # the interaction id for a slash command
+        )
 
     # ---------- setup & background tasks ----------
 
@@ -181,11 +562,16 @@ class Model(commands.Cog):
         async def runner():
             await self.bot.wait_until_ready()
             while True:
+                self._profiler.begin("task:drop_runner")
                 gconf = self.config.guild(guild)
                 min_i = await gconf.min_interval()
                 max_i = await gconf.max_interval()
                 sleep_for = random.randint(min_i, max_i)
+                slept_at = time.monotonic()
                 await asyncio.sleep(sleep_for)
+                SCHEDULER_LAG.observe(max(0.0, time.monotonic() - slept_at - sleep_for))
+                if not self._owns(guild):
+                    continue  # another process holds this guild's lease
 
                 # re-check configured channel
                 channel_id_now = await gconf.drop_channel_id()
@@ -207,6 +593,9 @@ class Model(commands.Cog):
                         color=discord.Color.dark_grey()
                     )
                     msg = await channel.send(embed=embed)
+                    DROPS_SENT.labels("scheduled").inc()
+                    self._trace.record("drop", source="scheduled", guild=guild.id, channel=channel.id, message=msg.id)
+                    state.channel_id = channel.id
                     state.active_message_id = msg.id
                     state.drop_started_at = time.time()
                     state.claimed_by = None
@@ -223,10 +612,12 @@ class Model(commands.Cog):
 
     @commands.Cog.listener()
     async def on_guild_available(self, guild: discord.Guild):
+        self._profiler.begin("listener:on_guild_available")
         await self._ensure_state_task(guild)
 
     @commands.Cog.listener()
     async def on_guild_join(self, guild: discord.Guild):
+        self._profiler.begin("listener:on_guild_join")
         await self._ensure_state_task(guild)
 
     # ---------- admin: set channel ----------
@@ -239,11 +630,24 @@ class Model(commands.Cog):
         await self._ensure_state_task(ctx.guild)
         await ctx.reply(f"✅ Model drops will appear in {channel.mention}.")
 
+    @commands.hybrid_command(name="setclaimwindow", description="Collect claims briefly and give the drop to whoever typed first.")
+    @checks.admin_or_permissions(manage_guild=True)
+    @commands.guild_only()
+    async def setclaimwindow(self, ctx: commands.Context, seconds: float):
+        seconds = max(0.0, min(seconds, CLAIM_WINDOW_MAX))
+        await self.config.guild(ctx.guild).claim_window.set(seconds)
+        if seconds:
+            await ctx.reply(f"✅ Claims are collected for {seconds:g}s after the first one; the earliest message wins.")
+        else:
+            await ctx.reply("✅ The first claim to be processed wins.")
+
     # ---------- user: claim via slash/text ----------
 
     @commands.hybrid_command(name="model", description="Reveal the active model (if any).")
     @commands.guild_only()
     async def model_cmd(self, ctx: commands.Context):
+        if not self._owns(ctx.guild):
+            return  # every process on the shard gets the command; the lease holder answers it
         await self._handle_claim(ctx=ctx)
 
     @commands.Cog.listener()
@@ -252,6 +656,12 @@ class Model(commands.Cog):
             return
         if message.content.strip().lower() != "model":
             return
+        if not self._owns(message.guild):
+            return  # the drop, if any, lives in the process holding the lease
+        self._profiler.begin("listener:on_message")
+        self._trace.record(
+            "attempt", guild=message.guild.id, channel=message.channel.id, user=message.author.id, message=message.id
+        )
 
         gconf = self.config.guild(message.guild)
         channel_id = await gconf.drop_channel_id()
@@ -260,10 +670,8 @@ class Model(commands.Cog):
 
         state = self._states.get(message.guild.id)
         if not state or not state.active_message_id or state.claimed_by is not None:
-            try:
-                await message.add_reaction("🚫")
-            except Exception:
-                pass
+            _ATTEMPTS["no_drop"].inc()
+            self._outbound.react(message, "🚫")
             return
 
         class DummyCtx:
@@ -276,6 +684,7 @@ class Model(commands.Cog):
 
     # ---------- claim logic (persists inventory) ----------
 
+    @CLAIM_SECONDS.timed
     async def _handle_claim(self, ctx):
         guild: discord.Guild = ctx.guild
         member: discord.Member = ctx.author
@@ -288,9 +697,10 @@ class Model(commands.Cog):
         cd = await gconf.user_attempt_cooldown()
         now = time.time()
         if now - last < cd:
+            _ATTEMPTS["cooldown"].inc()
             try:
                 if getattr(ctx, "message", None):
-                    await ctx.message.add_reaction("⏳")
+                    self._outbound.react(ctx.message, "⏳")
                 else:
                     await ctx.reply("⏳ Slow down a bit.", ephemeral=True)
             except Exception:
@@ -300,59 +710,119 @@ class Model(commands.Cog):
 
         drop_channel_id = await gconf.drop_channel_id()
         if not drop_channel_id:
+            _ATTEMPTS["no_channel"].inc()
             await ctx.reply("⚠️ No drop channel configured yet. Ask an admin to run `/setchannel`.", ephemeral=True if getattr(ctx, "interaction", None) else False)
             return
 
         if not state or not state.active_message_id or state.claimed_by is not None:
+            _ATTEMPTS["no_drop"].inc()
             if getattr(ctx, "message", None):
-                try: await ctx.message.add_reaction("🚫")
-                except Exception: pass
+                self._outbound.react(ctx.message, "🚫")
             else:
                 await ctx.reply("🚫 No active model right now.", ephemeral=True)
             return
 
         if hasattr(ctx, "channel") and ctx.channel.id != drop_channel_id:
+            _ATTEMPTS["wrong_channel"].inc()
             if getattr(ctx, "message", None):
-                try: await ctx.message.add_reaction("🚫")
-                except Exception: pass
+                self._outbound.react(ctx.message, "🚫")
             else:
                 await ctx.reply("🚫 Try this in the configured drop channel.", ephemeral=True)
             return
 
+        window = await gconf.claim_window()
+        if window > 0:
+            if getattr(ctx, "interaction", None):
+                # the verdict comes after the window, past the 3s a slash command has to answer;
+                # deferring keeps the interaction open for the reveal or the ❌ followup
+                await ctx.defer()
+            await self._arbitrate(ctx, state, window)
+            return
+
         # race-lock
         async with state.claim_lock:
             if state.claimed_by is not None:
-                if getattr(ctx, "message", None):
-                    try: await ctx.message.add_reaction("❌")
-                    except Exception: pass
-                else:
-                    await ctx.reply("❌ Someone else already revealed it.", ephemeral=True)
+                _ATTEMPTS["lost"].inc()
+                await self._reject_lost(ctx)
                 return
 
-            rarity, color, emoji = pick_rarity()
-            item_name = generate_item_for(rarity)
             state.claimed_by = member.id
+            _ATTEMPTS["won"].inc()
             if state.waiting_for_claim:
                 state.waiting_for_claim.set()
 
-        # update stats + inventory
-        await self.config.member(member).claims.set((await self.config.member(member).claims()) + 1)
-        key = f"rarity_{rarity.lower()}"
-        current = await self.config.member(member).get_raw(key, default=0)
-        await self.config.member(member).set_raw(key, value=current + 1)
+        await self._award(ctx, state)
+
+    async def _arbitrate(self, ctx, state: DropState, window: float):
+        """
+        The first claim opens a ``window``-second round; claims arriving during it
+        are added and return at once. When it closes, the earliest snowflake wins:
+        Discord's receive time, not the order the event loop got through the
+        cooldown checks. The opener settles everyone in one pass, so nobody
+        queues on claim_lock (and its handler timing includes the window).
+        """
+        attempt = (_attempt_snowflake(ctx), ctx)
+        if state.claim_attempts is not None:
+            state.claim_attempts.append(attempt)
+            return
+        attempts = state.claim_attempts = [attempt]
+        try:
+            await asyncio.sleep(window)
+        finally:
+            state.claim_attempts = None
+
+        winner = None
+        # someone may have won through the lock if the window was turned on mid-drop
+        if state.active_message_id and state.claimed_by is None:
+            winner = min(attempts, key=lambda a: a[0])[1]
+            state.claimed_by = winner.author.id
+            _ATTEMPTS["won"].inc()
+            if state.waiting_for_claim:
+                state.waiting_for_claim.set()
+        # a member who claimed twice in the window isn't told they lost to themselves
+        losers = [c for _, c in attempts if winner is None or c.author.id != winner.author.id]
+        if losers:
+            _ATTEMPTS["lost"].inc(len(losers))
+            await asyncio.gather(*(self._reject_lost(c) for c in losers), return_exceptions=True)
+        if winner is not None:
+            await self._award(winner, state)
+
+    async def _reject_lost(self, ctx):
+        if getattr(ctx, "message", None):
+            self._outbound.react(ctx.message, "❌")
+        else:
+            await ctx.reply("❌ Someone else already revealed it.", ephemeral=True)
+
+    async def _award(self, ctx, state: DropState):
+        """Store the item and post the reveal for ``ctx.author``, who already holds ``state.claimed_by``."""
+        guild: discord.Guild = ctx.guild
+        member: discord.Member = ctx.author
+        rarity, color, emoji = pick_rarity()
+        item_name = generate_item_for(rarity)
 
+        # update stats + inventory
         item_entry = {
             "name": item_name,
             "rarity": rarity,
             "emoji": emoji,
             "ts": int(time.time())
         }
-        items = await self.config.member(member).items()
-        items.append(item_entry)
-        # OPTIONAL: cap inventory length to prevent unbounded growth (comment out to keep all)
-        if len(items) > 5000:
-            items = items[-5000:]
-        await self.config.member(member).items.set(items)
+        async with self._inventory_write():
+            if self._inventory is not None:
+                # one row insert + two counter upserts, not a rewrite of the whole inventory
+                await self._inventory.record_claim(guild.id, member.id, item_entry, cap=INVENTORY_CAP)
+            else:
+                await self.config.member(member).claims.set((await self.config.member(member).claims()) + 1)
+                key = f"rarity_{rarity.lower()}"
+                current = await self.config.member(member).get_raw(key, default=0)
+                await self.config.member(member).set_raw(key, value=current + 1)
+
+                items = await self.config.member(member).items()
+                items.append(item_entry)
+                # OPTIONAL: cap inventory length to prevent unbounded growth (comment out to keep all)
+                if len(items) > INVENTORY_CAP:
+                    items = items[-INVENTORY_CAP:]
+                await self.config.member(member).items.set(items)
 
         # reveal
         try:
@@ -363,8 +833,9 @@ class Model(commands.Cog):
             )
             embed.set_footer(text="gg 🧊")
             await ctx.reply(embed=embed)
-        except Exception:
-            pass
+        except Exception as e:
+            # the item is already stored, so the claim stands; just say the reveal didn't show
+            print(f"Error posting model reveal: {e}")
 
         # clear active drop so loop can schedule next
         state.active_message_id = None
@@ -376,38 +847,28 @@ class Model(commands.Cog):
     @commands.guild_only()
     async def modelbag(self, ctx: commands.Context, member: Optional[discord.Member] = None):
         member = member or ctx.author
+        inventory = self._inventory
+        if inventory is not None:
+            # only the pages actually viewed are queried, off the (guild, member, ts) index
+            total = await inventory.count_items(ctx.guild.id, member.id)
+            if not total:
+                return await ctx.reply(f"{member.mention} has no models yet.")
+
+            async def load_page(index: int) -> discord.Embed:
+                start = index * BAG_PAGE_SIZE
+                chunk = await inventory.items_page(ctx.guild.id, member.id, start, BAG_PAGE_SIZE)
+                return build_bag_page(member.display_name, chunk, start, total)
+
+            pages: List[Optional[discord.Embed]] = [None] * -(-total // BAG_PAGE_SIZE)
+            pages[0] = await load_page(0)
+            view = BagPaginator(owner_id=ctx.author.id, pages=pages, load_page=load_page)
+            return await ctx.reply(embed=pages[0], view=view)
+
         items: List[dict] = await self.config.member(member).items()
         if not items:
             return await ctx.reply(f"{member.mention} has no models yet.")
 
-        # newest first
-        items = sorted(items, key=lambda x: x.get("ts", 0), reverse=True)
-
-        # build pages (10 per)
-        per = 10
-        pages: List[discord.Embed] = []
-        total = len(items)
-        for i in range(0, total, per):
-            chunk = items[i:i+per]
-            desc_lines = []
-            for idx, it in enumerate(chunk, start=i+1):
-                ts = it.get("ts", 0)
-                dt = discord.utils.format_dt(discord.utils.snowflake_time(ts) if isinstance(ts, int) else discord.utils.utcnow(), style='R') if ts else ""
-                rarity = it.get("rarity", "?")
-                emoji = it.get("emoji", "•")
-                name  = it.get("name", "Unknown")
-                # absolute time formatting without Snowflake util; fallback:
-                when = f"<t:{ts}:R>" if isinstance(ts, int) and ts > 0 else ""
-                desc_lines.append(f"**{idx}.** {emoji} **{name}** — *{rarity}* {when}")
-
-            e = discord.Embed(
-                title=f"{member.display_name}'s Models",
-                description="\n".join(desc_lines),
-                color=discord.Color.blurple()
-            )
-            e.set_footer(text=f"Items {i+1}-{min(i+per, total)} / {total}")
-            pages.append(e)
-
+        pages = build_bag_pages(member.display_name, items)
         view = BagPaginator(owner_id=ctx.author.id, pages=pages)
         await ctx.reply(embed=pages[0], view=view)
 
@@ -416,10 +877,103 @@ class Model(commands.Cog):
     @commands.command(name="modeldebug")
     @checks.is_owner()
     async def model_debug(self, ctx: commands.Context, action: str = "ping"):
-        """Owner debug helper (ping | dropnow)."""
+        """Owner debug helper (ping | dropnow | profileon | profileoff | profile | gc | stats | sqlite | configstore | traceon | traceoff | leases | leaseson | shardleases | leasesoff | memory | memtrace | memtraceoff)."""
         if action == "ping":
             await ctx.send("pong")
             return
+        if action == "gc":
+            # departed guilds/members are archived to gc_archive.jsonl and removed after 30 days;
+            # only this process's shards (those whose GC lease it holds, with cluster leases on)
+            report = await self._collector.sweep(self._gc_shards())
+            await ctx.send(f"GC done: {report.summary()}")
+            return
+        if action == "stats":
+            # same numbers as metrics.prom (rewritten every minute for Prometheus' textfile collector)
+            lines = [f"since <t:{int(METRICS.started_at)}:R>"] + METRICS.summary()
+            await ctx.send("\n".join(lines)[:2000])
+            return
+        if action in ("sqlite", "configstore"):
+            # moves items/claims/rarity counters into inventory.sqlite3, or back into Config
+            name = "sqlite" if action == "sqlite" else "config"
+            if await self.config.inventory_backend() == name:
+                await ctx.send(f"inventories are already in {name}")
+                return
+            await ctx.send("moving inventories; claims wait until this is done…")
+            try:
+                moved = await self._switch_inventory_backend(name)
+            except Exception as e:
+                await ctx.send(f"move failed, still on the old backend: {e}")
+                return
+            await ctx.send(f"moved {moved} members' inventories to {name}")
+            return
+        if action == "memory":
+            await ctx.send("\n".join(self._memory_report())[:2000])
+            return
+        if action == "memtrace":
+            # first call starts tracemalloc; each later call shows what grew since the previous one
+            if not self._memtrace.active:
+                self._memtrace.start()
+                await ctx.send("tracemalloc on (allocations run slower until `memtraceoff`); run `memtrace` again to diff")
+                return
+            lines = await asyncio.to_thread(self._memtrace.diff)
+            await ctx.send("\n".join(lines)[:2000])
+            return
+        if action == "memtraceoff":
+            self._memtrace.stop()
+            await ctx.send("memory tracing off")
+            return
+        if action in ("leaseson", "shardleases", "leasesoff"):
+            # for several processes on one data folder: each guild's drops run in exactly one of them
+            scope = {"leaseson": "guild", "shardleases": "shard", "leasesoff": "off"}[action]
+            await self._set_cluster_leases(scope)
+            await ctx.send(f"cluster leases: {scope}")
+            return
+        if action == "leases":
+            if self._leases is None:
+                await ctx.send("cluster leases are off; this process schedules every guild")
+                return
+            owners = await self._leases.owners()
+            lines = [f"scope {self._lease_scope}, this process is `{self._leases.owner}`, holding {len(self._leases.held)}"]
+            lines += [f"`{owner}`: {n}" for owner, n in sorted(owners.items())]
+            await ctx.send("\n".join(lines)[:2000])
+            return
+        if action == "traceon":
+            # anonymized drops, `model` attempts and commands, for benchmarks/replay_trace.py
+            path = cog_data_path(self) / "trace.jsonl"
+            self._trace.start(path)
+            # drops already waiting, so attempts on them replay against something
+            for guild_id, state in self._states.items():
+                if state.active_message_id and state.claimed_by is None:
+                    self._trace.record(
+                        "drop", source="active", guild=guild_id, channel=state.channel_id, message=state.active_message_id
+                    )
+            await ctx.send(f"tracing to `{path}` (replaces the previous trace)")
+            return
+        if action == "traceoff":
+            if not self._trace.active:
+                await ctx.send("not tracing")
+                return
+            events = self._trace.stop()
+            await ctx.send(f"trace stopped: {events} events in `{self._trace.path}`")
+            return
+        if action == "profileon":
+            self._profiler.start()
+            await ctx.send("config profiling on (stats reset)")
+            return
+        if action == "profileoff":
+            self._profiler.stop()
+            await ctx.send("config profiling off (stats kept until the next profileon)")
+            return
+        if action == "profile":
+            # Config reads/writes per command, listener and drop runner; also dumped to config_profile.json
+            if not self._profiler.stats:
+                await ctx.send("no profile data; run `modeldebug profileon` first")
+                return
+            path = cog_data_path(self) / "config_profile.json"
+            self._profiler.dump(path)
+            lines = self._profiler.report() + [f"full dump: `{path}`"]
+            await ctx.send("\n".join(lines)[:2000])
+            return
         if action == "dropnow":
             guild = ctx.guild
             if not guild:
@@ -447,6 +1001,9 @@ class Model(commands.Cog):
                 color=discord.Color.dark_grey()
             )
             msg = await channel.send(embed=embed)
+            DROPS_SENT.labels("debug").inc()
+            self._trace.record("drop", source="debug", guild=guild.id, channel=channel.id, message=msg.id)
+            state.channel_id = channel.id
             state.active_message_id = msg.id
             state.drop_started_at = time.time()
             state.claimed_by = None
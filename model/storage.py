@@ -0,0 +1,154 @@
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from itscube_common.sqlitestore import SQLiteStore
+
+_INVENTORY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    guild_id INTEGER NOT NULL,
+    member_id INTEGER NOT NULL,
+    ts INTEGER NOT NULL,
+    rarity TEXT NOT NULL,
+    name TEXT NOT NULL,
+    emoji TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_by_member ON items (guild_id, member_id, ts DESC, id DESC);
+CREATE INDEX IF NOT EXISTS items_by_rarity ON items (guild_id, member_id, rarity);
+CREATE TABLE IF NOT EXISTS counters (
+    guild_id INTEGER NOT NULL,
+    member_id INTEGER NOT NULL,
+    key TEXT NOT NULL,
+    value INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (guild_id, member_id, key)
+) WITHOUT ROWID;
+"""
+
+_BUMP = (
+    "INSERT INTO counters (guild_id, member_id, key, value) VALUES (?, ?, ?, ?) "
+    "ON CONFLICT (guild_id, member_id, key) DO UPDATE SET value = value + excluded.value"
+)
+
+
+class SQLiteInventory:
+    """
+    Model inventories and claim counters in an SQLite file.
+
+    A claim is one item insert plus two counter upserts; the inventory cap
+    is enforced by deleting past the newest ``cap`` rows, which only starts
+    once a member has claimed more than ``cap`` times. Commits are batched
+    (see ``SQLiteStore``) and forced by ``commit``.
+    """
+
+    def __init__(self, path: Path):
+        self.db = SQLiteStore(path, _INVENTORY_SCHEMA)
+
+    async def record_claim(self, guild_id: int, member_id: int, item: dict, cap: int) -> None:
+        def write(conn: sqlite3.Connection) -> None:
+            key = (guild_id, member_id)
+            conn.execute(
+                "INSERT INTO items (guild_id, member_id, ts, rarity, name, emoji) VALUES (?, ?, ?, ?, ?, ?)",
+                (*key, item["ts"], item["rarity"], item["name"], item["emoji"]),
+            )
+            conn.execute(_BUMP, (*key, f"rarity_{item['rarity'].lower()}", 1))
+            claims = conn.execute(_BUMP + " RETURNING value", (*key, "claims", 1)).fetchone()[0]
+            if claims > cap:
+                conn.execute(
+                    "DELETE FROM items WHERE id IN (SELECT id FROM items WHERE guild_id = ? AND member_id = ? "
+                    "ORDER BY ts DESC, id DESC LIMIT -1 OFFSET ?)",
+                    (*key, cap),
+                )
+
+        await self.db.write(write, statements=3)
+
+    async def counters(self, guild_id: int, member_id: int) -> Dict[str, int]:
+        rows = await self.db.run(lambda conn: conn.execute(
+            "SELECT key, value FROM counters WHERE guild_id = ? AND member_id = ?", (guild_id, member_id)
+        ).fetchall())
+        return dict(rows)
+
+    async def count_items(self, guild_id: int, member_id: int, rarity: Optional[str] = None) -> int:
+        sql = "SELECT COUNT(*) FROM items WHERE guild_id = ? AND member_id = ?"
+        params: Tuple = (guild_id, member_id)
+        if rarity is not None:
+            sql += " AND rarity = ?"
+            params += (rarity,)
+        return await self.db.run(lambda conn: conn.execute(sql, params).fetchone()[0])
+
+    async def items_page(self, guild_id: int, member_id: int, offset: int, limit: int) -> List[dict]:
+        """Newest first, straight off the (guild, member, ts) index."""
+        rows = await self.db.run(lambda conn: conn.execute(
+            "SELECT name, rarity, emoji, ts FROM items WHERE guild_id = ? AND member_id = ? "
+            "ORDER BY ts DESC, id DESC LIMIT ? OFFSET ?",
+            (guild_id, member_id, limit, offset),
+        ).fetchall())
+        return [{"name": n, "rarity": r, "emoji": e, "ts": ts} for n, r, e, ts in rows]
+
+    async def import_member(self, guild_id: int, member_id: int, items: List[dict], counters: Dict[str, int]) -> None:
+        """Replace whatever is stored for the member with ``items`` (oldest first) and ``counters``."""
+
+        def write(conn: sqlite3.Connection) -> None:
+            key = (guild_id, member_id)
+            conn.execute("DELETE FROM items WHERE guild_id = ? AND member_id = ?", key)
+            conn.execute("DELETE FROM counters WHERE guild_id = ? AND member_id = ?", key)
+            conn.executemany(
+                "INSERT INTO items (guild_id, member_id, ts, rarity, name, emoji) VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (*key, int(it.get("ts", 0)), it.get("rarity", "?"), it.get("name", "Unknown"), it.get("emoji", "•"))
+                    for it in items
+                ],
+            )
+            conn.executemany(
+                "INSERT INTO counters (guild_id, member_id, key, value) VALUES (?, ?, ?, ?)",
+                [(*key, k, v) for k, v in counters.items()],
+            )
+
+        await self.db.write(write, statements=len(items) + len(counters) + 2)
+
+    async def export_members(self) -> Dict[int, Dict[int, dict]]:
+        """{guild_id: {member_id: {"items": [...] oldest first, counter: value, ...}}}"""
+
+        def read(conn: sqlite3.Connection):
+            items = conn.execute(
+                "SELECT guild_id, member_id, name, rarity, emoji, ts FROM items ORDER BY ts, id"
+            ).fetchall()
+            counters = conn.execute("SELECT guild_id, member_id, key, value FROM counters").fetchall()
+            return items, counters
+
+        items, counters = await self.db.run(read)
+        out: Dict[int, Dict[int, dict]] = {}
+        for gid, mid, name, rarity, emoji, ts in items:
+            rec = out.setdefault(gid, {}).setdefault(mid, {"items": []})
+            rec["items"].append({"name": name, "rarity": rarity, "emoji": emoji, "ts": ts})
+        for gid, mid, key, value in counters:
+            out.setdefault(gid, {}).setdefault(mid, {"items": []})[key] = value
+        return out
+
+    async def delete_member(self, guild_id: int, member_id: int) -> None:
+        def delete(conn: sqlite3.Connection) -> None:
+            conn.execute("DELETE FROM items WHERE guild_id = ? AND member_id = ?", (guild_id, member_id))
+            conn.execute("DELETE FROM counters WHERE guild_id = ? AND member_id = ?", (guild_id, member_id))
+
+        await self.db.write(delete, statements=2)
+
+    async def delete_guild(self, guild_id: int) -> None:
+        def delete(conn: sqlite3.Connection) -> None:
+            conn.execute("DELETE FROM items WHERE guild_id = ?", (guild_id,))
+            conn.execute("DELETE FROM counters WHERE guild_id = ?", (guild_id,))
+
+        await self.db.write(delete, statements=2)
+
+    async def clear_all(self) -> None:
+        def clear(conn: sqlite3.Connection) -> None:
+            conn.execute("DELETE FROM items")
+            conn.execute("DELETE FROM counters")
+
+        await self.db.write(clear, statements=2)
+        await self.db.commit()
+
+    async def commit(self) -> None:
+        await self.db.commit()
+
+    async def close(self) -> None:
+        await self.db.close()
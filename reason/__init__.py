@@ -1,4 +1,18 @@
-from .reason import Reason
+import sys
+from pathlib import Path
+
+try:
+    # Downloader installs the repo's shared library as cog_shared.itscube_common.
+    import cog_shared.itscube_common as itscube_common
+except ModuleNotFoundError:
+    # Loaded from a checkout ([p]addpath, tests, benchmarks): the library sits next to the cog.
+    _root = str(Path(__file__).resolve().parent.parent)
+    if _root not in sys.path:
+        sys.path.append(_root)
+    import itscube_common
+sys.modules.setdefault("itscube_common", itscube_common)
+
+from .reason import Reason  # noqa: E402
 
 __red_end_user_data_statement__ = "This cog stores user IDs for the purpose of opting out of random mentions."
 
@@ -0,0 +1,52 @@
+from bisect import bisect_right
+
+# ---------------------------------------------------------------------------
+# Achievements definitions
+# ---------------------------------------------------------------------------
+
+ACHIEVEMENTS = [
+    {"id": "first_claim", "name": "🎉 First Claim", "desc": "Claim your first reason", "stat": "total_claims", "threshold": 1},
+    {"id": "collector_10", "name": "🧺 Collector", "desc": "Claim 10 reasons", "stat": "total_claims", "threshold": 10},
+    {"id": "collector_50", "name": "📦 Hoarder", "desc": "Claim 50 reasons", "stat": "total_claims", "threshold": 50},
+    {"id": "streak_5", "name": "🔥 On Fire", "desc": "Reach a 5 W streak", "stat": "streak", "threshold": 5},
+    {"id": "streak_10", "name": "💥 Unstoppable", "desc": "Reach a 10 W streak", "stat": "streak", "threshold": 10},
+    {"id": "points_100", "name": "💯 Century", "desc": "Earn 100 points", "stat": "points", "threshold": 100},
+    {"id": "points_500", "name": "🏆 High Roller", "desc": "Earn 500 points", "stat": "points", "threshold": 500},
+    {"id": "thief", "name": "😈 Thief", "desc": "Successfully steal once", "stat": "total_steals_success", "threshold": 1},
+    {"id": "master_thief", "name": "🦹 Master Thief", "desc": "Successfully steal 5 times", "stat": "total_steals_success", "threshold": 5},
+    {"id": "critic", "name": "👍 Critic", "desc": "Rate 10 reasons as W", "stat": "total_ws", "threshold": 10},
+]
+
+ACHIEVEMENTS_BY_ID = {a["id"]: a for a in ACHIEVEMENTS}
+
+def get_unlocked_achievements(stats: dict) -> list[dict]:
+    return [a for a in ACHIEVEMENTS if stats.get(a["stat"], 0) >= a["threshold"]]
+
+# ---------------------------------------------------------------------------
+# Threshold index
+# ---------------------------------------------------------------------------
+
+class AchievementIndex:
+    """
+    Achievements grouped by stat and sorted by threshold.
+
+    A counter moving from ``old`` to ``new`` can only unlock thresholds in
+    (old, new], which is one bisect per changed stat; nothing else is looked at.
+    """
+
+    def __init__(self, achievements: list[dict]):
+        self._by_stat: dict[str, tuple[list[int], list[dict]]] = {}
+        for a in sorted(achievements, key=lambda a: a["threshold"]):
+            thresholds, entries = self._by_stat.setdefault(a["stat"], ([], []))
+            thresholds.append(a["threshold"])
+            entries.append(a)
+
+    def crossed(self, stat: str, old: int, new: int) -> list[dict]:
+        """Achievements whose threshold lies in (old, new]."""
+        if new <= old or stat not in self._by_stat:
+            return []
+        thresholds, entries = self._by_stat[stat]
+        return entries[bisect_right(thresholds, old):bisect_right(thresholds, new)]
+
+
+ACHIEVEMENT_INDEX = AchievementIndex(ACHIEVEMENTS)
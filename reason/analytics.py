@@ -0,0 +1,193 @@
+import base64
+import json
+import os
+import random
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+
+# What a drop's buttons say about the reason on it.
+EVENTS = ("reroll", "claim", "w", "l", "steal")
+POSITIVE = ("claim", "w")
+NEGATIVE = ("reroll", "l", "steal")
+
+_P = (1 << 61) - 1  # Mersenne prime for the row hashes
+_rng = random.Random(0x5EED)  # fixed so saved sketches stay valid across restarts
+_SALTS = [(_rng.randrange(1, _P), _rng.randrange(_P)) for _ in range(8)]
+
+
+class CountMinSketch:
+    """
+    Approximate counters for an unbounded key space in ``width * depth`` cells.
+
+    Estimates never undercount; with conservative update they overcount by
+    at most a few percent of the total for the sizes used here.
+    """
+
+    def __init__(self, width: int = 1024, depth: int = 4, counts: array | None = None):
+        if depth > len(_SALTS):
+            raise ValueError(f"depth must be at most {len(_SALTS)}")
+        self.width = width
+        self.depth = depth
+        self.counts = counts if counts is not None else array("I", bytes(4 * width * depth))
+
+    def _cells(self, key: int) -> list[int]:
+        w = self.width
+        return [row * w + (a * key + b) % _P % w for row, (a, b) in enumerate(_SALTS[: self.depth])]
+
+    def add(self, key: int, n: int = 1) -> int:
+        """Count ``n`` more of ``key``; returns the new estimate."""
+        cells = self._cells(key)
+        counts = self.counts
+        est = min(counts[c] for c in cells) + n
+        # Conservative update: only raise cells that would otherwise undercount.
+        for c in cells:
+            if counts[c] < est:
+                counts[c] = est
+        return est
+
+    def estimate(self, key: int) -> int:
+        counts = self.counts
+        return min(counts[c] for c in self._cells(key))
+
+    @property
+    def nbytes(self) -> int:
+        return self.counts.itemsize * len(self.counts)
+
+
+class HeavyHitters:
+    """The k keys with the highest sketch estimates seen so far."""
+
+    def __init__(self, k: int, counts: dict[int, int] | None = None):
+        self.k = k
+        self.counts: dict[int, int] = counts or {}
+
+    def offer(self, key: int, estimate: int) -> None:
+        if key in self.counts or len(self.counts) < self.k:
+            self.counts[key] = estimate
+            return
+        low = min(self.counts, key=self.counts.__getitem__)
+        if estimate > self.counts[low]:
+            del self.counts[low]
+            self.counts[key] = estimate
+
+    def top(self, n: int) -> list[tuple[int, int]]:
+        return sorted(self.counts.items(), key=lambda kv: kv[1], reverse=True)[:n]
+
+
+class Scope:
+    """One sketch and heavy-hitter list per event, for a guild or globally."""
+
+    def __init__(self, width: int, depth: int, k: int):
+        self.sketches = {e: CountMinSketch(width, depth) for e in EVENTS}
+        self.hitters = {e: HeavyHitters(k) for e in EVENTS}
+
+    def record(self, event: str, key: int) -> None:
+        self.hitters[event].offer(key, self.sketches[event].add(key))
+
+    def scores(self) -> dict[int, int]:
+        """Net engagement (claims + Ws - rerolls - Ls - steals) of every tracked line."""
+        candidates = {key for h in self.hitters.values() for key in h.counts}
+        return {
+            key: sum(self.sketches[e].estimate(key) for e in POSITIVE)
+            - sum(self.sketches[e].estimate(key) for e in NEGATIVE)
+            for key in candidates
+        }
+
+    @property
+    def nbytes(self) -> int:
+        # Sketch cells plus a rough 100 bytes per tracked heavy hitter.
+        return sum(s.nbytes for s in self.sketches.values()) + sum(100 * h.k for h in self.hitters.values())
+
+    def to_json(self) -> dict:
+        return {
+            e: {
+                "cells": base64.b64encode(self.sketches[e].counts.tobytes()).decode(),
+                "top": {f"{key:016x}": c for key, c in self.hitters[e].counts.items()},
+            }
+            for e in EVENTS
+        }
+
+    def load_json(self, data: dict) -> None:
+        for e, entry in data.items():
+            if e not in self.sketches:
+                continue
+            sketch = self.sketches[e]
+            cells = array("I")
+            cells.frombytes(base64.b64decode(entry["cells"]))
+            if len(cells) == len(sketch.counts):
+                sketch.counts = cells
+                self.hitters[e].counts = {int(key, 16): c for key, c in entry["top"].items()}
+
+
+class EngagementAnalytics:
+    """
+    Per-guild and global engagement counters within a fixed memory budget.
+
+    The global scope is always kept. Guild scopes are created on first use
+    and the least recently active guild is dropped once the budget is full.
+    """
+
+    def __init__(
+        self,
+        budget_bytes: int = 8 * 1024 * 1024,
+        *,
+        width: int = 1024,
+        depth: int = 4,
+        global_width: int = 8192,
+        top_k: int = 32,
+    ):
+        self.width, self.depth, self.top_k = width, depth, top_k
+        self.global_scope = Scope(global_width, depth, top_k)
+        self.guilds: OrderedDict[int, Scope] = OrderedDict()
+        per_guild = len(EVENTS) * (4 * width * depth + 100 * top_k)
+        self.max_guilds = max(0, (budget_bytes - self.global_scope.nbytes) // per_guild)
+        self.budget_bytes = budget_bytes
+
+    def record(self, guild_id: int, event: str, key: int) -> None:
+        self.global_scope.record(event, key)
+        if not self.max_guilds:
+            return
+        scope = self.guilds.get(guild_id)
+        if scope is None:
+            if len(self.guilds) >= self.max_guilds:
+                self.guilds.popitem(last=False)
+            scope = self.guilds[guild_id] = Scope(self.width, self.depth, self.top_k)
+        else:
+            self.guilds.move_to_end(guild_id)
+        scope.record(event, key)
+
+    def scope(self, guild_id: int | None) -> Scope | None:
+        return self.global_scope if guild_id is None else self.guilds.get(guild_id)
+
+    @property
+    def nbytes(self) -> int:
+        return self.global_scope.nbytes + sum(s.nbytes for s in self.guilds.values())
+
+    def dump(self) -> bytes:
+        return json.dumps({
+            "width": self.width,
+            "depth": self.depth,
+            "global": self.global_scope.to_json(),
+            "guilds": {str(g): s.to_json() for g, s in self.guilds.items()},
+        }).encode()
+
+    def load(self, raw: bytes) -> None:
+        data = json.loads(raw)
+        if data.get("width") != self.width or data.get("depth") != self.depth:
+            return  # sketch shape changed; start over
+        self.global_scope.load_json(data.get("global", {}))
+        # Saved oldest-first, so the most recently active guilds are kept.
+        guilds = list(data.get("guilds", {}).items()) if self.max_guilds else []
+        for g, entry in guilds[max(0, len(guilds) - self.max_guilds):]:
+            scope = self.guilds[int(g)] = Scope(self.width, self.depth, self.top_k)
+            scope.load_json(entry)
+
+
+def save_analytics(raw: bytes, path: Path) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(raw)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
@@ -0,0 +1,320 @@
+import base64
+import hashlib
+import json
+import mmap
+import os
+import random
+import struct
+from array import array
+from collections.abc import Sequence
+from pathlib import Path
+
+from .selection import draw_index
+
+# ---------------------------------------------------------------------------
+# Compiled corpus format
+#
+#   header   : magic b"RSNC", u32 version, u64 count          (16 bytes)
+#   offsets  : (count + 1) x u64, byte offsets into the blob
+#   lookup   : count x (u64 line id, u32 index), sorted by line id
+#   blob     : every line UTF-8 encoded, back to back
+#
+# Line ``i`` is ``blob[offsets[i]:offsets[i + 1]]``, so lookups are O(1) and
+# nothing is decoded until a line is actually used. The lookup table maps a
+# line's content id back to its index in O(log n) without a Python dict.
+# ---------------------------------------------------------------------------
+
+MAGIC = b"RSNC"
+VERSION = 2
+_HEADER = struct.Struct("<4sIQ")
+_PAIR = struct.Struct("<QQ")
+_LOOKUP = struct.Struct("<QI")
+
+
+def line_id(text: str) -> int:
+    """Stable 64-bit content id of a reason line."""
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def read_source(path: Path) -> list[str]:
+    """Load raw lines from a ``.json`` list or a one-line-per-reason ``.txt`` file."""
+    if path.suffix == ".txt":
+        with open(path, "r", encoding="utf-8") as f:
+            return [line.rstrip("\n") for line in f if line.strip()]
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, list) or not all(isinstance(x, str) for x in data):
+        raise ValueError(f"{path.name} must be a JSON list of strings")
+    return data
+
+
+def reason_id(text: str) -> str:
+    """``line_id`` as the 16-char hex string used in Config (wallets, votes)."""
+    return f"{line_id(text):016x}"
+
+
+def build_corpus(lines: list[str], dest: Path) -> None:
+    """Write ``lines`` as a compiled corpus; the file is replaced atomically."""
+    encoded = [line.encode("utf-8") for line in lines]
+    offsets = [0]
+    for b in encoded:
+        offsets.append(offsets[-1] + len(b))
+    lookup = sorted((line_id(line), i) for i, line in enumerate(lines))
+    tmp = dest.with_name(dest.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(encoded)))
+        f.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+        for entry in lookup:
+            f.write(_LOOKUP.pack(*entry))
+        for b in encoded:
+            f.write(b)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, dest)
+
+
+class Corpus(Sequence):
+    """Read-only, memory-mapped view of a compiled corpus."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < _HEADER.size:
+                raise ValueError(f"{path.name} is not a compiled corpus")
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path.name} has an unsupported corpus header")
+        self._count = count
+        self._index_at = _HEADER.size
+        self._lookup_at = _HEADER.size + 8 * (count + 1)
+        self._blob_at = self._lookup_at + _LOOKUP.size * count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._count))]
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("corpus index out of range")
+        start, end = _PAIR.unpack_from(self._mm, self._index_at + 8 * i)
+        return self._mm[self._blob_at + start:self._blob_at + end].decode("utf-8")
+
+    def index_of_id(self, lid: int) -> int | None:
+        """Binary search the lookup table for a line id."""
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if _LOOKUP.unpack_from(self._mm, self._lookup_at + _LOOKUP.size * mid)[0] < lid:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count:
+            found, index = _LOOKUP.unpack_from(self._mm, self._lookup_at + _LOOKUP.size * lo)
+            if found == lid:
+                return index
+        return None
+
+    def index_of(self, text: str) -> int | None:
+        index = self.index_of_id(line_id(text))
+        # Guard against a 64-bit id collision.
+        return index if index is not None and self[index] == text else None
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._mm)
+
+
+# A build is never written over: a live Corpus keeps its file mapped, and
+# Windows won't replace or delete a mapped file. Each build goes to the next
+# ``<stem>.<n>.corpus`` and the caller swaps its reference; older builds are
+# deleted once nothing maps them (``prune_builds``). A bare ``<stem>.corpus``
+# from before versioning counts as build 0.
+
+def corpus_builds(folder: Path, stem: str) -> list[tuple[int, Path]]:
+    """Every compiled build of ``stem`` in ``folder``, oldest first."""
+    builds = []
+    for path in folder.glob(f"{stem}*.corpus"):
+        middle = path.name[len(stem):-len(".corpus")]
+        if middle == "":
+            builds.append((0, path))
+        elif middle[:1] == "." and middle[1:].isdigit():
+            builds.append((int(middle[1:]), path))
+    return sorted(builds)
+
+
+def next_build_path(folder: Path, stem: str) -> Path:
+    builds = corpus_builds(folder, stem)
+    return folder / f"{stem}.{builds[-1][0] + 1 if builds else 1}.corpus"
+
+
+def prune_builds(folder: Path, stem: str, keep: Path) -> None:
+    """Delete every build of ``stem`` but ``keep``; one still mapped somewhere is left for next time."""
+    for _, path in corpus_builds(folder, stem):
+        if path != keep:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+def load_corpus(source: Path, folder: Path, stem: str = "reasons") -> Corpus:
+    """Open the newest build of ``stem``, building a new one from ``source`` first if it is missing, stale or outdated."""
+    builds = corpus_builds(folder, stem)
+    if builds:
+        latest = builds[-1][1]
+        if latest.stat().st_mtime >= source.stat().st_mtime:
+            try:
+                corpus = Corpus(latest)
+            except ValueError:
+                pass
+            else:
+                prune_builds(folder, stem, keep=latest)
+                return corpus
+    dest = next_build_path(folder, stem)
+    build_corpus(read_source(source), dest)
+    corpus = Corpus(dest)
+    prune_builds(folder, stem, keep=dest)
+    return corpus
+
+
+def open_latest(folder: Path, stem: str) -> Corpus | None:
+    """The newest build of ``stem``, or None if there is none."""
+    builds = corpus_builds(folder, stem)
+    return Corpus(builds[-1][1]) if builds else None
+
+# ---------------------------------------------------------------------------
+# Per-guild overlays
+# ---------------------------------------------------------------------------
+
+class Bitset:
+    """Fixed-size bitset backed by a bytearray (one bit per index)."""
+
+    __slots__ = ("_bits",)
+
+    def __init__(self, size: int = 0, data: bytes | None = None):
+        self._bits = bytearray(data) if data is not None else bytearray((size + 7) // 8)
+
+    def __contains__(self, i: int) -> bool:
+        byte = i >> 3
+        return byte < len(self._bits) and bool(self._bits[byte] & (1 << (i & 7)))
+
+    def add(self, i: int) -> None:
+        byte = i >> 3
+        if byte >= len(self._bits):
+            self._bits.extend(bytes(byte + 1 - len(self._bits)))
+        self._bits[byte] |= 1 << (i & 7)
+
+    def discard(self, i: int) -> None:
+        byte = i >> 3
+        if byte < len(self._bits):
+            self._bits[byte] &= ~(1 << (i & 7)) & 0xFF
+
+    def count(self) -> int:
+        return int.from_bytes(self._bits, "little").bit_count()
+
+    def __iter__(self):
+        for byte, v in enumerate(self._bits):
+            while v:
+                low = v & -v
+                yield (byte << 3) + low.bit_length() - 1
+                v ^= low
+
+    def to_b64(self) -> str:
+        return base64.b64encode(bytes(self._bits.rstrip(b"\0"))).decode("ascii")
+
+    @classmethod
+    def from_b64(cls, data: str) -> "Bitset":
+        return cls(data=base64.b64decode(data)) if data else cls()
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._bits)
+
+
+class ReasonPool:
+    """
+    Merged view of the shared base corpus and one guild's overlay.
+
+    The base is never copied: a guild only owns its added lines and a bitset of
+    disabled base indices. Draws are uniform over the enabled lines.
+    """
+
+    # Above this disabled ratio, rejection sampling gets slow, so we fall back
+    # to an explicit array of enabled base indices.
+    DENSE_DISABLED_RATIO = 0.75
+
+    def __init__(self, base: Sequence, added: list[str] | None = None, disabled: Bitset | None = None):
+        self.base = base
+        self.added = added or []
+        self.disabled = disabled or Bitset()
+        self.base_enabled = len(base) - sum(1 for i in self.disabled if i < len(base))
+        self._enabled_index: array | None = None
+        self._added_ids: dict[int, int] | None = None
+
+    def __len__(self) -> int:
+        return self.base_enabled + len(self.added)
+
+    @property
+    def raw_size(self) -> int:
+        """Size of the index space: added lines first, then every base line."""
+        return len(self.added) + len(self.base)
+
+    def at_raw_disabled(self, i: int) -> bool:
+        return i >= len(self.added) and (i - len(self.added)) in self.disabled
+
+    def at_raw(self, i: int) -> str | None:
+        if i < len(self.added):
+            return self.added[i]
+        i -= len(self.added)
+        return None if i in self.disabled else self.base[i]
+
+    def index_of_id(self, lid: int) -> int | None:
+        """Raw index of the line with content id ``lid``, if it is in this pool."""
+        if self._added_ids is None:
+            self._added_ids = {line_id(t): i for i, t in enumerate(self.added)}
+        if lid in self._added_ids:
+            return self._added_ids[lid]
+        if isinstance(self.base, Corpus):
+            i = self.base.index_of_id(lid)
+        else:
+            i = next((j for j, t in enumerate(self.base) if line_id(t) == lid), None)
+        return None if i is None else len(self.added) + i
+
+    def text_of_id(self, lid: int) -> str | None:
+        """Text for a line id, including disabled base lines."""
+        i = self.index_of_id(lid)
+        if i is None:
+            return None
+        return self.added[i] if i < len(self.added) else self.base[i - len(self.added)]
+
+    def draw(self, bag: list[int]) -> str:
+        """Next line from a no-repeat shuffle bag (mutated in place) over this pool."""
+        if len(self) <= 0:
+            raise IndexError("no enabled reasons")
+        while True:
+            text = self.at_raw(draw_index(bag, self.raw_size))
+            if text is not None:
+                return text
+
+    def choice(self, rng: random.Random = random) -> str:  # type: ignore[assignment]
+        total = len(self)
+        if total <= 0:
+            raise IndexError("no enabled reasons")
+        r = rng.randrange(total)
+        if r < len(self.added):
+            return self.added[r]
+        if not self.disabled.nbytes:
+            return self.base[rng.randrange(len(self.base))]
+        if self.base_enabled < len(self.base) * (1 - self.DENSE_DISABLED_RATIO):
+            if self._enabled_index is None:
+                self._enabled_index = array("I", (i for i in range(len(self.base)) if i not in self.disabled))
+            return self.base[self._enabled_index[rng.randrange(len(self._enabled_index))]]
+        while True:
+            i = rng.randrange(len(self.base))
+            if i not in self.disabled:
+                return self.base[i]
@@ -0,0 +1,216 @@
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Hashable, Iterable, TypeVar
+
+import aiohttp
+import discord
+
+T = TypeVar("T")
+
+# ---------------------------------------------------------------------------
+# Pacing primitives
+# ---------------------------------------------------------------------------
+
+class TokenBucket:
+    """Async token bucket: ``rate`` tokens per second, holding at most ``burst``."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class SpacingGate:
+    """Keeps calls sharing a key at least ``interval`` seconds apart."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._next: dict[Hashable, float] = {}
+
+    async def wait(self, key: Hashable) -> None:
+        now = time.monotonic()
+        slot = max(now, self._next.get(key, 0.0))
+        # Reserve the slot before sleeping so concurrent callers queue behind it.
+        self._next[key] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def prune(self) -> None:
+        now = time.monotonic()
+        for key in [k for k, t in self._next.items() if t <= now]:
+            del self._next[key]
+
+# ---------------------------------------------------------------------------
+# Dispatcher
+# ---------------------------------------------------------------------------
+
+@dataclass
+class TickReport:
+    """Summary of one dispatcher run (one loop tick)."""
+    started_at: float = 0.0
+    duration: float = 0.0
+    due: int = 0
+    sent: int = 0
+    skipped: int = 0
+    failed: int = 0
+    timed_out: int = 0
+    retries: int = 0
+    slowest: float = 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.due} due, {self.sent} sent, {self.skipped} skipped, {self.failed} failed, {self.timed_out} timed out, "
+            f"{self.retries} retries in {self.duration:.2f}s (slowest drop {self.slowest:.2f}s)"
+        )
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """
+    Only failures where the request certainly never reached Discord: a 429
+    (rejected before processing) or a connection that was never made. A
+    timeout or a 5xx may come after the message was created, and sends are
+    not idempotent, so retrying those could post a drop twice; discord.py
+    already retries 5xx itself before giving up.
+    """
+    if isinstance(exc, discord.RateLimited):
+        return True
+    if isinstance(exc, discord.HTTPException):
+        return exc.status == 429
+    return isinstance(exc, aiohttp.ClientConnectorError)
+
+
+def _retry_after(exc: BaseException) -> float | None:
+    if isinstance(exc, discord.RateLimited):
+        return exc.retry_after
+    value = getattr(getattr(exc, "response", None), "headers", {}).get("Retry-After")
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+@dataclass
+class DropDispatcher:
+    """
+    Fans scheduled drops out with bounded concurrency.
+
+    Each REST call made through ``call`` is paced by a global token bucket, a
+    per-route spacing gate and a per-guild spacing gate, and is retried with
+    jittered exponential backoff (or Retry-After) only when it certainly
+    didn't land; see ``_is_retryable``.
+
+    Nothing here cancels a call in flight. A send cancelled on a timeout may
+    already have posted its message, whose drop state would then never be
+    saved; how long a request may take is left to discord.py's HTTP client.
+    A job still running at ``job_timeout`` is reported as timed out and left
+    to finish in the background.
+    """
+    concurrency: int = 16
+    global_rate: float = 40.0        # requests/second across all routes
+    route_interval: float = 1.0      # seconds between calls on the same route
+    guild_interval: float = 0.5      # seconds between calls for the same guild
+    job_timeout: float = 60.0        # per drop before it's reported as timed out (it isn't cancelled)
+    max_attempts: int = 3
+    backoff_base: float = 1.0
+    backoff_cap: float = 15.0
+    _bucket: TokenBucket = field(init=False, repr=False)
+    _routes: SpacingGate = field(init=False, repr=False)
+    _guilds: SpacingGate = field(init=False, repr=False)
+    retries_total: int = field(default=0, init=False)
+    _late: set[asyncio.Task] = field(default_factory=set, init=False, repr=False)
+
+    def __post_init__(self):
+        self._bucket = TokenBucket(self.global_rate, burst=max(1, int(self.global_rate)))
+        self._routes = SpacingGate(self.route_interval)
+        self._guilds = SpacingGate(self.guild_interval)
+
+    async def call(self, *, route: Hashable, guild_id: int, factory: Callable[[], Awaitable[T]]) -> T:
+        """Run one paced REST call, retrying it only if Discord never received it."""
+        attempt = 0
+        while True:
+            attempt += 1
+            await self._guilds.wait(guild_id)
+            await self._routes.wait(route)
+            await self._bucket.acquire()
+            try:
+                return await factory()
+            except Exception as e:
+                if attempt >= self.max_attempts or not _is_retryable(e):
+                    raise
+                self.retries_total += 1
+                delay = min(self.backoff_cap, self.backoff_base * 2 ** (attempt - 1))
+                delay *= random.uniform(0.5, 1.0)
+                retry_after = _retry_after(e)
+                if retry_after:
+                    delay = max(delay, retry_after)
+                await asyncio.sleep(delay)
+
+    async def run(self, jobs: Iterable[Callable[[], Awaitable[bool | None]]]) -> TickReport:
+        """
+        Run every job: a coroutine factory returning True when a drop was sent,
+        None when there was nothing to send, False when sending failed.
+        """
+        jobs = list(jobs)
+        report = TickReport(started_at=time.time(), due=len(jobs))
+        retries_before = self.retries_total
+        sem = asyncio.Semaphore(self.concurrency)
+        start = time.perf_counter()
+
+        async def worker(job: Callable[[], Awaitable[bool | None]]) -> None:
+            await sem.acquire()
+            t0 = time.perf_counter()
+            task = asyncio.ensure_future(job())
+            # The slot stays taken until the job ends, even one left running past the timeout.
+            task.add_done_callback(lambda _: sem.release())
+            done, _ = await asyncio.wait({task}, timeout=self.job_timeout)
+            report.slowest = max(report.slowest, time.perf_counter() - t0)
+            if not done:
+                report.timed_out += 1
+                self._late.add(task)
+                task.add_done_callback(self._finish_late)
+                return
+            try:
+                ok = task.result()
+            except Exception as e:
+                report.failed += 1
+                print(f"Error in scheduled reason drop: {e}")
+            else:
+                if ok:
+                    report.sent += 1
+                elif ok is None:
+                    report.skipped += 1
+                else:
+                    report.failed += 1
+
+        if jobs:
+            await asyncio.gather(*(worker(j) for j in jobs))
+        report.duration = time.perf_counter() - start
+        report.retries = self.retries_total - retries_before
+        self._routes.prune()
+        self._guilds.prune()
+        return report
+
+    def _finish_late(self, task: asyncio.Task) -> None:
+        self._late.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Error in scheduled reason drop: {task.exception()}")
+
+    async def close(self) -> None:
+        """Wait for jobs that outlived their tick (a drop still sending or saving its state)."""
+        if self._late:
+            await asyncio.gather(*self._late, return_exceptions=True)
@@ -0,0 +1,88 @@
+import heapq
+
+from .selection import FenwickTree
+
+
+class Leaderboard:
+    """
+    Order-statistic index over one guild's points.
+
+    A Fenwick tree counts members per points value, so "how many members have
+    more points than p" and "what is the k-th highest score" are O(log P),
+    where P is the highest score seen. Members sharing a score sit in one bucket.
+    """
+
+    def __init__(self, points: dict[int, int] | None = None):
+        self._points: dict[int, int] = {}
+        self._buckets: dict[int, set[int]] = {}
+        initial = dict(points or {})
+        size = max(initial.values(), default=0) + 1
+        counts = [0] * max(64, size * 2)
+        for member_id, p in initial.items():
+            p = max(0, p)
+            self._points[member_id] = p
+            self._buckets.setdefault(p, set()).add(member_id)
+            counts[p] += 1
+        self._tree = FenwickTree(counts)
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _grow(self, p: int) -> None:
+        size = len(self._tree)
+        while size <= p:
+            size *= 2
+        counts = [0] * size
+        for value, members in self._buckets.items():
+            counts[value] = len(members)
+        self._tree = FenwickTree(counts)
+
+    def update(self, member_id: int, points: int) -> None:
+        points = max(0, points)
+        old = self._points.get(member_id)
+        if old == points:
+            return
+        if old is not None:
+            bucket = self._buckets[old]
+            bucket.discard(member_id)
+            if not bucket:
+                del self._buckets[old]
+            self._tree.add(old, -1)
+        if points >= len(self._tree):
+            self._grow(points)
+        self._points[member_id] = points
+        self._buckets.setdefault(points, set()).add(member_id)
+        self._tree.add(points, 1)
+
+    def remove(self, member_id: int) -> None:
+        old = self._points.pop(member_id, None)
+        if old is None:
+            return
+        bucket = self._buckets[old]
+        bucket.discard(member_id)
+        if not bucket:
+            del self._buckets[old]
+        self._tree.add(old, -1)
+
+    def rank(self, member_id: int) -> int | None:
+        """1-based rank (ties share a rank), or None if the member has no entry."""
+        p = self._points.get(member_id)
+        if p is None:
+            return None
+        return len(self._points) - self._tree.prefix(p + 1) + 1
+
+    def points(self, member_id: int) -> int | None:
+        return self._points.get(member_id)
+
+    def top(self, n: int) -> list[tuple[int, int]]:
+        """The n highest (member_id, points), highest first."""
+        out: list[tuple[int, int]] = []
+        total = len(self._points)
+        k = 0
+        while len(out) < n and k < total:
+            # Value of the (k+1)-th highest score.
+            value = self._tree.find(total - k - 1)
+            bucket = self._buckets[value]
+            out.extend((m, value) for m in heapq.nsmallest(n - len(out), bucket))
+            k += len(bucket)
+        return out
@@ -0,0 +1,277 @@
+import asyncio
+import copy
+from collections import Counter, OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from itscube_common.memory import approx_size
+
+from .storage import Key
+
+
+def wallet_page(wallet: list[dict], cursor: tuple[int, str] | None, limit: int) -> tuple[int, list[dict], int]:
+    """(index of the first entry, newest-first entries strictly below ``cursor``, total)."""
+    entries = sorted(wallet, key=wallet_key, reverse=True)
+    start = 0
+    if cursor is not None:
+        while start < len(entries) and wallet_key(entries[start]) >= cursor:
+            start += 1
+    return start, entries[start:start + limit], len(entries)
+
+
+def wallet_key(entry: dict) -> tuple[int, str]:
+    return entry.get("ts", 0), entry.get("id", "")
+
+
+def _wallet_counts(record: dict) -> Counter:
+    return Counter((e.get("id", ""), e.get("ts", 0)) for e in record.get("wallet", []))
+
+
+def _wallet_changes(wallet: list[dict], before: Counter) -> tuple[list[tuple[str, int]], list[tuple[str, int]]]:
+    """(entries added, entries removed) since ``before``; added ones in wallet order."""
+    now = Counter((e.get("id", ""), e.get("ts", 0)) for e in wallet)
+    surplus = now - before
+    added = []
+    # New entries are appended, so walk back from the end.
+    for e in reversed(wallet):
+        if not surplus:
+            break
+        entry = (e.get("id", ""), e.get("ts", 0))
+        if surplus[entry] > 0:
+            surplus[entry] -= 1
+            if not surplus[entry]:
+                del surplus[entry]
+            added.append(entry)
+    added.reverse()
+    return added, list((before - now).elements())
+
+
+class MemberStore:
+    """
+    Cached, write-behind access to whole member records.
+
+    A transaction locks the records it touches, loads any that aren't cached
+    (one bulk read each) and hands them to the caller to change in memory.
+    Nothing is written there: changed records are marked dirty and ``flush``
+    writes each of them once, so a claim and a W a few seconds apart cost a
+    single write. Records are serialized by a fixed pool of striped locks, so
+    two handlers touching the same member can't interleave, and no per-member
+    lock objects pile up.
+
+    Every member write in the cog goes through here; a plain ``Value.set``
+    elsewhere would be overwritten by the next flush of a cached record.
+    Records live in ``backend``: Config by default, or ``SQLiteMembers``.
+
+    A backend with ``wallet_deltas`` set gets only the wallet entries added
+    and removed since the record was last written, diffed in memory against
+    the wallet as it was loaded or last flushed, instead of the whole list.
+    """
+
+    def __init__(self, backend, stripes: int = 64, max_cached: int = 2048):
+        self.backend = backend
+        self.max_cached = max_cached
+        self._locks = [asyncio.Lock() for _ in range(stripes)]
+        self._cache: OrderedDict[Key, dict] = OrderedDict()
+        self._dirty: set[Key] = set()
+        self._writing: set[Key] = set()  # taken off _dirty by a flush that hasn't finished
+        self._written: dict[Key, Counter] = {}  # wallets as stored, for wallet_deltas backends
+        self._flush_lock = asyncio.Lock()
+
+    def _stripe(self, key: Key) -> int:
+        return hash(key) % len(self._locks)
+
+    @property
+    def pending(self) -> int:
+        """Records changed in memory but not written yet."""
+        return len(self._dirty)
+
+    @property
+    def cached(self) -> int:
+        return len(self._cache)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate size of the cached records."""
+        return approx_size(self._cache)
+
+    async def _load(self, key: Key) -> dict:
+        record = self._cache.get(key)
+        if record is None:
+            record = await self.backend.read(key)
+            # A transaction may have loaded it while we awaited.
+            if key not in self._cache:
+                self._cache[key] = record
+                if getattr(self.backend, "wallet_deltas", False):
+                    self._written[key] = _wallet_counts(record)
+            record = self._cache[key]
+        self._cache.move_to_end(key)
+        return record
+
+    def _evict(self) -> None:
+        """Drop the least recently used clean records once over the cap."""
+        excess = len(self._cache) - self.max_cached
+        if excess <= 0:
+            return
+        for key in list(self._cache):
+            if excess <= 0:
+                break
+            if key in self._dirty or key in self._writing or self._locks[self._stripe(key)].locked():
+                continue
+            del self._cache[key]
+            self._written.pop(key, None)
+            excess -= 1
+
+    async def read(self, guild_id: int, member_id: int) -> dict:
+        """
+        A member record, from the cache when possible (no lock; for display only).
+
+        The returned dict is the cached record itself, so don't change it.
+        """
+        record = await self._load((guild_id, member_id))
+        self._evict()  # display reads fill the cache too
+        return record
+
+    async def wallet_page(self, guild_id: int, member_id: int, cursor: tuple[int, str] | None, limit: int):
+        """``wallet_page`` of a member's wallet; an indexed query when the backend has one and the record isn't cached."""
+        key = (guild_id, member_id)
+        if key not in self._cache:
+            page = await self.backend.wallet_page(key, cursor, limit)
+            if page is not None:
+                return page
+        record = await self._load(key)
+        self._evict()
+        return wallet_page(record["wallet"], cursor, limit)
+
+    async def all_members(self) -> dict[int, dict[int, dict]]:
+        """Every stored record, as of the last flush."""
+        return await self.backend.all_members()
+
+    async def all_points(self) -> dict[int, dict[int, int]]:
+        return await self.backend.all_points()
+
+    @asynccontextmanager
+    async def transaction(self, guild_id: int, *member_ids: int) -> AsyncIterator[dict[int, dict]]:
+        """
+        Lock, load and yield ``{member_id: record}``; the records are queued
+        for the next flush when the block exits.
+        """
+        keys = [(guild_id, m) for m in dict.fromkeys(member_ids)]
+        # Always take stripes in index order so multi-member transactions can't deadlock.
+        stripes = sorted({self._stripe(k) for k in keys})
+        for i in stripes:
+            await self._locks[i].acquire()
+        try:
+            records = {k[1]: await self._load(k) for k in keys}
+            try:
+                yield records
+            finally:
+                # Changes are made in place on the cached records, so even a
+                # block that raised part-way has to be written out.
+                self._dirty.update(keys)
+        finally:
+            for i in reversed(stripes):
+                self._locks[i].release()
+        self._evict()
+
+    @asynccontextmanager
+    async def member(self, guild_id: int, member_id: int) -> AsyncIterator[dict]:
+        """Single-member ``transaction``."""
+        async with self.transaction(guild_id, member_id) as records:
+            yield records[member_id]
+
+    async def delete(self, guild_id: int, member_id: int) -> None:
+        """Forget a member entirely: cached record, pending write and stored data."""
+        key = (guild_id, member_id)
+        # Holding the flush lock too keeps an in-flight flush from writing the record back.
+        async with self._flush_lock, self._locks[self._stripe(key)]:
+            self._cache.pop(key, None)
+            self._written.pop(key, None)
+            self._dirty.discard(key)
+            await self.backend.delete(key)
+
+    async def flush(self) -> int:
+        """Write every dirty record once (one batch); returns how many were flushed."""
+        async with self._flush_lock:
+            dirty, self._dirty = self._dirty, set()
+            # Not evictable until written, or a reload would read the old record.
+            self._writing = dirty
+            written = False
+            wallets: dict[Key, Counter] = {}
+            try:
+                snapshots, changes = await self._snapshot(dirty, wallets)
+                if getattr(self.backend, "wallet_deltas", False):
+                    write = asyncio.ensure_future(self.backend.write_many(snapshots, changes))
+                else:
+                    write = asyncio.ensure_future(self.backend.write_many(snapshots))
+                try:
+                    await asyncio.shield(write)
+                except asyncio.CancelledError:
+                    # Cancelled mid-write (the loop stopping at unload). A write can't
+                    # be taken back half-way, so let it land and keep what it stored.
+                    await asyncio.wait({write})
+                    written = not write.cancelled() and write.exception() is None
+                    raise
+                written = True
+                return len(snapshots)
+            finally:
+                if written:
+                    self._written.update(wallets)
+                else:
+                    self._dirty.update(dirty)  # failed or cancelled before writing: retry on the next flush
+                self._writing = set()
+
+    async def _snapshot(self, keys: set[Key], wallets: dict[Key, Counter]):
+        """
+        Copies of the records to write, plus (for ``wallet_deltas`` backends)
+        ``{key: (added, removed)}`` wallet entries; ``wallets`` collects the
+        wallets as they will be stored.
+        """
+        deltas = getattr(self.backend, "wallet_deltas", False)
+        snapshots: dict[Key, dict] = {}
+        changes: dict[Key, tuple[list, list] | None] = {}
+        for key in keys:
+            # Snapshot under the lock so the write never sees a half-applied transaction.
+            async with self._locks[self._stripe(key)]:
+                record = self._cache.get(key)
+                if record is None:
+                    continue
+                before = self._written.get(key) if deltas else None
+                if before is None:
+                    snapshots[key] = copy.deepcopy(record)
+                    changes[key] = None  # the whole wallet
+                else:
+                    snapshots[key] = copy.deepcopy({k: v for k, v in record.items() if k != "wallet"})
+                    changes[key] = _wallet_changes(record["wallet"], before)
+                if deltas:
+                    wallets[key] = _wallet_counts(record)
+        return snapshots, changes
+
+    async def switch_backend(self, backend) -> tuple[int, object]:
+        """
+        Copy every record into ``backend`` and use it from now on; returns
+        how many records moved and the old backend, still holding its copy
+        for the caller to clear once the switch is recorded.
+
+        Every stripe is held throughout, so member transactions wait until
+        the copy is done.
+        """
+        async with self._flush_lock:
+            for lock in self._locks:
+                await lock.acquire()
+            try:
+                old = self.backend
+                await old.write_many({k: self._cache[k] for k in self._dirty})
+                self._dirty.clear()
+                records = {
+                    (guild_id, member_id): record
+                    for guild_id, members in (await old.all_members()).items()
+                    for member_id, record in members.items()
+                }
+                await backend.write_many(records)
+                self.backend = backend
+                # Baselines are rebuilt as records load; cached ones get a full write next time.
+                self._written.clear()
+                return len(records), old
+            finally:
+                for lock in self._locks:
+                    lock.release()
@@ -1,34 +1,96 @@
+import asyncio
 import discord
+import functools
 import json
+from collections import OrderedDict
+import os
 import random
 import time
+import weakref
 from pathlib import Path
 from typing import TYPE_CHECKING
 from discord.ext import tasks
 from redbot.core import commands, Config, app_commands, checks
+from redbot.core.data_manager import cog_data_path
+
+from itscube_common.collector import StaleRecordCollector, local_shards
+from itscube_common.leases import LeaseStore
+from itscube_common.memory import MemoryTracer, approx_size, fmt_bytes, follow_package, process_rss
+from itscube_common.metrics import MetricsRegistry, write_textfile
+from itscube_common.outbound import IDLE, URGENT, OutboundQueue
+from itscube_common.profiler import ConfigProfiler, ProfiledConfig
+from itscube_common.trace import TraceRecorder
+
+from .achievements import ACHIEVEMENT_INDEX, ACHIEVEMENTS, ACHIEVEMENTS_BY_ID, get_unlocked_achievements
+from .analytics import EngagementAnalytics, save_analytics
+from .corpus import (
+    Bitset, Corpus, ReasonPool, build_corpus, line_id, load_corpus, next_build_path, open_latest, prune_builds,
+    read_source, reason_id,
+)
+from .dispatch import DropDispatcher, TickReport
+from .leaderboard import Leaderboard
+from .members import MemberStore, wallet_key
+from .search import InvertedIndex
+from .storage import ConfigMembers, SQLiteMembers
+from .selection import FenwickTree, vote_weight
+from .votes import GuildVotes
 
 if TYPE_CHECKING:
     from redbot.core.bot import Red
 
-# ---------------------------------------------------------------------------
-# Achievements definitions
-# ---------------------------------------------------------------------------
-
-ACHIEVEMENTS = [
-    {"id": "first_claim", "name": "🎉 First Claim", "desc": "Claim your first reason", "check": lambda s: s.get("total_claims", 0) >= 1},
-    {"id": "collector_10", "name": "🧺 Collector", "desc": "Claim 10 reasons", "check": lambda s: s.get("total_claims", 0) >= 10},
-    {"id": "collector_50", "name": "📦 Hoarder", "desc": "Claim 50 reasons", "check": lambda s: s.get("total_claims", 0) >= 50},
-    {"id": "streak_5", "name": "🔥 On Fire", "desc": "Reach a 5 W streak", "check": lambda s: s.get("streak", 0) >= 5},
-    {"id": "streak_10", "name": "💥 Unstoppable", "desc": "Reach a 10 W streak", "check": lambda s: s.get("streak", 0) >= 10},
-    {"id": "points_100", "name": "💯 Century", "desc": "Earn 100 points", "check": lambda s: s.get("points", 0) >= 100},
-    {"id": "points_500", "name": "🏆 High Roller", "desc": "Earn 500 points", "check": lambda s: s.get("points", 0) >= 500},
-    {"id": "thief", "name": "😈 Thief", "desc": "Successfully steal once", "check": lambda s: s.get("total_steals_success", 0) >= 1},
-    {"id": "master_thief", "name": "🦹 Master Thief", "desc": "Successfully steal 5 times", "check": lambda s: s.get("total_steals_success", 0) >= 5},
-    {"id": "critic", "name": "👍 Critic", "desc": "Rate 10 reasons as W", "check": lambda s: s.get("total_ws", 0) >= 10},
-]
-
-def get_unlocked_achievements(stats: dict) -> list[dict]:
-    return [a for a in ACHIEVEMENTS if a["check"](stats)]
+# Per-guild collections that only specific handlers need, kept apart from the
+# guild records the loops scan every tick.
+COLD_GROUP = "REASON_GUILD_DATA"
+COLD_GUILD_DEFAULTS = {
+    "opt_out_list": [],
+    "drop_states": {},  # persistent view state: {msg_id: {...}}
+    "pack_added": [],  # guild's own reasons, layered over the shared corpus
+    "pack_disabled": "",  # base64 bitset of disabled corpus indices
+    "reason_votes": {},  # {line_id hex: [ws, ls]}
+}
+
+follow_package(__name__)  # let approx_size look inside this cog's classes
+
+# Process-wide metrics, written to metrics.prom by metrics_loop and shown by
+# `reasondebug stats`. Children are looked up once here, not per click.
+METRICS = MetricsRegistry()
+DROPS_SENT = METRICS.counter("reason_drops_sent_total", "Reason drops posted")
+CLAIMS = METRICS.counter("reason_claims_total", "Drops claimed into a wallet")
+BUTTON_SECONDS = METRICS.histogram("reason_button_seconds", "Drop button handler run time", labels=("button",))
+LOOP_LAG = METRICS.histogram("reason_scheduler_lag_seconds", "How late a drop loop tick started", labels=("loop",))
+ACTIVE_DROPS = METRICS.gauge("reason_active_drops", "Drops whose game view hasn't timed out")
+LIVE_VIEWS = METRICS.gauge("reason_live_views", "Views still listening for clicks", labels=("view",))
+OUTBOUND = METRICS.counter("reason_outbound_total", "Queued message edits by outcome", labels=("result",))
+OUTBOUND_PENDING = METRICS.gauge("reason_outbound_pending", "Message edits waiting in the outbound queue")
+_OUTBOUND = {r: OUTBOUND.labels(r) for r in ("sent", "merged", "shed", "gone", "failed")}
+_game_views: weakref.WeakSet = weakref.WeakSet()
+_wallet_views: weakref.WeakSet = weakref.WeakSet()
+
+
+def _live(views: weakref.WeakSet) -> int:
+    return sum(1 for v in list(views) if not v.is_finished())
+
+
+ACTIVE_DROPS.set_function(lambda: _live(_game_views))
+LIVE_VIEWS.labels("game").set_function(lambda: _live(_game_views))
+LIVE_VIEWS.labels("wallet").set_function(lambda: _live(_wallet_views))
+
+
+def _timed_button(name: str):
+    """Observe a button callback's run time into reason_button_seconds."""
+    return BUTTON_SECONDS.labels(name).timed
+
+
+def _trace_click(trace: TraceRecorder, interaction: discord.Interaction, view: str) -> None:
+    trace.record(
+        "click",
+        view=view,
+        button=(interaction.data or {}).get("custom_id"),
+        guild=interaction.guild.id if interaction.guild else None,
+        channel=interaction.channel_id,
+        user=interaction.user.id if interaction.user else None,
+        message=interaction.message.id if interaction.message else None,
+    )
 
 # ---------------------------------------------------------------------------
 # Persistent View for bot restarts
@@ -38,24 +100,31 @@ class PersistentReasonView(discord.ui.View):
     """
     Minimal persistent view registered on cog load.
     Handles button clicks after bot restart by looking up state from config.
+
+    Drop state is cached on the cog and checked and updated without awaiting,
+    so double clicks can't both pass; Config is written after responding.
     """
 
     def __init__(self, cog):
         super().__init__(timeout=None)
         self.cog = cog
 
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        self.cog._profiler.begin(f"button:{(interaction.data or {}).get('custom_id')}")
+        if self.cog._trace.active:
+            _trace_click(self.cog._trace, interaction, "persistent")
+        return True
+
     async def _get_state(self, interaction: discord.Interaction) -> dict | None:
         if not interaction.message or not interaction.guild:
             return None
-        msg_id = str(interaction.message.id)
-        states = await self.cog.config.guild(interaction.guild).drop_states()
-        return states.get(msg_id)
+        return await self.cog._drop_state(interaction.guild, interaction.message.id)
 
     async def _save_state(self, interaction: discord.Interaction, state: dict) -> None:
         if not interaction.message or not interaction.guild:
             return
         msg_id = str(interaction.message.id)
-        async with self.cog.config.guild(interaction.guild).drop_states() as states:
+        async with self.cog._cold(interaction.guild.id).drop_states() as states:
             states[msg_id] = state
             # Cleanup: keep only last 100 entries
             if len(states) > 100:
@@ -64,6 +133,7 @@ class PersistentReasonView(discord.ui.View):
                     del states[k]
 
     @discord.ui.button(label="Reroll 🎲", style=discord.ButtonStyle.primary, custom_id="reason_reroll", row=0)
+    @_timed_button("reroll")
     async def reroll(self, interaction: discord.Interaction, button: discord.ui.Button):
         state = await self._get_state(interaction)
         if not state:
@@ -74,15 +144,17 @@ class PersistentReasonView(discord.ui.View):
             return await interaction.response.send_message("No rerolls left.", ephemeral=True)
 
         state["rerolls_left"] -= 1
-        state["reason_text"] = random.choice(self.cog.reasons)
-        await self._save_state(interaction, state)
+        self.cog._track(interaction.guild, "reroll", state["reason_text"])
+        state["reason_text"] = await self.cog._draw_reason(interaction.guild, interaction.user.id)
 
         content = self.cog._build_reason_message_content(
             member=interaction.user, reason_text=state["reason_text"]
         )
         await interaction.response.edit_message(content=content)
+        await self._save_state(interaction, state)
 
     @discord.ui.button(label="Claim 🧾", style=discord.ButtonStyle.success, custom_id="reason_claim", row=0)
+    @_timed_button("claim")
     async def claim(self, interaction: discord.Interaction, button: discord.ui.Button):
         state = await self._get_state(interaction)
         if not state:
@@ -93,30 +165,15 @@ class PersistentReasonView(discord.ui.View):
             return await interaction.response.send_message("Already claimed.", ephemeral=True)
 
         state["claimed"] = True
-        await self._save_state(interaction, state)
-
-        mconf = self.cog.config.member(interaction.user)
-        async with mconf.wallet() as wallet:
-            wallet.append({"reason": state["reason_text"], "ts": int(time.time())})
-            if len(wallet) > 500:
-                wallet[:] = wallet[-500:]
-
-        pts = await mconf.points()
-        bonus = 5
-        bonus_msg = ""
-        now = time.time()
-        last_daily = await mconf.last_daily_claim()
-        if now - last_daily >= 86400:
-            bonus += 10
-            bonus_msg = " (🎁 +10 daily bonus!)"
-            await mconf.last_daily_claim.set(now)
-
-        total_claims = await mconf.total_claims()
-        await mconf.points.set(pts + bonus)
-        await mconf.total_claims.set(total_claims + 1)
+        CLAIMS.inc()
+        self.cog._track(interaction.guild, "claim", state["reason_text"])
+        bonus, _, daily = await self.cog._apply_claim(interaction.guild, interaction.user.id, state["reason_text"])
+        bonus_msg = " (🎁 +10 daily bonus!)" if daily else ""
         await interaction.response.send_message(f"🧾 Claimed! +{bonus} pts{bonus_msg}", ephemeral=True)
+        await self._save_state(interaction, state)
 
     @discord.ui.button(label="W 👍", style=discord.ButtonStyle.success, custom_id="reason_w", row=1)
+    @_timed_button("w")
     async def rate_w(self, interaction: discord.Interaction, button: discord.ui.Button):
         state = await self._get_state(interaction)
         if not state:
@@ -127,31 +184,14 @@ class PersistentReasonView(discord.ui.View):
             return await interaction.response.send_message("Already rated.", ephemeral=True)
 
         state["rated"] = True
+        self.cog._track(interaction.guild, "w", state["reason_text"])
+        _, streak = await self.cog._apply_rating(interaction.guild, interaction.user.id, won=True)
+        await interaction.response.send_message(f"👍 W! +10 pts | 🔥 Streak: {streak}", ephemeral=True)
         await self._save_state(interaction, state)
-
-        mconf = self.cog.config.member(interaction.user)
-        pts = await mconf.points()
-        streak = await mconf.streak()
-        total_ws = await mconf.total_ws()
-        await mconf.points.set(pts + 10)
-        await mconf.streak.set(streak + 1)
-        await mconf.total_ws.set(total_ws + 1)
-
-        async with self.cog.config.guild(interaction.guild).best_reasons() as best:
-            found = False
-            for entry in best:
-                if entry["reason"] == state["reason_text"]:
-                    entry["votes"] += 1
-                    found = True
-                    break
-            if not found:
-                best.append({"reason": state["reason_text"], "votes": 1})
-            best.sort(key=lambda x: x["votes"], reverse=True)
-            best[:] = best[:50]
-
-        await interaction.response.send_message(f"👍 W! +10 pts | 🔥 Streak: {streak + 1}", ephemeral=True)
+        await self.cog._record_vote(interaction.guild, state["reason_text"], won=True)
 
     @discord.ui.button(label="L 👎", style=discord.ButtonStyle.danger, custom_id="reason_l", row=1)
+    @_timed_button("l")
     async def rate_l(self, interaction: discord.Interaction, button: discord.ui.Button):
         state = await self._get_state(interaction)
         if not state:
@@ -162,15 +202,14 @@ class PersistentReasonView(discord.ui.View):
             return await interaction.response.send_message("Already rated.", ephemeral=True)
 
         state["rated"] = True
-        await self._save_state(interaction, state)
-
-        mconf = self.cog.config.member(interaction.user)
-        pts = await mconf.points()
-        await mconf.points.set(pts + 2)
-        await mconf.streak.set(0)
+        self.cog._track(interaction.guild, "l", state["reason_text"])
+        await self.cog._apply_rating(interaction.guild, interaction.user.id, won=False)
         await interaction.response.send_message("👎 L. +2 pts | Streak reset.", ephemeral=True)
+        await self._save_state(interaction, state)
+        await self.cog._record_vote(interaction.guild, state["reason_text"], won=False)
 
     @discord.ui.button(label="Steal 😈", style=discord.ButtonStyle.secondary, custom_id="reason_steal", row=1)
+    @_timed_button("steal")
     async def steal(self, interaction: discord.Interaction, button: discord.ui.Button):
         state = await self._get_state(interaction)
         if not state:
@@ -181,39 +220,30 @@ class PersistentReasonView(discord.ui.View):
             return await interaction.response.send_message("Can't steal your own drop.", ephemeral=True)
 
         now = time.time()
-        gconf = self.cog.config.guild(interaction.guild)
-        guild_last_steal = await gconf.guild_last_steal()
-        if now - guild_last_steal < 120:
-            return await interaction.response.send_message(f"Server cooldown. {int(120-(now-guild_last_steal))}s left.", ephemeral=True)
+        left, previous = await self.cog._take_guild_steal(interaction.guild, now)
+        if left:
+            return await interaction.response.send_message(f"Server cooldown. {int(left)}s left.", ephemeral=True)
 
-        mconf = self.cog.config.member(interaction.user)
-        last_steal = await mconf.last_steal()
-        if now - last_steal < 300:
-            return await interaction.response.send_message(f"Your cooldown. {int(300-(now-last_steal))}s left.", ephemeral=True)
-
-        await mconf.last_steal.set(now)
-        await gconf.guild_last_steal.set(now)
-
-        if random.random() < 0.20:
-            stolen = random.randint(5, 15)
-            target = interaction.guild.get_member(state["target_user_id"])
-            if target:
-                tpts = await self.cog.config.member(target).points()
-                stolen = min(stolen, tpts)
-                await self.cog.config.member(target).points.set(tpts - stolen)
-            pts = await mconf.points()
-            total_steals = await mconf.total_steals_success()
-            await mconf.points.set(pts + stolen)
-            await mconf.total_steals_success.set(total_steals + 1)
-            await interaction.response.send_message(f"😈 Stole {stolen} pts!", ephemeral=True)
+        outcome, amount, _ = await self.cog._apply_steal(
+            interaction.guild, interaction.user.id, state["target_user_id"], now
+        )
+        if outcome == "cooldown":
+            self.cog._release_guild_steal(interaction.guild, now, previous)
+            return await interaction.response.send_message(f"Your cooldown. {amount}s left.", ephemeral=True)
+
+        if outcome == "stolen":
+            self.cog._track(interaction.guild, "steal", state["reason_text"])
+            await interaction.response.send_message(f"😈 Stole {amount} pts!", ephemeral=True)
         else:
             await interaction.response.send_message("😅 Steal failed.", ephemeral=True)
+        await self.cog.config.guild(interaction.guild).guild_last_steal.set(now)
 
     @discord.ui.button(label="Mute 🔕", style=discord.ButtonStyle.secondary, custom_id="reason_mute", row=2)
+    @_timed_button("mute")
     async def mute_drops(self, interaction: discord.Interaction, button: discord.ui.Button):
         if not interaction.guild:
             return await interaction.response.send_message("Server only.", ephemeral=True)
-        async with self.cog.config.guild(interaction.guild).opt_out_list() as opt_out:
+        async with self.cog._cold(interaction.guild.id).opt_out_list() as opt_out:
             if interaction.user.id not in opt_out:
                 opt_out.append(interaction.user.id)
                 await interaction.response.send_message("🔕 Muted.", ephemeral=True)
@@ -240,18 +270,19 @@ class ReasonGameView(discord.ui.View):
         *,
         target_user_id: int,
         reason_text: str,
-        all_reasons: list[str],
+        pool: ReasonPool,
     ):
         # 12-hour timeout for interactive buttons
         super().__init__(timeout=43200)
         self.cog = cog
         self.target_user_id = target_user_id
         self.reason_text = reason_text
-        self.all_reasons = all_reasons
+        self.pool = pool
         self.rerolls_left = 2
         self.claimed = False
         self.rated = False
         self.message: discord.Message | None = None  # set after send
+        _game_views.add(self)
 
     async def on_timeout(self) -> None:
         """Disable Reroll, Claim, Steal after 12 hours."""
@@ -261,25 +292,35 @@ class ReasonGameView(discord.ui.View):
             ):
                 child.disabled = True
         if self.message:
-            try:
-                await self.message.edit(view=self)
-            except discord.HTTPException:
-                pass
+            self.cog._outbound.edit(self.message, priority=IDLE, view=self)
 
     # ---- helpers ----
 
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        # Ownership is checked per button; this only labels Config traffic.
+        self.cog._profiler.begin(f"button:{(interaction.data or {}).get('custom_id')}")
+        if self.cog._trace.active:
+            _trace_click(self.cog._trace, interaction, "game")
+        return True
+
     def _owner_only(self, interaction: discord.Interaction) -> bool:
         return interaction.user is not None and interaction.user.id == self.target_user_id
 
-    async def _update_message(self, interaction: discord.Interaction) -> None:
+    def _update_message(self, interaction: discord.Interaction) -> None:
+        """
+        Queue the drop message's edit; clicks close together go out as one edit
+        with the latest state. The clicker is looking at it, so it goes ahead
+        of background edits and reactions.
+        """
         content = self.cog._build_reason_message_content(
             member=interaction.user, reason_text=self.reason_text
         )
-        await interaction.message.edit(content=content, view=self)
+        self.cog._outbound.edit(interaction.message, priority=URGENT, content=content, view=self)
 
     # ---- buttons ----
 
     @discord.ui.button(label="Reroll 🎲", style=discord.ButtonStyle.primary, custom_id="reason_reroll", row=0)
+    @_timed_button("reroll")
     async def reroll(self, interaction: discord.Interaction, button: discord.ui.Button):
         if not self._owner_only(interaction):
             return await interaction.response.send_message("Not your loot drop 🙂", ephemeral=True)
@@ -287,14 +328,16 @@ class ReasonGameView(discord.ui.View):
             return await interaction.response.send_message("No rerolls left on this drop.", ephemeral=True)
 
         self.rerolls_left -= 1
-        self.reason_text = random.choice(self.all_reasons)
+        self.cog._track(interaction.guild, "reroll", self.reason_text)
+        self.reason_text = await self.cog._draw_reason(interaction.guild, interaction.user.id, pool=self.pool)
         if self.rerolls_left == 0:
             button.disabled = True
 
         await interaction.response.defer()
-        await self._update_message(interaction)
+        self._update_message(interaction)
 
     @discord.ui.button(label="Claim 🧾", style=discord.ButtonStyle.success, custom_id="reason_claim", row=0)
+    @_timed_button("claim")
     async def claim(self, interaction: discord.Interaction, button: discord.ui.Button):
         if not self._owner_only(interaction):
             return await interaction.response.send_message("Not your loot drop 🙂", ephemeral=True)
@@ -302,38 +345,20 @@ class ReasonGameView(discord.ui.View):
             return await interaction.response.send_message("Already claimed this one.", ephemeral=True)
 
         self.claimed = True
+        CLAIMS.inc()
         button.disabled = True
 
-        member = interaction.user
-        mconf = self.cog.config.member(member)
-        async with mconf.wallet() as wallet:
-            wallet.append({"reason": self.reason_text, "ts": int(time.time())})
-            # Cap wallet size
-            if len(wallet) > 500:
-                wallet[:] = wallet[-500:]
-
-        pts = await mconf.points()
-        bonus = 5
-        bonus_msg = ""
-
-        # Daily bonus: +10 extra if first claim in 24hrs
-        now = time.time()
-        last_daily = await mconf.last_daily_claim()
-        if now - last_daily >= 86400:  # 24 hours
-            bonus += 10
-            bonus_msg = " (🎁 +10 daily bonus!)"
-            await mconf.last_daily_claim.set(now)
-
-        total_claims = await mconf.total_claims()
-        await mconf.points.set(pts + bonus)
-        await mconf.total_claims.set(total_claims + 1)
+        self.cog._track(interaction.guild, "claim", self.reason_text)
+        bonus, total, daily = await self.cog._apply_claim(interaction.guild, interaction.user.id, self.reason_text)
+        bonus_msg = " (🎁 +10 daily bonus!)" if daily else ""
 
         await interaction.response.send_message(
-            f"🧾 Claimed! +{bonus} pts (total: {pts + bonus}){bonus_msg}", ephemeral=True
+            f"🧾 Claimed! +{bonus} pts (total: {total}){bonus_msg}", ephemeral=True
         )
-        await self._update_message(interaction)
+        self._update_message(interaction)
 
     @discord.ui.button(label="W 👍", style=discord.ButtonStyle.success, custom_id="reason_w", row=1)
+    @_timed_button("w")
     async def rate_w(self, interaction: discord.Interaction, button: discord.ui.Button):
         if not self._owner_only(interaction):
             return await interaction.response.send_message("Not your loot drop 🙂", ephemeral=True)
@@ -347,35 +372,18 @@ class ReasonGameView(discord.ui.View):
             if isinstance(child, discord.ui.Button) and child.custom_id == "reason_l":
                 child.disabled = True
 
-        member = interaction.user
-        mconf = self.cog.config.member(member)
-        pts = await mconf.points()
-        streak = await mconf.streak()
-        total_ws = await mconf.total_ws()
-        await mconf.points.set(pts + 10)
-        await mconf.streak.set(streak + 1)
-        await mconf.total_ws.set(total_ws + 1)
-
-        # Update server best reasons
-        async with self.cog.config.guild(interaction.guild).best_reasons() as best:
-            found = False
-            for entry in best:
-                if entry["reason"] == self.reason_text:
-                    entry["votes"] += 1
-                    found = True
-                    break
-            if not found:
-                best.append({"reason": self.reason_text, "votes": 1})
-            # Keep top 50 by votes
-            best.sort(key=lambda x: x["votes"], reverse=True)
-            best[:] = best[:50]
+        self.cog._track(interaction.guild, "w", self.reason_text)
+        total, streak = await self.cog._apply_rating(interaction.guild, interaction.user.id, won=True)
 
         await interaction.response.send_message(
-            f"👍 W! +10 pts (total: {pts + 10}) | 🔥 Streak: {streak + 1}", ephemeral=True
+            f"👍 W! +10 pts (total: {total}) | 🔥 Streak: {streak}", ephemeral=True
         )
-        await self._update_message(interaction)
+        # Counts toward the server's best reasons (and weighted drops)
+        await self.cog._record_vote(interaction.guild, self.reason_text, won=True)
+        self._update_message(interaction)
 
     @discord.ui.button(label="L 👎", style=discord.ButtonStyle.danger, custom_id="reason_l", row=1)
+    @_timed_button("l")
     async def rate_l(self, interaction: discord.Interaction, button: discord.ui.Button):
         if not self._owner_only(interaction):
             return await interaction.response.send_message("Not your loot drop 🙂", ephemeral=True)
@@ -388,17 +396,17 @@ class ReasonGameView(discord.ui.View):
             if isinstance(child, discord.ui.Button) and child.custom_id == "reason_w":
                 child.disabled = True
 
-        member = interaction.user
-        pts = await self.cog.config.member(member).points()
-        await self.cog.config.member(member).points.set(pts + 2)
-        await self.cog.config.member(member).streak.set(0)
+        self.cog._track(interaction.guild, "l", self.reason_text)
+        total, _ = await self.cog._apply_rating(interaction.guild, interaction.user.id, won=False)
 
         await interaction.response.send_message(
-            f"👎 L. +2 pts (total: {pts + 2}) | Streak reset.", ephemeral=True
+            f"👎 L. +2 pts (total: {total}) | Streak reset.", ephemeral=True
         )
-        await self._update_message(interaction)
+        await self.cog._record_vote(interaction.guild, self.reason_text, won=False)
+        self._update_message(interaction)
 
     @discord.ui.button(label="Steal 😈", style=discord.ButtonStyle.secondary, custom_id="reason_steal", row=1)
+    @_timed_button("steal")
     async def steal(self, interaction: discord.Interaction, button: discord.ui.Button):
         if interaction.user is None or interaction.guild is None:
             return await interaction.response.send_message("Can't do that here.", ephemeral=True)
@@ -409,55 +417,39 @@ class ReasonGameView(discord.ui.View):
 
         now = time.time()
 
-        # Anti-spam: guild-wide cooldown (2 minutes)
-        gconf = self.cog.config.guild(interaction.guild)
-        guild_last_steal = await gconf.guild_last_steal()
-        if now - guild_last_steal < 120:
-            remaining = int(120 - (now - guild_last_steal))
+        # Anti-spam: guild-wide cooldown (2 minutes), taken before anything else is awaited
+        left, previous = await self.cog._take_guild_steal(interaction.guild, now)
+        if left:
             return await interaction.response.send_message(
-                f"Server steal cooldown. Try again in {remaining}s.", ephemeral=True
+                f"Server steal cooldown. Try again in {int(left)}s.", ephemeral=True
             )
 
-        # Per-user cooldown (5 minutes)
-        mconf = self.cog.config.member(interaction.user)
-        last_steal = await mconf.last_steal()
-        if now - last_steal < 300:
-            remaining = int(300 - (now - last_steal))
+        # Per-user cooldown (5 minutes), checked and stamped inside the transaction
+        outcome, amount, total = await self.cog._apply_steal(
+            interaction.guild, interaction.user.id, self.target_user_id, now
+        )
+        if outcome == "cooldown":
+            self.cog._release_guild_steal(interaction.guild, now, previous)
             return await interaction.response.send_message(
-                f"Your steal cooldown. Try again in {remaining}s.", ephemeral=True
+                f"Your steal cooldown. Try again in {amount}s.", ephemeral=True
             )
 
-        await mconf.last_steal.set(now)
-        await gconf.guild_last_steal.set(now)
-
-        # 20% success chance
-        if random.random() < 0.20:
-            # Steal 5-15 points
-            stolen = random.randint(5, 15)
-            target_member = interaction.guild.get_member(self.target_user_id)
-            if target_member:
-                target_pts = await self.cog.config.member(target_member).points()
-                stolen = min(stolen, target_pts)  # Can't go negative
-                await self.cog.config.member(target_member).points.set(target_pts - stolen)
-
-            thief_conf = self.cog.config.member(interaction.user)
-            thief_pts = await thief_conf.points()
-            total_steals = await thief_conf.total_steals_success()
-            await thief_conf.points.set(thief_pts + stolen)
-            await thief_conf.total_steals_success.set(total_steals + 1)
-
+        if outcome == "stolen":
+            self.cog._track(interaction.guild, "steal", self.reason_text)
             await interaction.response.send_message(
-                f"😈 Heist success! Stole {stolen} pts (total: {thief_pts + stolen})", ephemeral=True
+                f"😈 Heist success! Stole {amount} pts (total: {total})", ephemeral=True
             )
         else:
             await interaction.response.send_message("😅 Steal failed. Better luck next time.", ephemeral=True)
+        await self.cog.config.guild(interaction.guild).guild_last_steal.set(now)
 
     @discord.ui.button(label="Mute 🔕", style=discord.ButtonStyle.secondary, custom_id="reason_mute", row=2)
+    @_timed_button("mute")
     async def mute_drops(self, interaction: discord.Interaction, button: discord.ui.Button):
         if interaction.guild is None:
             return await interaction.response.send_message("This button only works inside a server.", ephemeral=True)
 
-        async with self.cog.config.guild(interaction.guild).opt_out_list() as opt_out:
+        async with self.cog._cold(interaction.guild.id).opt_out_list() as opt_out:
             if interaction.user.id not in opt_out:
                 opt_out.append(interaction.user.id)
                 await interaction.response.send_message(
@@ -466,6 +458,72 @@ class ReasonGameView(discord.ui.View):
             else:
                 await interaction.response.send_message("Already opted out.", ephemeral=True)
 
+# ---------------------------------------------------------------------------
+# Wallet pagination
+# ---------------------------------------------------------------------------
+
+class WalletPaginator(discord.ui.View):
+    """
+    Newest-first wallet pages. Each page starts strictly below a (ts, id)
+    cursor, so claims made while paging don't shift what's on screen.
+    """
+
+    PER_PAGE = 10
+
+    def __init__(self, cog, *, owner_id: int, member: discord.Member, timeout: int = 120):
+        super().__init__(timeout=timeout)
+        self.cog = cog
+        self.owner_id = owner_id
+        self.member = member
+        self.cursors: list[tuple[int, str] | None] = [None]  # start cursor of each visited page
+        self.next_cursor: tuple[int, str] | None = None
+        self.total = 0
+        _wallet_views.add(self)
+
+    async def render(self) -> discord.Embed:
+        start, page, self.total = await self.cog.members.wallet_page(
+            self.member.guild.id, self.member.id, self.cursors[-1], self.PER_PAGE
+        )
+        self.next_cursor = wallet_key(page[-1]) if page and start + len(page) < self.total else None
+
+        pool = await self.cog._reason_pool(self.member.guild)
+        lines = []
+        for i, entry in enumerate(page, start + 1):
+            reason = self.cog._resolve_reason(pool, entry)
+            if len(reason) > 80:
+                reason = reason[:77] + "…"
+            lines.append(f"**{i}.** {reason}")
+
+        self.prev_button.disabled = len(self.cursors) <= 1  # type: ignore
+        self.next_button.disabled = self.next_cursor is None  # type: ignore
+        embed = discord.Embed(
+            title=f"🧾 {self.member.display_name}'s Wallet",
+            description="\n".join(lines) or "Nothing here.",
+            color=discord.Color.gold(),
+        )
+        end = start + len(page)
+        embed.set_footer(text=f"Showing {start + 1 if page else 0}-{end} of {self.total} saved reasons")
+        return embed
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        self.cog._profiler.begin("button:wallet_page")
+        if interaction.user and interaction.user.id != self.owner_id:
+            await interaction.response.send_message("Only the requester can use these buttons.", ephemeral=True)
+            return False
+        return True
+
+    @discord.ui.button(label="◀ Newer", style=discord.ButtonStyle.secondary)
+    async def prev_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if len(self.cursors) > 1:
+            self.cursors.pop()
+        await interaction.response.edit_message(embed=await self.render(), view=self)
+
+    @discord.ui.button(label="Older ▶", style=discord.ButtonStyle.secondary)
+    async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if self.next_cursor is not None:
+            self.cursors.append(self.next_cursor)
+        await interaction.response.edit_message(embed=await self.render(), view=self)
+
 class Reason(commands.Cog):
     """
     Ever needed a graceful way to say “no”?
@@ -475,48 +533,376 @@ class Reason(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.config = Config.get_conf(self, identifier=9876543210, force_registration=True)
+        # Scheduling and settings only: the loops scan every guild's record each
+        # tick, so the bulky per-guild collections live in COLD_GROUP instead.
         default_guild = {
             "channel_id": None,
-            "opt_out_list": [],
             "test_enabled": False,
             "test_channel_id": None,
-            "best_reasons": [],  # [{"reason": str, "votes": int}, ...]
             "channel_set_at": 0.0,  # timestamp when channel was configured
             "first_drop_done": False,  # True after 6hr initial drop
             "last_drop_at": 0.0,  # timestamp of last drop for 48hr interval
             "guild_last_steal": 0.0,  # anti-spam: guild-wide steal cooldown
-            "drop_states": {},  # persistent view state: {msg_id: {...}}
+            "no_repeat_scope": "guild",  # "guild" or "user": who shares a shuffle bag
+            "bag": [],  # guild shuffle bag: [seed, cursor, size]
+            "weighted": False,  # draw by W/L record instead of the shuffle bag
         }
         self.config.register_guild(**default_guild)
-        self.config.register_member(
-            seen_intro=False,
-            wallet=[],       # [{"reason": str, "ts": int}, ...]
-            points=0,
-            streak=0,
-            last_steal=0.0,
-            last_daily_claim=0.0,  # daily bonus tracking
-            total_claims=0,
-            total_steals_success=0,
-            total_ws=0,
+        # Read only by the handlers that need them, one guild at a time.
+        self.config.init_custom(COLD_GROUP, 1)
+        self.config.register_custom(COLD_GROUP, **COLD_GUILD_DEFAULTS)
+        self.config.register_global(
+            # 1: wallets store reason ids; 2: best_reasons folded into reason_votes;
+            # 3: achievements stored instead of recomputed
+            schema_version=0,
+            guild_layout=0,  # 1: bulky guild fields moved out to COLD_GROUP
+            gc_marks={},  # {"guild_id" or "guild_id:member_id": first seen departed}
+            member_backend="config",  # or "sqlite": member records in members.sqlite3
+            # "guild" or "shard": processes sharing this data folder split the drop loops
+            # through leases in leases.sqlite3; "off" when one process runs every guild.
+            cluster_leases="off",
         )
-        
-        reasons_path = Path(__file__).parent / "reasons.json"
+        # Written whole by MemberStore transactions; don't set fields directly.
+        self._member_defaults = {
+            "seen_intro": False,
+            "wallet": [],       # [{"id": reason_id hex, "ts": int}, ...]
+            "points": 0,
+            "streak": 0,
+            "last_steal": 0.0,
+            "last_daily_claim": 0.0,  # daily bonus tracking
+            "total_claims": 0,
+            "total_steals_success": 0,
+            "total_ws": 0,
+            "bag": [],  # per-user shuffle bag when no_repeat_scope == "user"
+            "achievements": {},  # {achievement id: unlock ts}
+        }
+        self.config.register_member(**self._member_defaults)
+        # Every Config access below goes through the profiler's proxy; it is a
+        # plain pass-through until `reasondebug profileon`.
+        self._profiler = ConfigProfiler()
+        self.config = ProfiledConfig(self.config, self._profiler)
+        # Off until `reasondebug traceon`; the trace is replayed by benchmarks/replay_trace.py.
+        self._trace = TraceRecorder("reason")
+        self._memtrace = MemoryTracer()  # `reasondebug memtrace`
+
+        # The corpus is compiled once into an mmap-able file in the cog's data
+        # folder; later startups just map it instead of parsing the JSON.
         try:
-            with open(reasons_path, "r", encoding="utf-8") as f:
-                self.reasons = json.load(f)
+            self.reasons = load_corpus(self._corpus_source(), cog_data_path(self), "reasons")
         except Exception as e:
             self.reasons = ["Error loading reasons."]
-            print(f"Error loading reasons.json: {e}")
+            print(f"Error loading reasons corpus: {e}")
+
+        # Lines that left the corpus (or a guild pack) but may still sit in wallets.
+        self._retired: Corpus | None = open_latest(cog_data_path(self), "retired")
+        self._retire_lock = asyncio.Lock()
+
+        # Member records are changed in memory and written by member_flush_loop,
+        # so button handlers can respond before anything touches storage.
+        self.members = MemberStore(ConfigMembers(self.config))  # swapped in cog_load if member_backend is sqlite
+        self._drop_states: OrderedDict[int, dict] = OrderedDict()  # message id -> persistent drop state
+        # Shared by both loops so pacing applies across scheduled and test drops.
+        self._dispatcher = DropDispatcher()
+        # Message edits nobody waits on go through here, merged per message and paced per channel.
+        self._outbound = OutboundQueue(on_result=lambda r: _OUTBOUND[r].inc())
+        OUTBOUND_PENDING.set_function(lambda: self._outbound.pending)
+        self._tick_reports: dict[str, TickReport] = {}
+        self._tick_due: dict[str, float] = {}  # loop name -> when its next tick should start
+        # Set in cog_load when cluster_leases is on; None means this process owns every guild.
+        self._leases: LeaseStore | None = None
+        self._lease_scope = "off"
+        self._pools: dict[int, ReasonPool] = {}  # guild_id -> overlay on self.reasons
+        self._weights: dict[int, tuple[ReasonPool, FenwickTree]] = {}  # weighted-mode guilds only
+        self._weight_builds: dict[int, asyncio.Task] = {}  # first weighted draw builds the tree off the hot path
+        # Rerolls draw before they respond, so what a draw needs is kept in memory: the guild's
+        # draw settings (read once, dropped when changed) and guild shuffle bags, which
+        # member_flush_loop writes back the way it writes member records.
+        self._draw_modes: dict[int, tuple[bool, str]] = {}  # guild_id -> (weighted, no_repeat_scope)
+        self._bags: dict[int, list[int]] = {}
+        self._dirty_bags: set[int] = set()
+        self._guild_steals: dict[int, float] = {}  # guild_id -> last steal; authoritative once loaded
+        self._votes: dict[int, GuildVotes] = {}  # loaded on first vote/read, flushed by vote_flush_loop
+        # Points leaderboards are built from stored points once after startup; changes
+        # made while that scan runs are buffered and replayed on top of it.
+        self._leaderboards: dict[int, Leaderboard] | None = None
+        self._pending_points: dict[tuple[int, int], int] = {}
+        self._unlock_queue: dict[int, list[tuple[int, str]]] = {}  # guild_id -> [(member_id, achievement id)]
+        # Approximate per-reason button counts (sketches), saved by analytics_loop.
+        self._analytics = EngagementAnalytics()
+        try:
+            analytics_path = cog_data_path(self) / "analytics.json"
+            if analytics_path.exists():
+                self._analytics.load(analytics_path.read_bytes())
+        except Exception as e:
+            print(f"Error loading reason analytics: {e}")
+        # Corpus search index is built off-thread after load; wallet indexes are
+        # built on first search and kept for the most recent members only.
+        self._search_index: InvertedIndex | None = None
+        self._wallet_indexes: OrderedDict[tuple[int, int], tuple[tuple, list[dict], InvertedIndex]] = OrderedDict()
+        self._collector = StaleRecordCollector(
+            bot,
+            self.config,
+            cog_data_path(self) / "gc_archive.jsonl",
+            clear_member=self._forget_member,
+            clear_guild=self._forget_guild,
+            prune_guild=self._prune_guild,
+            extra_guilds=self._cold_guilds,
+            all_members=self.members.all_members,
+        )
 
         self.reason_loop.start()
         self.reason_test_loop.start()
+        self.vote_flush_loop.start()
+        self.member_flush_loop.start()
+        self.achievement_loop.start()
+        self.analytics_loop.start()
+        self.gc_loop.start()
+        self.metrics_loop.start()
+        self.lease_loop.start()
+
+    def _cold(self, guild_id: int):
+        """The guild's COLD_GROUP record (opt-outs, drop states, pack, votes)."""
+        return self.config.custom(COLD_GROUP, str(guild_id))
+
+    def _sqlite_members(self) -> SQLiteMembers:
+        return SQLiteMembers(cog_data_path(self) / "members.sqlite3", self._member_defaults)
+
+    async def _switch_member_backend(self, name: str) -> int:
+        """Move every member record to Config or SQLite; returns how many moved."""
+        backend = self._sqlite_members() if name == "sqlite" else ConfigMembers(self.config)
+        try:
+            moved, old = await self.members.switch_backend(backend)
+        except Exception:
+            await backend.close()
+            raise
+        await self.config.member_backend.set(name)
+        await old.clear_all()
+        await old.close()
+        return moved
+
+    def _corpus_source(self) -> Path:
+        """An owner-supplied corpus in the data folder wins over the bundled one."""
+        data = cog_data_path(self)
+        for name in ("reasons.json", "reasons.txt"):
+            if (data / name).exists():
+                return data / name
+        return Path(__file__).parent / "reasons.json"
+
+    async def reload_corpus(self) -> int:
+        """Rebuild the compiled corpus from its source and swap it in; returns the new line count."""
+        source = self._corpus_source()
+        folder = cog_data_path(self)
+
+        def rebuild() -> Corpus:
+            # A new file, not one written over the build the current corpus has mapped.
+            compiled = next_build_path(folder, "reasons")
+            build_corpus(read_source(source), compiled)
+            return Corpus(compiled)
+
+        old = self.reasons
+        corpus = await asyncio.to_thread(rebuild)
+        # Single reference swap: in-flight views keep the corpus they were created with.
+        self.reasons = corpus
+        # Builds still mapped by such views stay until a later reload or restart.
+        await asyncio.to_thread(prune_builds, folder, "reasons", corpus.path)
+        self._index_task = self.bot.loop.create_task(self._build_search_index())
+        if isinstance(old, Corpus):
+            removed = await asyncio.to_thread(
+                lambda: [line for line in old if corpus.index_of_id(line_id(line)) is None]
+            )
+            await self._retire(removed)
+        return len(corpus)
+
+    async def _build_search_index(self) -> None:
+        corpus = self.reasons
+        index = await asyncio.to_thread(InvertedIndex.build, corpus)
+        if corpus is self.reasons:
+            self._search_index = index
+
+    async def _wallet_index(self, member: discord.Member, wallet: list[dict]) -> tuple[list[dict], InvertedIndex]:
+        """Per-member index over resolved wallet text, rebuilt only when the wallet changed."""
+        key = (member.guild.id, member.id)
+        version = (len(wallet), wallet_key(wallet[-1]) if wallet else None)
+        cached = self._wallet_indexes.get(key)
+        if cached and cached[0] == version:
+            self._wallet_indexes.move_to_end(key)
+            return cached[1], cached[2]
+        pool = await self._reason_pool(member.guild)
+        entries = sorted(wallet, key=wallet_key, reverse=True)
+        index = InvertedIndex.build(self._resolve_reason(pool, e) for e in entries)
+        self._wallet_indexes[key] = (version, entries, index)
+        if len(self._wallet_indexes) > 256:
+            self._wallet_indexes.popitem(last=False)
+        return entries, index
+
+    async def _retire(self, lines: list[str]) -> None:
+        """Keep ``lines`` resolvable for wallets after they leave the corpus."""
+        if not lines:
+            return
+        folder = cog_data_path(self)
+        async with self._retire_lock:
+            current = self._retired
+
+            def rebuild() -> Corpus | None:
+                existing = list(current) if current is not None else []
+                new = [line for line in dict.fromkeys(lines) if current is None or current.index_of(line) is None]
+                if not new:
+                    return current
+                path = next_build_path(folder, "retired")
+                build_corpus(existing + new, path)
+                return Corpus(path)
+
+            self._retired = await asyncio.to_thread(rebuild)
+            if self._retired is not None and self._retired is not current:
+                await asyncio.to_thread(prune_builds, folder, "retired", self._retired.path)
+
+    def _resolve_reason(self, pool: ReasonPool, entry: dict) -> str:
+        """Text of a wallet entry; legacy entries still carry their text."""
+        if "reason" in entry:
+            return entry["reason"]
+        lid = int(entry.get("id", "0"), 16)
+        text = pool.text_of_id(lid)
+        if text is None and self._retired is not None:
+            i = self._retired.index_of_id(lid)
+            text = self._retired[i] if i is not None else None
+        return text if text is not None else "(retired reason)"
+
+    async def _migrate_wallets(self) -> None:
+        """One-off: replace wallet text with reason ids, retiring text the corpus doesn't know."""
+        orphaned: list[str] = []
+        all_members = await self.members.all_members()
+        for guild_id, members in all_members.items():
+            guild = self.bot.get_guild(guild_id)
+            pool = await self._reason_pool(guild) if guild else ReasonPool(self.reasons)
+            for member_id, data in members.items():
+                if not any("reason" in e for e in data.get("wallet") or []):
+                    continue
+                async with self.members.member(guild_id, member_id) as rec:
+                    migrated = []
+                    for entry in rec["wallet"]:
+                        if "reason" not in entry:
+                            migrated.append(entry)
+                            continue
+                        rid = reason_id(entry["reason"])
+                        if pool.text_of_id(int(rid, 16)) is None:
+                            orphaned.append(entry["reason"])
+                        migrated.append({"id": rid, "ts": entry.get("ts", 0)})
+                    # Retire before rewriting so no entry is ever unresolvable.
+                    await self._retire(orphaned)
+                    orphaned.clear()
+                    rec["wallet"] = migrated
+                await asyncio.sleep(0)
+
+    async def _migrate_best_reasons(self) -> None:
+        """One-off: fold the legacy top-50 best_reasons lists into the full vote counters."""
+        all_guilds = await self.config.all_guilds()
+        for guild_id, data in all_guilds.items():
+            best = data.get("best_reasons") or []
+            if not best:
+                continue
+            await self._retire([e["reason"] for e in best if self._find_base_index(e["reason"]) is None])
+            votes = await self._guild_votes(guild_id)
+            for entry in best:
+                rid = reason_id(entry["reason"])
+                record = votes.counts.setdefault(rid, [0, 0])
+                record[0] = max(record[0], entry.get("votes", 0))
+                votes.top.update(rid, record[0])
+                votes.dirty.add(rid)
+            await self._flush_votes()
+            # No longer registered, so it can only be removed by name.
+            await self.config.guild_from_id(guild_id).clear_raw("best_reasons")
+
+    async def _migrate_achievements(self) -> None:
+        """One-off: store what members already qualify for, without announcing it."""
+        all_members = await self.members.all_members()
+        for guild_id, members in all_members.items():
+            for member_id, data in members.items():
+                if not get_unlocked_achievements(data):
+                    continue
+                async with self.members.member(guild_id, member_id) as rec:
+                    for a in get_unlocked_achievements(rec):
+                        rec["achievements"].setdefault(a["id"], 0)
+                await asyncio.sleep(0)
+
+    async def _split_guild_data(self) -> None:
+        """One-off: move the bulky fields out of each guild record into COLD_GROUP."""
+        if await self.config.guild_layout() >= 1:
+            return
+        # Unregistered keys still come back from all_guilds() while they're stored.
+        all_guilds = await self.config.all_guilds()
+        for guild_id, data in all_guilds.items():
+            moved = {k: data[k] for k in COLD_GUILD_DEFAULTS if k in data}
+            if not moved:
+                continue
+            await self._cold(guild_id).set(moved)
+            gconf = self.config.guild_from_id(guild_id)
+            for k in moved:
+                await gconf.clear_raw(k)
+            await asyncio.sleep(0)
+        await self.config.guild_layout.set(1)
+
+    async def _migrate(self) -> None:
+        await self.bot.wait_until_ready()
+        version = await self.config.schema_version()
+        if version < 1:
+            await self._migrate_wallets()
+            await self.config.schema_version.set(1)
+        if version < 2:
+            await self._migrate_best_reasons()
+            await self.config.schema_version.set(2)
+        if version < 3:
+            await self._migrate_achievements()
+            await self.config.schema_version.set(3)
+
+    async def _install_corpus_source(self, attachment: discord.Attachment) -> None:
+        """Validate an uploaded corpus and make it the data-folder source."""
+        data = cog_data_path(self)
+        staged = data / f"upload-{attachment.filename}"
+        await attachment.save(staged)
+        try:
+            await asyncio.to_thread(read_source, staged)
+        except Exception:
+            staged.unlink(missing_ok=True)
+            raise
+        for name in ("reasons.json", "reasons.txt"):
+            (data / name).unlink(missing_ok=True)
+        os.replace(staged, data / attachment.filename)
 
     async def cog_load(self) -> None:
         """Register persistent view so buttons work after bot restart."""
+        # Needs no guild objects, and has to finish before anything reads COLD_GROUP.
+        try:
+            await self._split_guild_data()
+        except Exception as e:
+            print(f"Error splitting reason guild data: {e}")
+        if await self.config.member_backend() == "sqlite":
+            self.members.backend = self._sqlite_members()
+        scope = await self.config.cluster_leases()
+        if scope != "off":
+            self._lease_scope = scope
+            self._leases = LeaseStore(cog_data_path(self) / "leases.sqlite3")
         self.bot.add_view(PersistentReasonView(self))
+        self._migration_task = self.bot.loop.create_task(self._migrate())
+        self._index_task = self.bot.loop.create_task(self._build_search_index())
+        self._leaderboard_task = self.bot.loop.create_task(self._build_leaderboards())
+
+    async def cog_before_invoke(self, ctx: commands.Context) -> None:
+        self._profiler.begin(f"command:{ctx.command.qualified_name}")
+        self._trace.record(
+            "command",
+            name=ctx.command.qualified_name,
+            slash=ctx.interaction is not None,
+            guild=ctx.guild.id if ctx.guild else None,
+            channel=ctx.channel.id,
+            user=ctx.author.id,
+            message=ctx.message.id,  # the interaction id for a slash command
+        )
 
     async def _intro_field_text_for(self, member: discord.Member) -> str:
-        seen_intro = await self.config.member(member).seen_intro()
+        if isinstance(member, discord.Member):
+            seen_intro = (await self.members.read(member.guild.id, member.id))["seen_intro"]
+        else:
+            seen_intro = await self.config.member(member).seen_intro()
         if not seen_intro:
             return (
                 "A tiny party-game that drops random ‘reasons’ for laughs.\n"
@@ -548,6 +934,396 @@ class Reason(commands.Cog):
             trimmed = trimmed[: max(0, max_reason_len - 1)] + "…"
         return prefix + trimmed + suffix
 
+    async def _reason_pool(self, guild: discord.Guild | None) -> ReasonPool:
+        """The guild's merged view of the shared corpus and its own pack."""
+        if guild is None:
+            return ReasonPool(self.reasons)
+        pool = self._pools.get(guild.id)
+        # A corpus reload swaps self.reasons, which invalidates every cached pool.
+        if pool is None or pool.base is not self.reasons:
+            cold = self._cold(guild.id)
+            pool = ReasonPool(
+                self.reasons,
+                added=await cold.pack_added(),
+                disabled=Bitset.from_b64(await cold.pack_disabled()),
+            )
+            self._pools[guild.id] = pool
+        return pool
+
+    async def _draw_reason(self, guild: discord.Guild | None, member_id: int, *, pool: ReasonPool | None = None) -> str:
+        """
+        Draw a reason that won't repeat until the guild's (or member's) bag is exhausted.
+
+        Once a guild's settings and bag are loaded this touches no storage: the guild bag
+        is drawn in memory (no await between reading and advancing its cursor, so draws
+        can't share one) and a member bag goes through the write-behind MemberStore.
+        """
+        if pool is None:
+            pool = await self._reason_pool(guild)
+        if guild is None:
+            return pool.choice()
+        weighted, scope = await self._draw_mode(guild)
+        if weighted:
+            tree = self._weight_tree_nowait(guild, pool)
+            if tree is not None and tree.total > 0:
+                return pool.at_raw(tree.sample()) or pool.choice()
+            return pool.choice()  # uniform until the tree is built
+        if scope == "user":
+            async with self.members.member(guild.id, member_id) as rec:
+                return pool.draw(rec["bag"])
+        bag = self._bags.get(guild.id)
+        if bag is None:
+            stored = list(await self.config.guild(guild).bag())
+            bag = self._bags.setdefault(guild.id, stored)  # another draw may have loaded it meanwhile
+        self._dirty_bags.add(guild.id)
+        return pool.draw(bag)
+
+    async def _draw_mode(self, guild: discord.Guild) -> tuple[bool, str]:
+        mode = self._draw_modes.get(guild.id)
+        if mode is None:
+            gconf = self.config.guild(guild)
+            mode = self._draw_modes[guild.id] = (await gconf.weighted(), await gconf.no_repeat_scope())
+        return mode
+
+    async def _flush_bags(self) -> None:
+        """Write back the guild shuffle bags drawn from since the last flush."""
+        dirty, self._dirty_bags = self._dirty_bags, set()
+        try:
+            for guild_id in dirty:
+                bag = self._bags.get(guild_id)
+                if bag is not None:
+                    await self.config.guild_from_id(guild_id).bag.set(list(bag))
+        except BaseException:
+            # Failed or cancelled (the loop stopping at unload): retry on the next flush.
+            self._dirty_bags.update(dirty)
+            raise
+
+    def _weight_tree_nowait(self, guild: discord.Guild, pool: ReasonPool) -> FenwickTree | None:
+        """The pool's weight tree, or None while it is being built in the background."""
+        cached = self._weights.get(guild.id)
+        if cached and cached[0] is pool:
+            return cached[1]
+        if guild.id not in self._weight_builds:
+
+            async def build() -> None:
+                try:
+                    await self._weight_tree(guild, pool)
+                except Exception as e:
+                    print(f"Error building reason weights for guild {guild.id}: {e}")
+                finally:
+                    self._weight_builds.pop(guild.id, None)
+
+            self._weight_builds[guild.id] = asyncio.create_task(build())
+        return None
+
+    async def _weight_tree(self, guild: discord.Guild, pool: ReasonPool) -> FenwickTree:
+        """Fenwick tree of draw weights over the pool's raw indices, built once per pool."""
+        cached = self._weights.get(guild.id)
+        if cached and cached[0] is pool:
+            return cached[1]
+        votes = (await self._guild_votes(guild.id)).counts
+
+        def build() -> FenwickTree:
+            default = vote_weight(0, 0)
+            weights = [0 if pool.at_raw_disabled(i) else default for i in range(pool.raw_size)]
+            for lid, (ws, ls) in votes.items():
+                i = pool.index_of_id(int(lid, 16))
+                if i is not None and weights[i]:
+                    weights[i] = vote_weight(ws, ls)
+            return FenwickTree(weights)
+
+        tree = await asyncio.to_thread(build)
+        self._weights[guild.id] = (pool, tree)
+        return tree
+
+    async def _build_leaderboards(self) -> None:
+        all_points = await self.members.all_points()
+        boards = {guild_id: Leaderboard(points) for guild_id, points in all_points.items()}
+        for (guild_id, member_id), points in self._pending_points.items():
+            boards.setdefault(guild_id, Leaderboard()).update(member_id, points)
+        self._pending_points.clear()
+        self._leaderboards = boards
+
+    def _points_changed(self, guild: discord.Guild | None, member_id: int, points: int) -> None:
+        """Keep the leaderboard in step with a member's new points total."""
+        if guild is None:
+            return
+        if self._leaderboards is None:
+            self._pending_points[(guild.id, member_id)] = points
+            return
+        board = self._leaderboards.get(guild.id)
+        if board is None:
+            board = self._leaderboards[guild.id] = Leaderboard()
+        board.update(member_id, points)
+
+    # ---- member transactions ----
+
+    async def _drop_state(self, guild: discord.Guild, message_id: int) -> dict | None:
+        """A persistent drop's state, cached so button checks don't wait on Config."""
+        state = self._drop_states.get(message_id)
+        if state is None:
+            states = await self._cold(guild.id).drop_states()
+            if str(message_id) not in states:
+                return None
+            state = self._drop_states.setdefault(message_id, states[str(message_id)])
+        self._drop_states.move_to_end(message_id)
+        while len(self._drop_states) > 1024:
+            self._drop_states.popitem(last=False)
+        return state
+
+    @staticmethod
+    def _bump(record: dict, **deltas: int) -> list[str]:
+        """
+        Add ``deltas`` to a member record's counters and unlock what they cross.
+
+        Only thresholds crossed by this change are considered; returns the ids
+        of achievements unlocked just now.
+        """
+        now = int(time.time())
+        fresh = []
+        for stat, delta in deltas.items():
+            old = record[stat]
+            record[stat] = old + delta
+            for a in ACHIEVEMENT_INDEX.crossed(stat, old, old + delta):
+                if a["id"] not in record["achievements"]:
+                    record["achievements"][a["id"]] = now
+                    fresh.append(a["id"])
+        return fresh
+
+    def _member_written(self, guild: discord.Guild, member_id: int, record: dict, fresh: list[str]) -> None:
+        """Bring in-memory indexes up to date once a member transaction has finished."""
+        self._points_changed(guild, member_id, record["points"])
+        if fresh:
+            self._unlock_queue.setdefault(guild.id, []).extend((member_id, aid) for aid in fresh)
+
+    async def _apply_claim(self, guild: discord.Guild, member_id: int, reason_text: str) -> tuple[int, int, bool]:
+        """Wallet entry, points, daily bonus and claim count in one write; returns (bonus, points, daily)."""
+        now = time.time()
+        async with self.members.member(guild.id, member_id) as rec:
+            wallet = rec["wallet"]
+            wallet.append({"id": reason_id(reason_text), "ts": int(now)})
+            if len(wallet) > 500:
+                del wallet[:-500]
+            # Daily bonus: +10 extra if first claim in 24hrs
+            daily = now - rec["last_daily_claim"] >= 86400
+            if daily:
+                rec["last_daily_claim"] = now
+            bonus = 15 if daily else 5
+            fresh = self._bump(rec, points=bonus, total_claims=1)
+        self._member_written(guild, member_id, rec, fresh)
+        return bonus, rec["points"], daily
+
+    async def _apply_rating(self, guild: discord.Guild, member_id: int, *, won: bool) -> tuple[int, int]:
+        """Points, streak and W count in one write; returns (points, streak). The vote is recorded separately."""
+        async with self.members.member(guild.id, member_id) as rec:
+            if won:
+                fresh = self._bump(rec, points=10, streak=1, total_ws=1)
+            else:
+                rec["streak"] = 0
+                fresh = self._bump(rec, points=2)
+        self._member_written(guild, member_id, rec, fresh)
+        return rec["points"], rec["streak"]
+
+    GUILD_STEAL_COOLDOWN = 120
+
+    async def _take_guild_steal(self, guild: discord.Guild, now: float) -> tuple[float, float]:
+        """
+        Check and stamp the guild-wide steal cooldown: (seconds left, previous stamp).
+
+        No seconds left means the stamp is now ``now``, made in memory with no
+        await after the check, so concurrent steals can't both get through.
+        Config is read once per guild and written after the steal responds.
+        """
+        last = self._guild_steals.get(guild.id)
+        if last is None:
+            stored = await self.config.guild(guild).guild_last_steal()
+            last = self._guild_steals.setdefault(guild.id, stored)
+        if now - last < self.GUILD_STEAL_COOLDOWN:
+            return self.GUILD_STEAL_COOLDOWN - (now - last), last
+        self._guild_steals[guild.id] = now
+        return 0.0, last
+
+    def _release_guild_steal(self, guild: discord.Guild, now: float, previous: float) -> None:
+        """Undo ``_take_guild_steal`` when the steal didn't happen (the thief's own cooldown)."""
+        if self._guild_steals.get(guild.id) == now:
+            self._guild_steals[guild.id] = previous
+
+    async def _apply_steal(
+        self, guild: discord.Guild, thief_id: int, target_id: int, now: float
+    ) -> tuple[str, int, int]:
+        """
+        One steal attempt; thief and target change together in one transaction.
+
+        Returns ("cooldown", seconds left, 0), ("failed", 0, 0) or
+        ("stolen", amount, thief's new points).
+        """
+        # Cheap unlocked check first so cooldown spam doesn't wait on the lock.
+        last_steal = (await self.members.read(guild.id, thief_id))["last_steal"]
+        if now - last_steal < 300:
+            return "cooldown", int(300 - (now - last_steal)), 0
+        target_present = guild.get_member(target_id) is not None
+        ids = (thief_id, target_id) if target_present else (thief_id,)
+        async with self.members.transaction(guild.id, *ids) as records:
+            thief = records[thief_id]
+            if now - thief["last_steal"] < 300:
+                # Lost a race with another click; nothing changes.
+                return "cooldown", int(300 - (now - thief["last_steal"])), 0
+            thief["last_steal"] = now
+            # 20% success chance to steal 5-15 points
+            stolen = random.randint(5, 15) if random.random() < 0.20 else 0
+            if stolen and target_present:
+                target = records[target_id]
+                stolen = min(stolen, target["points"])  # Can't go negative
+                target["points"] -= stolen
+            fresh = self._bump(thief, points=stolen, total_steals_success=1) if stolen else []
+        if not stolen:
+            return "failed", 0, 0
+        self._member_written(guild, thief_id, thief, fresh)
+        if target_present:
+            self._points_changed(guild, target_id, records[target_id]["points"])
+        return "stolen", stolen, thief["points"]
+
+    async def _announce_unlocks(self) -> None:
+        """Post queued unlocks, one message per guild; on an error, what wasn't handled goes back in the queue."""
+        queue, self._unlock_queue = self._unlock_queue, {}
+        try:
+            all_guilds = await self.config.all_guilds()
+            for guild_id, unlocks in list(queue.items()):
+                await self._announce_guild_unlocks(guild_id, unlocks, all_guilds.get(guild_id, {}))
+                del queue[guild_id]
+        finally:
+            for guild_id, unlocks in queue.items():
+                # ahead of anything unlocked meanwhile
+                self._unlock_queue[guild_id] = unlocks + self._unlock_queue.get(guild_id, [])
+
+    async def _announce_guild_unlocks(self, guild_id: int, unlocks: list[tuple[int, str]], gdata: dict) -> None:
+        guild = self.bot.get_guild(guild_id)
+        channel_id = gdata.get("test_channel_id") if gdata.get("test_enabled") else gdata.get("channel_id")
+        channel = guild.get_channel(channel_id) if guild and channel_id else None
+        if not isinstance(channel, discord.TextChannel):
+            return
+        lines = [
+            f"<@{member_id}> unlocked **{ACHIEVEMENTS_BY_ID[aid]['name']}** — *{ACHIEVEMENTS_BY_ID[aid]['desc']}*"
+            for member_id, aid in unlocks[:20]
+        ]
+        if len(unlocks) > 20:
+            lines.append(f"…and {len(unlocks) - 20} more!")
+        content = "🏅 **Achievements unlocked**\n" + "\n".join(lines)
+        try:
+            await self._dispatcher.call(
+                route=("POST /channels/{channel_id}/messages", channel.id),
+                guild_id=guild_id,
+                factory=lambda: channel.send(content, allowed_mentions=discord.AllowedMentions(users=False)),
+            )
+        except discord.HTTPException:
+            pass  # Discord refused it (permissions, deleted channel); retrying won't help
+
+    async def _guild_votes(self, guild_id: int) -> GuildVotes:
+        votes = self._votes.get(guild_id)
+        if votes is None:
+            counts = await self._cold(guild_id).reason_votes()
+            # Another coroutine may have loaded it while we awaited.
+            votes = self._votes.setdefault(guild_id, GuildVotes(counts))
+        return votes
+
+    async def _flush_votes(self) -> None:
+        """Write every guild's changed vote counters in one Config write per guild."""
+        for guild_id, votes in list(self._votes.items()):
+            if not votes.dirty:
+                continue
+            changed = votes.take_dirty()
+            try:
+                async with self._cold(guild_id).reason_votes() as stored:
+                    stored.update(changed)
+            except BaseException:
+                # Failed or cancelled (the loop stopping at unload): retry on the next flush.
+                votes.dirty.update(changed)
+                raise
+
+    async def _record_vote(self, guild: discord.Guild, reason_text: str, *, won: bool) -> None:
+        """Count a W/L vote (persisted by the next flush) and nudge the draw weight in O(log n)."""
+        lid = line_id(reason_text)
+        votes = await self._guild_votes(guild.id)
+        before, after = votes.vote(f"{lid:016x}", won=won)
+        cached = self._weights.get(guild.id)
+        if cached and cached[0] is self._pools.get(guild.id):
+            pool, tree = cached
+            i = pool.index_of_id(lid)
+            if i is not None and tree.weight(i):
+                tree.add(i, after - before)
+
+    def _track(self, guild: discord.Guild | None, event: str, reason_text: str) -> None:
+        """Count a button event against the reason on the drop (a few sketch cells, no I/O)."""
+        if guild is not None:
+            self._analytics.record(guild.id, event, line_id(reason_text))
+
+    async def _save_analytics(self) -> None:
+        raw = self._analytics.dump()
+        await asyncio.to_thread(save_analytics, raw, cog_data_path(self) / "analytics.json")
+
+    # ---- stale record collection ----
+
+    DROP_STATE_TTL = 7 * 86400  # persistent drop buttons stop working after this
+
+    async def _forget_member(self, guild_id: int, member_id: int) -> None:
+        await self.members.delete(guild_id, member_id)
+        if self._leaderboards is not None and guild_id in self._leaderboards:
+            self._leaderboards[guild_id].remove(member_id)
+        self._pending_points.pop((guild_id, member_id), None)
+        self._wallet_indexes.pop((guild_id, member_id), None)
+
+    async def _forget_guild(self, guild_id: int) -> None:
+        # Drop in-memory state first so a later flush can't write the guild back.
+        self._votes.pop(guild_id, None)
+        self._pools.pop(guild_id, None)
+        self._weights.pop(guild_id, None)
+        self._draw_modes.pop(guild_id, None)
+        self._bags.pop(guild_id, None)
+        self._dirty_bags.discard(guild_id)
+        self._guild_steals.pop(guild_id, None)
+        self._analytics.guilds.pop(guild_id, None)
+        if self._leaderboards is not None:
+            self._leaderboards.pop(guild_id, None)
+        await self.config.guild_from_id(guild_id).clear()
+        await self._cold(guild_id).clear()
+
+    async def _cold_guilds(self) -> dict[int, dict]:
+        """Every stored COLD_GROUP record, for guilds the collector can't see through all_guilds()."""
+        return {int(k): v for k, v in (await self.config.custom(COLD_GROUP).all()).items()}
+
+    async def _prune_guild(self, guild: discord.Guild, data: dict) -> tuple[int, int]:
+        """Expired persistent drop states, and opt-outs of users who left; returns (entries, bytes)."""
+        removed = nbytes = 0
+        cold = self._cold(guild.id)
+        cutoff = (time.time() - self.DROP_STATE_TTL) * 1000 - discord.utils.DISCORD_EPOCH
+        stale = [k for k in data.get("drop_states", {}) if (int(k) >> 22) < cutoff]
+        if stale:
+            async with cold.drop_states() as states:
+                for k in stale:
+                    if k in states:
+                        nbytes += len(json.dumps(states.pop(k)))
+                        self._drop_states.pop(int(k), None)
+                        removed += 1
+        if guild.chunked:
+            gone = [
+                uid for uid in data.get("opt_out_list", [])
+                if guild.get_member(uid) is None and self._collector.departed(f"{guild.id}:{uid}")
+            ]
+            if gone:
+                async with cold.opt_out_list() as opt_out:
+                    opt_out[:] = [uid for uid in opt_out if uid not in gone]
+                removed += len(gone)
+                nbytes += sum(len(str(uid)) + 2 for uid in gone)
+        return removed, nbytes
+
+    def _find_base_index(self, text: str) -> int | None:
+        if isinstance(self.reasons, Corpus):
+            return self.reasons.index_of(text)
+        for i, line in enumerate(self.reasons):
+            if line == text:
+                return i
+        return None
+
     def _eligible_members_for_channel(
         self,
         *,
@@ -558,8 +1334,9 @@ class Reason(commands.Cog):
         # We can't reliably know "who is currently in" a text channel, so we use
         # "can view channel" as the meaning of "from that channel".
         members: list[discord.Member] = []
+        opted_out = set(opt_out)  # Config hands us a list; don't scan it once per member
         for m in guild.members:
-            if m.bot or m.id in opt_out:
+            if m.bot or m.id in opted_out:
                 continue
             perms = channel.permissions_for(m)
             # discord.py v2: view_channel is the primary gate.
@@ -567,61 +1344,120 @@ class Reason(commands.Cog):
                 members.append(m)
         return members
 
-    async def _send_reason_drop(self, *, guild: discord.Guild, channel_id: int, title: str = "Reason") -> None:
+    async def _send_reason_drop(self, *, guild: discord.Guild, channel_id: int, title: str = "Reason") -> bool | None:
+        """Send one drop; True if a message went out, None if there was nothing to send, False if sending failed."""
         channel = guild.get_channel(channel_id)
         if not channel or not isinstance(channel, discord.abc.GuildChannel):
-            return
+            return None
 
-        opt_out = await self.config.guild(guild).opt_out_list()
+        opt_out = await self._cold(guild.id).opt_out_list()
         members = self._eligible_members_for_channel(guild=guild, channel=channel, opt_out=opt_out)
         if not members:
-            return
+            return None
 
         member = random.choice(members)
-        reason_text = random.choice(self.reasons)
+        pool = await self._reason_pool(guild)
+        reason_text = await self._draw_reason(guild, member.id, pool=pool)
         embed = await self._build_reason_embed(member=member, reason_text=reason_text, title=title)
         view = ReasonGameView(
             self,
             target_user_id=member.id,
             reason_text=reason_text,
-            all_reasons=self.reasons,
+            pool=pool,
         )
         message_content = self._build_reason_message_content(member=member, reason_text=reason_text)
 
         try:
-            msg = await channel.send(content=message_content, embed=embed, view=view)  # type: ignore[attr-defined]
+            # Only the send itself can be retried, and only when it never reached
+            # Discord; a retry after the config writes below could post the drop twice.
+            msg = await self._dispatcher.call(
+                route=("POST /channels/{channel_id}/messages", channel.id),
+                guild_id=guild.id,
+                factory=lambda: channel.send(content=message_content, embed=embed, view=view),  # type: ignore[attr-defined]
+            )
             view.message = msg  # for on_timeout editing
-            await self.config.member(member).seen_intro.set(True)
+            # The message is live: give its buttons their state before anything else can fail.
+            state = {
+                "target_user_id": member.id,
+                "reason_text": reason_text,
+                "rerolls_left": 2,
+                "claimed": False,
+                "rated": False,
+            }
+            self._drop_states[msg.id] = state
+            DROPS_SENT.inc()
+            self._trace.record(
+                "drop", source=title, guild=guild.id, channel=channel.id, message=msg.id, target=member.id
+            )
+            async with self.members.member(guild.id, member.id) as rec:
+                rec["seen_intro"] = True
 
             # Save state for persistent view (survives bot restart)
-            async with self.config.guild(guild).drop_states() as states:
-                states[str(msg.id)] = {
-                    "target_user_id": member.id,
-                    "reason_text": reason_text,
-                    "rerolls_left": 2,
-                    "claimed": False,
-                    "rated": False,
-                }
+            async with self._cold(guild.id).drop_states() as states:
+                states[str(msg.id)] = state
                 # Cleanup: keep only last 100 entries
                 if len(states) > 100:
                     sorted_keys = sorted(states.keys(), key=int)
                     for k in sorted_keys[:-100]:
                         del states[k]
         except discord.Forbidden:
-            pass
+            return False
         except Exception as e:
             print(f"Error sending reason in guild {guild.id}: {e}")
-
-    def cog_unload(self):
-        self.reason_loop.cancel()
-        self.reason_test_loop.cancel()
+            return False
+        return True
+
+    async def _scheduled_drop(self, *, guild: discord.Guild, channel_id: int, now: float, first: bool) -> bool | None:
+        sent = await self._send_reason_drop(guild=guild, channel_id=channel_id, title="Reason")
+        gconf = self.config.guild(guild)
+        if first:
+            await gconf.first_drop_done.set(True)
+        await gconf.last_drop_at.set(now)
+        return sent
+
+    async def cog_unload(self):
+        for name in ("_migration_task", "_index_task", "_leaderboard_task"):
+            task = getattr(self, name, None)
+            if task:
+                task.cancel()
+        loops = (
+            self.reason_loop, self.reason_test_loop, self.vote_flush_loop, self.member_flush_loop,
+            self.achievement_loop, self.analytics_loop, self.gc_loop, self.metrics_loop, self.lease_loop,
+        )
+        for loop in loops:
+            loop.cancel()
+        for task in self._weight_builds.values():
+            task.cancel()
+        # Let every cancelled loop unwind before the final flushes: a flush
+        # cancelled mid-write puts its records back, and only then does the
+        # final flush below see them.
+        running = [t for t in (loop.get_task() for loop in loops) if t is not None]
+        await asyncio.gather(*running, return_exceptions=True)
+        steps = [
+            self._dispatcher.close, self._outbound.close, self._flush_votes, self.members.flush, self._flush_bags,
+            self.members.backend.close, self._save_analytics,
+        ]
+        if self._leases is not None:
+            # Hand our guilds over now rather than after the TTL.
+            steps += [self._leases.release_all, self._leases.close]
+        # One failing step must not skip the ones after it (a member flush above all).
+        for step in steps:
+            try:
+                await step()
+            except Exception as e:
+                print(f"Error unloading Reason ({step.__name__}): {e}")
+        self._trace.stop()
+        self._memtrace.stop()
 
     @tasks.loop(minutes=30)
     async def reason_loop(self):
         """Check every 30 mins; first drop 6hrs after channel set, then every 48hrs."""
+        self._observe_tick("scheduled", self.reason_loop)
         now = time.time()
-        all_guilds = await self.config.all_guilds()
-        for guild in self.bot.guilds:
+        guilds = self._owned_guilds()
+        all_guilds = await self._guild_settings(guilds)
+        jobs = []
+        for guild in guilds:
             gdata = all_guilds.get(guild.id, {})
             # If test mode is enabled, the 1-minute loop handles this guild.
             if gdata.get("test_enabled"):
@@ -630,7 +1466,6 @@ class Reason(commands.Cog):
             if not channel_id:
                 continue
 
-            gconf = self.config.guild(guild)
             channel_set_at = gdata.get("channel_set_at", 0)
             first_drop_done = gdata.get("first_drop_done", False)
 
@@ -638,28 +1473,200 @@ class Reason(commands.Cog):
                 # First drop: 6 hours after channel was set
                 if now - channel_set_at < 6 * 3600:
                     continue  # not yet time
-                await self._send_reason_drop(guild=guild, channel_id=channel_id, title="Reason")
-                await gconf.first_drop_done.set(True)
-                await gconf.last_drop_at.set(now)
             else:
                 # Subsequent drops: every 48 hours
                 last_drop = gdata.get("last_drop_at", 0)
                 if now - last_drop < 48 * 3600:
                     continue
-                await self._send_reason_drop(guild=guild, channel_id=channel_id, title="Reason")
-                await gconf.last_drop_at.set(now)
+            jobs.append(functools.partial(
+                self._scheduled_drop, guild=guild, channel_id=channel_id, now=now, first=not first_drop_done
+            ))
+
+        # Due guilds are sent concurrently so one slow channel doesn't hold up the rest.
+        report = await self._dispatcher.run(jobs)
+        self._tick_reports["scheduled"] = report
+        if report.failed or report.timed_out:
+            print(f"Reason drop tick: {report.summary()}")
 
     @tasks.loop(minutes=1)
     async def reason_test_loop(self):
-        all_guilds = await self.config.all_guilds()
-        for guild in self.bot.guilds:
+        self._observe_tick("test", self.reason_test_loop)
+        guilds = self._owned_guilds()
+        all_guilds = await self._guild_settings(guilds)
+        jobs = []
+        for guild in guilds:
             gdata = all_guilds.get(guild.id, {})
             if not gdata.get("test_enabled"):
                 continue
             channel_id = gdata.get("test_channel_id")
             if not channel_id:
                 continue
-            await self._send_reason_drop(guild=guild, channel_id=channel_id, title="Reason (Test)")
+            jobs.append(functools.partial(
+                self._send_reason_drop, guild=guild, channel_id=channel_id, title="Reason (Test)"
+            ))
+        self._tick_reports["test"] = await self._dispatcher.run(jobs)
+
+    def _memory_report(self) -> list[str]:
+        """Counts and approximate sizes of what the cog keeps in memory, for `reasondebug memory`."""
+        # Shared objects are reported on their own lines, not once per view that points at them.
+        shared = (Reason, ReasonPool, Corpus)
+        lines = []
+        rss = process_rss()
+        lines.append(f"process RSS {fmt_bytes(rss) if rss is not None else 'n/a'}")
+        for name, views in (("ReasonGameView", list(_game_views)), ("WalletPaginator", list(_wallet_views))):
+            live = sum(1 for v in views if not v.is_finished())
+            size = approx_size([vars(v) for v in views], skip=shared)
+            lines.append(f"`{name}` {live} live, {len(views) - live} finished but not collected, ~{fmt_bytes(size)}")
+        if isinstance(self.reasons, Corpus):
+            corpus = f"{len(self.reasons)} lines, {fmt_bytes(self.reasons.nbytes)} mapped (page cache, not heap)"
+        else:
+            corpus = f"{len(self.reasons)} lines in a list, ~{fmt_bytes(approx_size(self.reasons))}"
+        lines.append(f"corpus {corpus}")
+        if self._retired is not None:
+            lines.append(f"retired corpus {len(self._retired)} lines, {fmt_bytes(self._retired.nbytes)} mapped")
+        caches = [
+            ("member records", self.members.cached, self.members.nbytes),
+            ("drop states", len(self._drop_states), approx_size(self._drop_states)),
+            ("guild pools", len(self._pools), approx_size(self._pools, skip=(Corpus,))),
+            ("weight trees", len(self._weights), approx_size(self._weights, skip=(Corpus,))),
+            ("vote tallies", len(self._votes), approx_size(self._votes)),
+            ("leaderboards", len(self._leaderboards or {}), approx_size(self._leaderboards or {})),
+            ("wallet search indexes", len(self._wallet_indexes), approx_size(self._wallet_indexes)),
+        ]
+        for name, count, size in caches:
+            lines.append(f"{name}: {count}, ~{fmt_bytes(size)}")
+        if self._search_index is not None:
+            lines.append(f"corpus search index: {len(self._search_index)} tokens, {fmt_bytes(self._search_index.nbytes)}")
+        lines.append(f"analytics sketches: {fmt_bytes(self._analytics.nbytes)} of {fmt_bytes(self._analytics.budget_bytes)}")
+        lines.append(f"member writes pending: {self.members.pending}")
+        return lines
+
+    def _lease_name(self, guild: discord.Guild) -> str:
+        return f"shard:{guild.shard_id}" if self._lease_scope == "shard" else f"guild:{guild.id}"
+
+    def _owned_guilds(self) -> list[discord.Guild]:
+        """Guilds whose drops this process schedules: all of them unless cluster leases are on."""
+        if self._leases is None:
+            return list(self.bot.guilds)
+        return [g for g in self.bot.guilds if self._leases.holds(self._lease_name(g))]
+
+    async def _guild_settings(self, guilds: list[discord.Guild]) -> dict[int, dict]:
+        if self._leases is None:
+            return await self.config.all_guilds()
+        # Each process reads only its own share instead of every process scanning every guild.
+        records = await asyncio.gather(*(self.config.guild(g).all() for g in guilds))
+        return {g.id: rec for g, rec in zip(guilds, records)}
+
+    def _gc_leases(self) -> set[str]:
+        # One GC lease per shard: its holder sweeps that shard's guilds. Only a
+        # process running the shard can tell its live guilds from departed ones.
+        return {f"gc:{s}" for s in local_shards(self.bot)}
+
+    def _gc_shards(self) -> set[int] | None:
+        """Shards this process sweeps: all of its own, or those whose GC lease it holds."""
+        if self._leases is None:
+            return None
+        return {s for s in local_shards(self.bot) if self._leases.holds(f"gc:{s}")}
+
+    async def _renew_leases(self) -> None:
+        if self._leases is not None:
+            await self._leases.renew({self._lease_name(g) for g in self.bot.guilds} | self._gc_leases())
+
+    async def _set_cluster_leases(self, scope: str) -> None:
+        old = self._leases
+        self._leases = None
+        if old is not None:
+            await old.release_all()
+            await old.close()
+        self._lease_scope = scope
+        if scope != "off":
+            leases = LeaseStore(cog_data_path(self) / "leases.sqlite3")
+            await leases.renew({self._lease_name(g) for g in self.bot.guilds} | self._gc_leases())
+            self._leases = leases
+        await self.config.cluster_leases.set(scope)
+
+    @tasks.loop(seconds=LeaseStore.TTL / 3)
+    async def lease_loop(self):
+        try:
+            await self._renew_leases()
+        except Exception as e:
+            print(f"Error renewing reason leases: {e}")
+
+    @lease_loop.before_loop
+    async def before_lease_loop(self):
+        await self.bot.wait_until_ready()
+
+    def _observe_tick(self, name: str, loop: tasks.Loop) -> None:
+        """Record how late this tick of ``loop`` started, and when the next one is due."""
+        due = self._tick_due.get(name)
+        now = time.time()
+        if due is not None:
+            LOOP_LAG.labels(name).observe(max(0.0, now - due))
+        if loop.next_iteration is not None:
+            self._tick_due[name] = loop.next_iteration.timestamp()
+
+    @tasks.loop(seconds=60)
+    async def metrics_loop(self):
+        try:
+            text = METRICS.render()
+            await asyncio.to_thread(write_textfile, cog_data_path(self) / "metrics.prom", text)
+        except Exception as e:
+            print(f"Error writing reason metrics: {e}")
+
+    @tasks.loop(seconds=15)
+    async def vote_flush_loop(self):
+        try:
+            await self._flush_votes()
+        except Exception as e:
+            print(f"Error flushing reason votes: {e}")
+
+    @tasks.loop(seconds=5)
+    async def member_flush_loop(self):
+        """Write member records changed since the last tick, one write per member, and guild shuffle bags."""
+        try:
+            await self.members.flush()
+        except Exception as e:
+            print(f"Error flushing reason member records: {e}")
+        try:
+            await self._flush_bags()
+        except Exception as e:
+            print(f"Error flushing reason shuffle bags: {e}")
+
+    @tasks.loop(minutes=10)
+    async def analytics_loop(self):
+        try:
+            await self._save_analytics()
+        except Exception as e:
+            print(f"Error saving reason analytics: {e}")
+
+    @tasks.loop(seconds=60)
+    async def achievement_loop(self):
+        if self._unlock_queue:
+            try:
+                await self._announce_unlocks()
+            except Exception as e:
+                print(f"Error announcing reason achievements: {e}")
+
+    @tasks.loop(hours=6)
+    async def gc_loop(self):
+        shards = self._gc_shards()
+        if shards is not None and not shards:
+            return
+        try:
+            report = await self._collector.sweep(shards)
+        except Exception as e:
+            print(f"Error collecting stale reason records: {e}")
+            return
+        if report.guilds_removed or report.members_removed or report.entries_pruned:
+            print(f"Reason GC: {report.summary()}")
+
+    @gc_loop.before_loop
+    async def before_gc_loop(self):
+        await self.bot.wait_until_ready()
+
+    @achievement_loop.before_loop
+    async def before_achievement_loop(self):
+        await self.bot.wait_until_ready()
 
     @reason_loop.before_loop
     async def before_reason_loop(self):
@@ -684,17 +1691,25 @@ class Reason(commands.Cog):
             await self.send_reason(ctx)
 
     async def send_reason(self, ctx):
-        reason_text = random.choice(self.reasons)
+        pool = await self._reason_pool(ctx.guild)
+        reason_text = await self._draw_reason(ctx.guild, ctx.author.id, pool=pool)
         embed = await self._build_reason_embed(member=ctx.author, reason_text=reason_text, title="Reason")
         view = ReasonGameView(
             self,
             target_user_id=ctx.author.id,
             reason_text=reason_text,
-            all_reasons=self.reasons,
+            pool=pool,
         )
         content = self._build_reason_message_content(member=ctx.author, reason_text=reason_text)
-        await ctx.send(content=content, embed=embed, view=view)
-        await self.config.member(ctx.author).seen_intro.set(True)
+        msg = await ctx.send(content=content, embed=embed, view=view)
+        view.message = msg
+        self._trace.record(
+            "drop", source="command", guild=ctx.guild.id if ctx.guild else None, channel=ctx.channel.id,
+            message=msg.id, target=ctx.author.id,
+        )
+        if ctx.guild is not None:
+            async with self.members.member(ctx.guild.id, ctx.author.id) as rec:
+                rec["seen_intro"] = True
 
     @reason.command(name="channel")
     @app_commands.describe(channel="The channel for random drops")
@@ -755,6 +1770,33 @@ class Reason(commands.Cog):
         await self._send_reason_drop(guild=ctx.guild, channel_id=channel_id, title="Reason (Test)")
         await ctx.send("✅ Test drop sent.")
 
+    @reason.command(name="norepeat")
+    @app_commands.describe(scope="guild: nobody sees a repeat until all reasons dropped; user: tracked per member")
+    @checks.admin_or_permissions(manage_guild=True)
+    @commands.guild_only()
+    async def reason_norepeat(self, ctx, scope: str):
+        """Choose whether the no-repeat shuffle is shared by the server or kept per member."""
+        scope = scope.lower()
+        if scope not in ("guild", "user"):
+            return await ctx.send("Scope must be `guild` or `user`.")
+        await self.config.guild(ctx.guild).no_repeat_scope.set(scope)
+        self._draw_modes.pop(ctx.guild.id, None)
+        await ctx.send(f"✅ Reasons won't repeat until exhausted, tracked per {scope}.")
+
+    @reason.command(name="weighted")
+    @app_commands.describe(enabled="on: well-rated reasons drop more often; off: no-repeat shuffle")
+    @checks.admin_or_permissions(manage_guild=True)
+    @commands.guild_only()
+    async def reason_weighted(self, ctx, enabled: bool):
+        """Let W/L votes decide how often each reason drops."""
+        await self.config.guild(ctx.guild).weighted.set(enabled)
+        self._weights.pop(ctx.guild.id, None)
+        self._draw_modes.pop(ctx.guild.id, None)
+        if enabled:
+            await ctx.send("✅ Reasons with more 👍 now drop more often (👎 makes them rarer).")
+        else:
+            await ctx.send("✅ Back to the no-repeat shuffle.")
+
     @reason.command(name="help")
     async def reason_help(self, ctx):
         """Show help for the Reason cog."""
@@ -771,10 +1813,15 @@ class Reason(commands.Cog):
             "**Commands:**\n"
             "`/reason` — instant drop for yourself\n"
             "`/reason wallet` — view your saved reasons\n"
+            "`/reason search` — find reasons in your wallet or the whole list\n"
             "`/reason stats` — view your points & streak\n"
             "`/reason best` — server's top-rated reasons\n"
+            "`/reason top` / `/reason rank` — points leaderboard and your place on it\n"
             "`/reason channel` — (admin) set drop channel\n"
-            "`/reason channelclear` — (admin) disable drops"
+            "`/reason channelclear` — (admin) disable drops\n"
+            "`/reason pack` — (admin) add or disable reasons for this server\n"
+            "`/reason norepeat` — (admin) no-repeat tracking per server or per member\n"
+            "`/reason weighted` — (admin) let votes decide how often reasons drop"
         )
         embed = discord.Embed(title="Reason Help", description=msg, color=discord.Color.blue())
         embed.set_footer(text="For when you need a NO with style — in-game.")
@@ -785,26 +1832,48 @@ class Reason(commands.Cog):
     async def reason_wallet(self, ctx, member: discord.Member | None = None):
         """View your (or another user's) saved reasons."""
         member = member or ctx.author
-        wallet = await self.config.member(member).wallet()
-        if not wallet:
+        view = WalletPaginator(self, owner_id=ctx.author.id, member=member)
+        embed = await view.render()
+        if not view.total:
             return await ctx.send(f"{member.display_name} has no saved reasons yet.")
+        await ctx.send(embed=embed, view=view if view.next_cursor is not None else None)
 
-        # Newest first, show up to 10
-        wallet = sorted(wallet, key=lambda x: x.get("ts", 0), reverse=True)[:10]
-        lines = []
-        for i, entry in enumerate(wallet, 1):
-            reason = entry.get("reason", "?")
-            if len(reason) > 80:
-                reason = reason[:77] + "…"
-            lines.append(f"**{i}.** {reason}")
-
-        embed = discord.Embed(
-            title=f"🧾 {member.display_name}'s Wallet",
-            description="\n".join(lines),
-            color=discord.Color.gold(),
-        )
-        total = len(await self.config.member(member).wallet())
-        embed.set_footer(text=f"Showing latest 10 of {total} saved reasons")
+    @reason.command(name="search")
+    @app_commands.describe(term="Words to look for (the last one can be partial)")
+    @commands.guild_only()
+    async def reason_search(self, ctx, *, term: str):
+        """Search your wallet and every reason for a word or phrase."""
+        wallet = (await self.members.read(ctx.guild.id, ctx.author.id))["wallet"]
+        pool = await self._reason_pool(ctx.guild)
+
+        wallet_lines = []
+        if wallet:
+            entries, index = await self._wallet_index(ctx.author, wallet)
+            for i in index.search(term, limit=5):
+                wallet_lines.append(self._resolve_reason(pool, entries[i]))
+
+        corpus_lines = []
+        if self._search_index is not None:
+            # Disabled lines are skipped inside the search so they don't use up the limit.
+            for i in self._search_index.search(term, limit=10, skip=pool.disabled.__contains__):
+                corpus_lines.append(self.reasons[i])
+        # Guild pack lines are few enough to match directly.
+        words = term.lower().split()
+        for line in pool.added:
+            if len(corpus_lines) >= 10:
+                break
+            if all(w in line.lower() for w in words):
+                corpus_lines.append(line)
+
+        def fmt(lines: list[str]) -> str:
+            return "\n".join(f"• {r[:77] + '…' if len(r) > 80 else r}" for r in lines)
+
+        embed = discord.Embed(title=f"🔎 Reasons matching “{term[:50]}”", color=discord.Color.gold())
+        embed.add_field(name="🧾 In your wallet", value=fmt(wallet_lines) or "No matches.", inline=False)
+        if self._search_index is None:
+            embed.add_field(name="📚 All reasons", value="Search index is still building, try again shortly.", inline=False)
+        else:
+            embed.add_field(name="📚 All reasons", value=fmt(corpus_lines) or "No matches.", inline=False)
         await ctx.send(embed=embed)
 
     @reason.command(name="stats")
@@ -812,37 +1881,22 @@ class Reason(commands.Cog):
     async def reason_stats(self, ctx, member: discord.Member | None = None):
         """View your (or another user's) points, streak, and achievements."""
         member = member or ctx.author
-        mconf = self.config.member(member)
-
-        # Batch read member stats
-        points = await mconf.points()
-        streak = await mconf.streak()
-        wallet = await mconf.wallet()
-        total_claims = await mconf.total_claims()
-        total_steals_success = await mconf.total_steals_success()
-        total_ws = await mconf.total_ws()
-
-        stats_dict = {
-            "points": points,
-            "streak": streak,
-            "total_claims": total_claims,
-            "total_steals_success": total_steals_success,
-            "total_ws": total_ws,
-        }
+        # One bulk read of the whole record
+        rec = await self.members.read(ctx.guild.id, member.id)
 
         embed = discord.Embed(
             title=f"📊 {member.display_name}'s Stats",
             color=discord.Color.blurple(),
         )
-        embed.add_field(name="Points", value=str(points), inline=True)
-        embed.add_field(name="🔥 Streak", value=str(streak), inline=True)
-        embed.add_field(name="🧾 Wallet", value=str(len(wallet)), inline=True)
-        embed.add_field(name="Claims", value=str(total_claims), inline=True)
-        embed.add_field(name="Steals", value=str(total_steals_success), inline=True)
-        embed.add_field(name="W Ratings", value=str(total_ws), inline=True)
-
-        # Achievements
-        unlocked = get_unlocked_achievements(stats_dict)
+        embed.add_field(name="Points", value=str(rec["points"]), inline=True)
+        embed.add_field(name="🔥 Streak", value=str(rec["streak"]), inline=True)
+        embed.add_field(name="🧾 Wallet", value=str(len(rec["wallet"])), inline=True)
+        embed.add_field(name="Claims", value=str(rec["total_claims"]), inline=True)
+        embed.add_field(name="Steals", value=str(rec["total_steals_success"]), inline=True)
+        embed.add_field(name="W Ratings", value=str(rec["total_ws"]), inline=True)
+
+        # Achievements are unlocked as counters change; just list what's stored.
+        unlocked = [a for a in ACHIEVEMENTS if a["id"] in rec["achievements"]]
         if unlocked:
             ach_text = "\n".join(f"{a['name']} — *{a['desc']}*" for a in unlocked)
         else:
@@ -851,20 +1905,58 @@ class Reason(commands.Cog):
 
         await ctx.send(embed=embed)
 
+    @reason.command(name="top")
+    @commands.guild_only()
+    async def reason_top(self, ctx):
+        """View this server's points leaderboard."""
+        if self._leaderboards is None:
+            return await ctx.send("The leaderboard is still loading, try again in a moment.")
+        board = self._leaderboards.get(ctx.guild.id)
+        top = board.top(10) if board else []
+        if not top:
+            return await ctx.send("No points yet. Claim or rate a reason to get on the board!")
+
+        lines = []
+        for member_id, points in top:
+            member = ctx.guild.get_member(member_id)
+            name = member.display_name if member else f"<@{member_id}>"
+            lines.append(f"**{board.rank(member_id)}.** {name} — {points} pts")
+        embed = discord.Embed(
+            title="🏅 Server Leaderboard",
+            description="\n".join(lines),
+            color=discord.Color.gold(),
+        )
+        rank = board.rank(ctx.author.id)
+        if rank is not None:
+            embed.set_footer(text=f"You're #{rank} of {len(board)}")
+        await ctx.send(embed=embed)
+
+    @reason.command(name="rank")
+    @commands.guild_only()
+    async def reason_rank(self, ctx, member: discord.Member | None = None):
+        """See where you (or another user) stand on the points leaderboard."""
+        member = member or ctx.author
+        if self._leaderboards is None:
+            return await ctx.send("The leaderboard is still loading, try again in a moment.")
+        board = self._leaderboards.get(ctx.guild.id)
+        rank = board.rank(member.id) if board else None
+        if rank is None:
+            return await ctx.send(f"{member.display_name} isn't on the board yet.")
+        await ctx.send(f"🏅 {member.display_name} is **#{rank}** of {len(board)} with {board.points(member.id)} pts.")
+
     @reason.command(name="best")
     @commands.guild_only()
     async def reason_best(self, ctx):
         """View this server's top-rated reasons."""
-        best = await self.config.guild(ctx.guild).best_reasons()
+        # Maintained incrementally on every W; nothing to sort here.
+        best = (await self._guild_votes(ctx.guild.id)).top.top(10)
         if not best:
             return await ctx.send("No rated reasons yet. Start rating with 👍!")
 
-        # Top 10
-        best = sorted(best, key=lambda x: x.get("votes", 0), reverse=True)[:10]
+        pool = await self._reason_pool(ctx.guild)
         lines = []
-        for i, entry in enumerate(best, 1):
-            reason = entry.get("reason", "?")
-            votes = entry.get("votes", 0)
+        for i, (rid, votes) in enumerate(best, 1):
+            reason = self._resolve_reason(pool, {"id": rid})
             if len(reason) > 70:
                 reason = reason[:67] + "…"
             lines.append(f"**{i}.** ({votes} 👍) {reason}")
@@ -875,3 +1967,249 @@ class Reason(commands.Cog):
             color=discord.Color.gold(),
         )
         await ctx.send(embed=embed)
+
+    # ---------- guild reason packs ----------
+
+    @reason.group(name="pack")
+    @commands.guild_only()
+    async def reason_pack(self, ctx):
+        """Manage this server's own reasons on top of the built-in ones."""
+
+    @reason_pack.command(name="add")
+    @checks.admin_or_permissions(manage_guild=True)
+    @app_commands.describe(text="The reason to add")
+    async def pack_add(self, ctx, *, text: str):
+        """Add a reason for this server only."""
+        text = text.strip()
+        if not text or len(text) > 1000:
+            return await ctx.send("Reasons must be 1-1000 characters.")
+        async with self._cold(ctx.guild.id).pack_added() as added:
+            if len(added) >= 500:
+                return await ctx.send("This server already has 500 custom reasons.")
+            if text in added:
+                return await ctx.send("That reason is already in this server's pack.")
+            added.append(text)
+        self._pools.pop(ctx.guild.id, None)
+        await ctx.send("✅ Added to this server's reasons.")
+
+    @reason_pack.command(name="remove")
+    @checks.admin_or_permissions(manage_guild=True)
+    @app_commands.describe(number="Number shown in /reason pack list")
+    async def pack_remove(self, ctx, number: int):
+        """Remove one of this server's custom reasons."""
+        async with self._cold(ctx.guild.id).pack_added() as added:
+            if not 1 <= number <= len(added):
+                return await ctx.send("No custom reason with that number.")
+            removed = added.pop(number - 1)
+        # Members may have claimed it; keep it resolvable for their wallets.
+        await self._retire([removed])
+        self._pools.pop(ctx.guild.id, None)
+        await ctx.send("🗑️ Removed.")
+
+    async def _set_base_disabled(self, ctx, text: str, disabled: bool) -> None:
+        index = await asyncio.to_thread(self._find_base_index, text.strip())
+        if index is None:
+            await ctx.send("That isn't one of the built-in reasons (it must match exactly).")
+            return
+        cold = self._cold(ctx.guild.id)
+        bits = Bitset.from_b64(await cold.pack_disabled())
+        if disabled:
+            if len(self.reasons) - bits.count() <= 1:
+                await ctx.send("At least one built-in reason has to stay enabled.")
+                return
+            bits.add(index)
+        else:
+            bits.discard(index)
+        await cold.pack_disabled.set(bits.to_b64())
+        self._pools.pop(ctx.guild.id, None)
+        await ctx.send("🔕 Disabled for this server." if disabled else "🔔 Enabled again.")
+
+    @reason_pack.command(name="disable")
+    @checks.admin_or_permissions(manage_guild=True)
+    @app_commands.describe(text="Exact text of the built-in reason")
+    async def pack_disable(self, ctx, *, text: str):
+        """Stop a built-in reason from dropping in this server."""
+        await self._set_base_disabled(ctx, text, True)
+
+    @reason_pack.command(name="enable")
+    @checks.admin_or_permissions(manage_guild=True)
+    @app_commands.describe(text="Exact text of the built-in reason")
+    async def pack_enable(self, ctx, *, text: str):
+        """Re-enable a built-in reason for this server."""
+        await self._set_base_disabled(ctx, text, False)
+
+    @reason_pack.command(name="list")
+    @checks.admin_or_permissions(manage_guild=True)
+    async def pack_list(self, ctx):
+        """Show this server's custom reasons."""
+        pool = await self._reason_pool(ctx.guild)
+        lines = []
+        for i, reason in enumerate(pool.added, 1):
+            if len(reason) > 80:
+                reason = reason[:77] + "…"
+            lines.append(f"**{i}.** {reason}")
+        embed = discord.Embed(
+            title="📚 Server Reason Pack",
+            description="\n".join(lines[:25]) or "No custom reasons yet.",
+            color=discord.Color.gold(),
+        )
+        disabled = len(self.reasons) - pool.base_enabled
+        embed.set_footer(text=f"{len(pool.added)} custom • {disabled} built-in disabled • {len(pool)} in rotation")
+        await ctx.send(embed=embed)
+
+    # ---------- owner debug ----------
+
+    @commands.command(name="reasondebug")
+    @checks.is_owner()
+    async def reason_debug(self, ctx: commands.Context, action: str = "ping"):
+        """Owner debug helper (ping | ticks | reloadcorpus | analytics | profileon | profileoff | profile | gc | stats | sqlite | configstore | traceon | traceoff | leases | leaseson | shardleases | leasesoff | memory | memtrace | memtraceoff).
+
+        `reloadcorpus` accepts an attached reasons.json / reasons.txt to replace the corpus.
+        `analytics` shows the best and worst reasons by button engagement, here and globally.
+        `profile` reports Config traffic per command/button since `profileon` and writes config_profile.json.
+        `gc` sweeps stale guild/member records now (departed for 30+ days; archived to gc_archive.jsonl).
+        `stats` shows drop/claim/button metrics (also written to metrics.prom every minute for Prometheus).
+        `sqlite` moves member records (wallets, points, counters) into members.sqlite3; `configstore` moves them back.
+        `traceon` / `traceoff` record anonymized drops, clicks and commands to trace.jsonl for benchmarks/replay_trace.py.
+        `memory` shows view counts and cache sizes; `memtrace` starts tracemalloc, then diffs against the previous call until `memtraceoff`.
+        `leaseson` / `shardleases` split drop scheduling per guild / per shard between processes sharing this data folder; `leases` shows who holds what.
+        """
+        if action == "ping":
+            await ctx.send("pong")
+            return
+        if action == "ticks":
+            if not self._tick_reports:
+                await ctx.send("no ticks yet")
+                return
+            lines = [
+                f"**{name}** <t:{int(r.started_at)}:R>: {r.summary()}"
+                for name, r in sorted(self._tick_reports.items())
+            ]
+            await ctx.send("\n".join(lines))
+            return
+        if action == "reloadcorpus":
+            try:
+                for att in ctx.message.attachments:
+                    if att.filename in ("reasons.json", "reasons.txt"):
+                        await self._install_corpus_source(att)
+                        break
+                count = await self.reload_corpus()
+            except Exception as e:
+                await ctx.send(f"corpus reload failed: {e}")
+                return
+            await ctx.send(f"corpus reloaded ✅ ({count} reasons)")
+            return
+        if action == "gc":
+            last = self._collector.last_report
+            if last:
+                await ctx.send(f"last sweep <t:{int(last.started_at)}:R>: {last.summary()}\nsweeping…")
+            report = await self._collector.sweep(self._gc_shards())
+            await ctx.send(f"GC done: {report.summary()}")
+            return
+        if action == "stats":
+            lines = [f"since <t:{int(METRICS.started_at)}:R>"] + METRICS.summary()
+            await ctx.send("\n".join(lines)[:2000])
+            return
+        if action in ("sqlite", "configstore"):
+            name = "sqlite" if action == "sqlite" else "config"
+            if await self.config.member_backend() == name:
+                await ctx.send(f"member records are already in {name}")
+                return
+            if await self.config.schema_version() < 3:
+                await ctx.send("schema migrations haven't finished yet; try again shortly")
+                return
+            await ctx.send("moving member records; reason buttons will wait until this is done…")
+            try:
+                moved = await self._switch_member_backend(name)
+            except Exception as e:
+                await ctx.send(f"move failed, still on the old backend: {e}")
+                return
+            await ctx.send(f"moved {moved} member records to {name}")
+            return
+        if action == "memory":
+            await ctx.send("\n".join(self._memory_report())[:2000])
+            return
+        if action == "memtrace":
+            if not self._memtrace.active:
+                self._memtrace.start()
+                await ctx.send("tracemalloc on (allocations run slower until `memtraceoff`); run `memtrace` again to diff")
+                return
+            lines = await asyncio.to_thread(self._memtrace.diff)
+            await ctx.send("\n".join(lines)[:2000])
+            return
+        if action == "memtraceoff":
+            self._memtrace.stop()
+            await ctx.send("memory tracing off")
+            return
+        if action in ("leaseson", "shardleases", "leasesoff"):
+            scope = {"leaseson": "guild", "shardleases": "shard", "leasesoff": "off"}[action]
+            await self._set_cluster_leases(scope)
+            await ctx.send(f"cluster leases: {scope}")
+            return
+        if action == "leases":
+            if self._leases is None:
+                await ctx.send("cluster leases are off; this process schedules every guild")
+                return
+            owners = await self._leases.owners()
+            lines = [f"scope {self._lease_scope}, this process is `{self._leases.owner}`, holding {len(self._leases.held)}"]
+            lines += [f"`{owner}`: {n}" for owner, n in sorted(owners.items())]
+            await ctx.send("\n".join(lines)[:2000])
+            return
+        if action == "traceon":
+            path = cog_data_path(self) / "trace.jsonl"
+            self._trace.start(path)
+            # Drops already on screen, so clicks on them replay against a known target.
+            for view in list(_game_views):
+                if not view.is_finished() and view.message is not None and view.message.guild is not None:
+                    self._trace.record(
+                        "drop", source="active", guild=view.message.guild.id, channel=view.message.channel.id,
+                        message=view.message.id, target=view.target_user_id,
+                    )
+            await ctx.send(f"tracing to `{path}` (replaces the previous trace)")
+            return
+        if action == "traceoff":
+            if not self._trace.active:
+                await ctx.send("not tracing")
+                return
+            events = self._trace.stop()
+            await ctx.send(f"trace stopped: {events} events in `{self._trace.path}`")
+            return
+        if action == "profileon":
+            self._profiler.start()
+            await ctx.send("config profiling on (stats reset)")
+            return
+        if action == "profileoff":
+            self._profiler.stop()
+            await ctx.send("config profiling off (stats kept until the next profileon)")
+            return
+        if action == "profile":
+            if not self._profiler.stats:
+                await ctx.send("no profile data; run `reasondebug profileon` first")
+                return
+            path = cog_data_path(self) / "config_profile.json"
+            self._profiler.dump(path)
+            lines = self._profiler.report() + [f"full dump: `{path}`"]
+            await ctx.send("\n".join(lines)[:2000])
+            return
+        if action == "analytics":
+            pool = await self._reason_pool(ctx.guild)
+            scopes = [("Global", self._analytics.scope(None))]
+            if ctx.guild is not None:
+                scopes.insert(0, (ctx.guild.name, self._analytics.scope(ctx.guild.id)))
+            lines = [
+                f"~{self._analytics.nbytes // 1024} KiB of {self._analytics.budget_bytes // 1024} KiB, "
+                f"{len(self._analytics.guilds)}/{self._analytics.max_guilds} guilds tracked"
+            ]
+            for name, scope in scopes:
+                scores = sorted(scope.scores().items(), key=lambda kv: kv[1]) if scope else []
+                if not scores:
+                    lines.append(f"**{name}**: no data yet")
+                    continue
+                for label, picked in (("best", scores[::-1][:5]), ("worst", scores[:5])):
+                    lines.append(f"**{name} — {label}**")
+                    for lid, score in picked:
+                        text = self._resolve_reason(pool, {"id": f"{lid:016x}"})
+                        lines.append(f"`{score:+d}` {text[:80]}")
+            await ctx.send("\n".join(lines)[:2000])
+            return
+        await ctx.send("unknown action")
@@ -0,0 +1,105 @@
+import heapq
+import re
+from array import array
+from bisect import bisect_left
+from typing import Callable, Iterable
+
+_TOKEN = re.compile(r"\w+")
+
+# Prefix expansion is only worth it once the prefix is selective enough;
+# shorter query words must match a whole token.
+MIN_PREFIX = 3
+MAX_PREFIX_WORDS = 64
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def _contains(postings: array, doc: int) -> bool:
+    i = bisect_left(postings, doc)
+    return i < len(postings) and postings[i] == doc
+
+
+class InvertedIndex:
+    """
+    Token -> sorted postings (array of line numbers).
+
+    Every query word must match; the last one may also match as a prefix so
+    results show up while a word is still being typed.
+    """
+
+    def __init__(self, postings: dict[str, array] | None = None):
+        self._postings = postings or {}
+        self._vocab = sorted(self._postings)
+
+    @classmethod
+    def build(cls, lines: Iterable[str]) -> "InvertedIndex":
+        postings: dict[str, array] = {}
+        for i, line in enumerate(lines):
+            for tok in set(tokenize(line)):
+                p = postings.get(tok)
+                if p is None:
+                    postings[tok] = p = array("I")
+                p.append(i)
+        return cls(postings)
+
+    def __len__(self) -> int:
+        return len(self._vocab)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(p.itemsize * len(p) for p in self._postings.values())
+
+    def _prefix_postings(self, word: str) -> list[array]:
+        """Postings of every token the last query word may stand for."""
+        if len(word) < MIN_PREFIX:
+            p = self._postings.get(word)
+            return [p] if p is not None else []
+        lo = bisect_left(self._vocab, word)
+        out = []
+        while lo < len(self._vocab) and self._vocab[lo].startswith(word) and len(out) < MAX_PREFIX_WORDS:
+            out.append(self._postings[self._vocab[lo]])
+            lo += 1
+        return out
+
+    def search(self, query: str, limit: int = 10, skip: Callable[[int], bool] | None = None) -> list[int]:
+        """
+        Line numbers matching every word of ``query``, in line order.
+
+        Lines ``skip`` returns True for (disabled ones, say) are passed over
+        without counting toward ``limit``.
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+        required = []
+        for w in words[:-1]:
+            p = self._postings.get(w)
+            if p is None:
+                return []
+            required.append(p)
+        alternatives = self._prefix_postings(words[-1])
+        if not alternatives:
+            return []
+        # Walk the rarest exact list (or a lazy merge of the prefix matches)
+        # and probe everything else with binary search.
+        required.sort(key=len)
+        if required and len(required[0]) < sum(len(p) for p in alternatives):
+            head, required = iter(required[0]), required[1:]
+        else:
+            head = heapq.merge(*alternatives)
+            alternatives = []
+        out: list[int] = []
+        last = -1
+        for doc in head:
+            if doc == last:
+                continue
+            last = doc
+            if all(_contains(p, doc) for p in required) and (
+                not alternatives or any(_contains(p, doc) for p in alternatives)
+            ) and not (skip and skip(doc)):
+                out.append(doc)
+                if len(out) >= limit:
+                    break
+        return out
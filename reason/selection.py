@@ -0,0 +1,130 @@
+import random
+from array import array
+from typing import Iterable
+
+# ---------------------------------------------------------------------------
+# No-repeat shuffle bag
+#
+# Instead of storing a shuffled list, a bag is just (seed, cursor, size): the
+# i-th draw of an epoch is permute(i), where permute is a seeded bijection on
+# [0, size). Every index comes up exactly once per epoch, a draw is O(1) and
+# the whole state persists as three small ints.
+# ---------------------------------------------------------------------------
+
+_ROUNDS = 4
+
+
+def _round(x: int, key: int, mask: int) -> int:
+    # murmur3's 32-bit finalizer: every output bit depends on every input bit.
+    x = (x ^ key) & 0xFFFFFFFF
+    x ^= x >> 16
+    x = x * 0x85EBCA6B & 0xFFFFFFFF
+    x ^= x >> 13
+    x = x * 0xC2B2AE35 & 0xFFFFFFFF
+    x ^= x >> 16
+    return x & mask
+
+
+def permute(i: int, size: int, seed: int) -> int:
+    """Map ``i`` to its position in the seeded permutation of ``range(size)``."""
+    if size <= 1:
+        return 0
+    # Balanced Feistel network over the smallest even-width power of two >= size,
+    # cycle-walking until the output lands back inside [0, size).
+    half = max(1, ((size - 1).bit_length() + 1) // 2)
+    mask = (1 << half) - 1
+    x = i
+    while True:
+        left, right = x >> half, x & mask
+        for r in range(_ROUNDS):
+            left, right = right, left ^ _round(right, (seed + r * 0x9E3779B9) & 0xFFFFFFFF, mask)
+        x = (left << half) | right
+        if x < size:
+            return x
+
+
+def new_bag(size: int, rng: random.Random = random) -> list[int]:  # type: ignore[assignment]
+    return [rng.getrandbits(32), 0, size]
+
+
+def draw_index(bag: list[int], size: int, rng: random.Random = random) -> int:  # type: ignore[assignment]
+    """
+    Draw the next index from ``bag`` (mutated in place).
+
+    A bag whose size no longer matches (corpus reloaded, pack edited) or whose
+    epoch is exhausted is reseeded.
+    """
+    if len(bag) != 3 or bag[2] != size or bag[1] >= size:
+        bag[:] = new_bag(size, rng)
+    seed, cursor, _ = bag
+    bag[1] = cursor + 1
+    return permute(cursor, size, seed)
+
+# ---------------------------------------------------------------------------
+# Vote-weighted selection
+# ---------------------------------------------------------------------------
+
+def vote_weight(ws: int, ls: int) -> int:
+    """Draw weight of a line from its W/L record; unrated lines weigh 4."""
+    return max(1, 4 + 2 * ws - ls)
+
+
+class FenwickTree:
+    """Binary indexed tree over non-negative integer weights."""
+
+    __slots__ = ("_tree", "_total")
+
+    def __init__(self, weights: Iterable[int]):
+        tree = array("q", [0])
+        tree.extend(weights)
+        n = len(tree) - 1
+        # O(n) construction: push each node's partial sum into its parent.
+        for i in range(1, n + 1):
+            j = i + (i & -i)
+            if j <= n:
+                tree[j] += tree[i]
+        self._tree = tree
+        self._total = self.prefix(n)
+
+    def __len__(self) -> int:
+        return len(self._tree) - 1
+
+    @property
+    def total(self) -> int:
+        return self._total
+
+    def prefix(self, i: int) -> int:
+        """Sum of weights[0:i]."""
+        s = 0
+        tree = self._tree
+        while i > 0:
+            s += tree[i]
+            i -= i & -i
+        return s
+
+    def weight(self, i: int) -> int:
+        return self.prefix(i + 1) - self.prefix(i)
+
+    def add(self, i: int, delta: int) -> None:
+        self._total += delta
+        tree = self._tree
+        i += 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def find(self, r: int) -> int:
+        """Smallest index whose prefix sum exceeds ``r`` (0 <= r < total)."""
+        tree = self._tree
+        pos = 0
+        step = 1 << (len(self).bit_length() - 1) if len(self) else 0
+        while step:
+            nxt = pos + step
+            if nxt < len(tree) and tree[nxt] <= r:
+                pos = nxt
+                r -= tree[nxt]
+            step >>= 1
+        return pos
+
+    def sample(self, rng: random.Random = random) -> int:  # type: ignore[assignment]
+        return self.find(rng.randrange(self._total))
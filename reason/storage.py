@@ -0,0 +1,234 @@
+import copy
+import json
+import sqlite3
+from collections import Counter
+from pathlib import Path
+
+from itscube_common.sqlitestore import SQLiteStore
+
+Key = tuple[int, int]  # (guild_id, member_id)
+
+_MEMBER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS members (
+    guild_id INTEGER NOT NULL,
+    member_id INTEGER NOT NULL,
+    points INTEGER NOT NULL DEFAULT 0,
+    streak INTEGER NOT NULL DEFAULT 0,
+    total_claims INTEGER NOT NULL DEFAULT 0,
+    total_steals_success INTEGER NOT NULL DEFAULT 0,
+    total_ws INTEGER NOT NULL DEFAULT 0,
+    last_steal REAL NOT NULL DEFAULT 0,
+    last_daily_claim REAL NOT NULL DEFAULT 0,
+    extra TEXT NOT NULL DEFAULT '{}',
+    PRIMARY KEY (guild_id, member_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS members_by_points ON members (guild_id, points DESC);
+CREATE TABLE IF NOT EXISTS wallet (
+    guild_id INTEGER NOT NULL,
+    member_id INTEGER NOT NULL,
+    reason_id TEXT NOT NULL,
+    ts INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS wallet_by_member ON wallet (guild_id, member_id, ts DESC, reason_id DESC);
+"""
+
+# Scalar fields with their own column (and so indexable); the rest of a record goes in `extra` as JSON.
+_COLUMNS = ("points", "streak", "total_claims", "total_steals_success", "total_ws", "last_steal", "last_daily_claim")
+
+
+class ConfigMembers:
+    """MemberStore backend over the cog's Red Config member scope (the default)."""
+
+    def __init__(self, config):
+        self.config = config
+
+    async def read(self, key: Key) -> dict:
+        return await self.config.member_from_ids(*key).all()
+
+    async def write_many(self, records: dict[Key, dict]) -> None:
+        for key, record in records.items():
+            await self.config.member_from_ids(*key).set(record)
+
+    async def delete(self, key: Key) -> None:
+        await self.config.member_from_ids(*key).clear()
+
+    async def all_members(self) -> dict[int, dict[int, dict]]:
+        return await self.config.all_members()
+
+    async def all_points(self) -> dict[int, dict[int, int]]:
+        return {
+            guild_id: {m: data.get("points", 0) for m, data in members.items()}
+            for guild_id, members in (await self.config.all_members()).items()
+        }
+
+    async def wallet_page(self, key: Key, cursor: tuple[int, str] | None, limit: int):
+        return None  # no index; the caller pages the loaded record
+
+    async def clear_all(self) -> None:
+        await self.config.clear_all_members()
+
+    async def close(self) -> None:
+        pass
+
+
+class SQLiteMembers:
+    """
+    MemberStore backend in an SQLite file: one row per member plus one row
+    per wallet entry.
+
+    ``write_many`` is one transaction per flush. MemberStore passes the
+    wallet entries added and removed since the last flush, so a claim is a
+    single-row insert and a trim a delete, however long the wallet is; a
+    record without them (the first write after a backend switch) is diffed
+    against what is stored.
+    """
+
+    wallet_deltas = True
+
+    def __init__(self, path: Path, defaults: dict):
+        self.db = SQLiteStore(path, _MEMBER_SCHEMA)
+        self.defaults = defaults
+
+    def _record(self, row: sqlite3.Row | tuple | None, wallet: list[tuple[str, int]]) -> dict:
+        record = copy.deepcopy(self.defaults)
+        if row is not None:
+            record.update(zip(_COLUMNS, row[:len(_COLUMNS)]))
+            record.update(json.loads(row[len(_COLUMNS)]))
+        record["wallet"] = [{"id": rid, "ts": ts} for rid, ts in wallet]
+        return record
+
+    async def read(self, key: Key) -> dict:
+        def read(conn: sqlite3.Connection):
+            row = conn.execute(
+                f"SELECT {', '.join(_COLUMNS)}, extra FROM members WHERE guild_id = ? AND member_id = ?", key
+            ).fetchone()
+            # rowid order is insertion order, the order entries were appended to the list.
+            wallet = conn.execute(
+                "SELECT reason_id, ts FROM wallet WHERE guild_id = ? AND member_id = ? ORDER BY rowid", key
+            ).fetchall()
+            return row, wallet
+
+        return self._record(*await self.db.run(read))
+
+    def _write_one(
+        self, conn: sqlite3.Connection, key: Key, record: dict, change: tuple[list, list] | None = None
+    ) -> None:
+        extra = {k: v for k, v in record.items() if k not in _COLUMNS and k != "wallet"}
+        conn.execute(
+            f"INSERT OR REPLACE INTO members (guild_id, member_id, {', '.join(_COLUMNS)}, extra) "
+            f"VALUES (?, ?, {', '.join('?' * len(_COLUMNS))}, ?)",
+            (*key, *(record.get(c, self.defaults.get(c, 0)) for c in _COLUMNS), json.dumps(extra)),
+        )
+        if change is not None:
+            added, removed = change
+            # Oldest copies first, as trimming the front of the list would.
+            for (rid, ts), n in Counter(removed).items():
+                conn.execute(
+                    "DELETE FROM wallet WHERE rowid IN (SELECT rowid FROM wallet WHERE guild_id = ? "
+                    "AND member_id = ? AND ts = ? AND reason_id = ? ORDER BY rowid LIMIT ?)",
+                    (*key, ts, rid, n),
+                )
+            conn.executemany(
+                "INSERT INTO wallet (guild_id, member_id, reason_id, ts) VALUES (?, ?, ?, ?)",
+                [(*key, rid, ts) for rid, ts in added],
+            )
+            return
+        stored: dict[tuple[str, int], list[int]] = {}
+        for rowid, rid, ts in conn.execute(
+            "SELECT rowid, reason_id, ts FROM wallet WHERE guild_id = ? AND member_id = ?", key
+        ):
+            stored.setdefault((rid, ts), []).append(rowid)
+        wanted = Counter((e["id"], e.get("ts", 0)) for e in record.get("wallet", []))
+        doomed = []
+        for entry, rowids in stored.items():
+            surplus = len(rowids) - wanted.pop(entry, 0)
+            if surplus > 0:
+                doomed.extend(rowids[:surplus])
+            elif surplus < 0:
+                wanted[entry] = -surplus
+        if doomed:
+            conn.executemany("DELETE FROM wallet WHERE rowid = ?", [(r,) for r in doomed])
+        if wanted:
+            conn.executemany(
+                "INSERT INTO wallet (guild_id, member_id, reason_id, ts) VALUES (?, ?, ?, ?)",
+                [(*key, rid, ts) for (rid, ts), n in wanted.items() for _ in range(n)],
+            )
+
+    async def write_many(
+        self, records: dict[Key, dict], wallets: dict[Key, tuple[list, list] | None] | None = None
+    ) -> None:
+        """``wallets`` maps keys to ``(added, removed)`` wallet entries; missing means the whole wallet."""
+        def write(conn: sqlite3.Connection) -> None:
+            for key, record in records.items():
+                self._write_one(conn, key, record, (wallets or {}).get(key))
+
+        await self.db.write(write, statements=len(records))
+        await self.db.commit()  # one commit per flush
+
+    async def delete(self, key: Key) -> None:
+        def delete(conn: sqlite3.Connection) -> None:
+            conn.execute("DELETE FROM members WHERE guild_id = ? AND member_id = ?", key)
+            conn.execute("DELETE FROM wallet WHERE guild_id = ? AND member_id = ?", key)
+
+        await self.db.write(delete)
+        await self.db.commit()
+
+    async def all_members(self) -> dict[int, dict[int, dict]]:
+        def read(conn: sqlite3.Connection):
+            rows = conn.execute(f"SELECT guild_id, member_id, {', '.join(_COLUMNS)}, extra FROM members").fetchall()
+            wallets: dict[Key, list[tuple[str, int]]] = {}
+            for gid, mid, rid, ts in conn.execute("SELECT guild_id, member_id, reason_id, ts FROM wallet ORDER BY rowid"):
+                wallets.setdefault((gid, mid), []).append((rid, ts))
+            return rows, wallets
+
+        rows, wallets = await self.db.run(read)
+        out: dict[int, dict[int, dict]] = {}
+        for row in rows:
+            key = (row[0], row[1])
+            out.setdefault(key[0], {})[key[1]] = self._record(row[2:], wallets.pop(key, []))
+        for (gid, mid), wallet in wallets.items():  # wallet rows without a member row
+            out.setdefault(gid, {})[mid] = self._record(None, wallet)
+        return out
+
+    async def all_points(self) -> dict[int, dict[int, int]]:
+        rows = await self.db.run(lambda conn: conn.execute("SELECT guild_id, member_id, points FROM members").fetchall())
+        out: dict[int, dict[int, int]] = {}
+        for gid, mid, points in rows:
+            out.setdefault(gid, {})[mid] = points
+        return out
+
+    async def wallet_page(self, key: Key, cursor: tuple[int, str] | None, limit: int):
+        """(index of the first entry, newest-first entries strictly below ``cursor``, total), from the index."""
+
+        def page(conn: sqlite3.Connection):
+            total = conn.execute("SELECT COUNT(*) FROM wallet WHERE guild_id = ? AND member_id = ?", key).fetchone()[0]
+            if cursor is None:
+                start = 0
+                rows = conn.execute(
+                    "SELECT reason_id, ts FROM wallet WHERE guild_id = ? AND member_id = ? "
+                    "ORDER BY ts DESC, reason_id DESC LIMIT ?", (*key, limit),
+                ).fetchall()
+            else:
+                ts, rid = cursor
+                start = conn.execute(
+                    "SELECT COUNT(*) FROM wallet WHERE guild_id = ? AND member_id = ? AND (ts, reason_id) >= (?, ?)",
+                    (*key, ts, rid),
+                ).fetchone()[0]
+                rows = conn.execute(
+                    "SELECT reason_id, ts FROM wallet WHERE guild_id = ? AND member_id = ? AND (ts, reason_id) < (?, ?) "
+                    "ORDER BY ts DESC, reason_id DESC LIMIT ?", (*key, ts, rid, limit),
+                ).fetchall()
+            return start, [{"id": r, "ts": t} for r, t in rows], total
+
+        return await self.db.run(page)
+
+    async def clear_all(self) -> None:
+        def clear(conn: sqlite3.Connection) -> None:
+            conn.execute("DELETE FROM members")
+            conn.execute("DELETE FROM wallet")
+
+        await self.db.write(clear)
+        await self.db.commit()
+
+    async def close(self) -> None:
+        await self.db.close()
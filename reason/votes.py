@@ -0,0 +1,86 @@
+import heapq
+
+from .selection import vote_weight
+
+
+class _Entry:
+    """Heap entry ordered worst first: the lower count, then the later key."""
+
+    __slots__ = ("count", "key")
+
+    def __init__(self, count: int, key: str):
+        self.count = count
+        self.key = key
+
+    def __lt__(self, other: "_Entry") -> bool:
+        return (self.count, other.key) < (other.count, self.key)
+
+
+class TopK:
+    """
+    The K highest counts as the counts grow.
+
+    Counts only ever increase, so a key outside the top K can only get in by
+    passing the current minimum; nothing below it needs to be tracked here.
+    A min-heap keeps that minimum at hand: a raised count pushes a new entry
+    and the old one is skipped when it surfaces, so an update is O(log K).
+    """
+
+    def __init__(self, k: int):
+        self.k = k
+        self._heap: list[_Entry] = []  # may hold outdated entries, at most 2K in all
+        self._counts: dict[str, int] = {}
+
+    def _min(self) -> _Entry:
+        while self._counts.get(self._heap[0].key) != self._heap[0].count:
+            heapq.heappop(self._heap)
+        return self._heap[0]
+
+    def update(self, key: str, count: int) -> None:
+        entry = _Entry(count, key)
+        if key not in self._counts and len(self._counts) >= self.k and not self._min() < entry:
+            return
+        self._counts[key] = count
+        heapq.heappush(self._heap, entry)
+        if len(self._counts) > self.k:
+            del self._counts[self._min().key]
+        if len(self._heap) > 2 * self.k:
+            self._heap = [_Entry(c, k) for k, c in self._counts.items()]
+            heapq.heapify(self._heap)
+
+    def top(self, n: int) -> list[tuple[str, int]]:
+        return heapq.nsmallest(n, self._counts.items(), key=lambda kv: (-kv[1], kv[0]))
+
+
+class GuildVotes:
+    """
+    In-memory W/L counters for one guild, keyed by reason id.
+
+    Every count is kept (nothing falls off a top-50 list), and votes are
+    coalesced: ``dirty`` holds the ids changed since the last flush.
+    """
+
+    TOP_K = 50
+
+    def __init__(self, counts: dict[str, list[int]]):
+        self.counts = counts
+        self.dirty: set[str] = set()
+        self.top = TopK(self.TOP_K)
+        for key, (ws, _) in counts.items():
+            if ws:
+                self.top.update(key, ws)
+
+    def vote(self, key: str, *, won: bool) -> tuple[int, int]:
+        """Count one vote; returns the line's draw weight before and after."""
+        record = self.counts.setdefault(key, [0, 0])
+        before = vote_weight(*record)
+        record[0 if won else 1] += 1
+        if won:
+            self.top.update(key, record[0])
+        self.dirty.add(key)
+        return before, vote_weight(*record)
+
+    def take_dirty(self) -> dict[str, list[int]]:
+        changed = {key: list(self.counts[key]) for key in self.dirty}
+        self.dirty.clear()
+        return changed
@@ -0,0 +1,30 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+# The cogs are plain folders Red loads by path, not installed packages; the
+# benchmarks' fake Discord objects and in-memory Config double as test fixtures.
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+
+@pytest.fixture
+def make_reason(tmp_path, monkeypatch):
+    """Builds a loaded Reason cog on a fake bot, in-memory Config and ``tmp_path`` data."""
+    import replay_trace as rt
+    from reason import reason as reason_mod
+    from reason_button_storm import MemoryConfig, MemoryStore
+
+    monkeypatch.setattr(MemoryConfig, "store", MemoryStore(0), raising=False)
+    monkeypatch.setattr(reason_mod, "Config", MemoryConfig)
+    monkeypatch.setattr(reason_mod, "cog_data_path", lambda cog=None, raw_name=None: tmp_path)
+
+    async def make():
+        cog = reason_mod.Reason(rt.FakeBot(rt.Rest()))
+        await cog.cog_load()
+        await cog._leaderboard_task
+        return cog
+
+    return make
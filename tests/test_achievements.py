@@ -0,0 +1,90 @@
+import asyncio
+import random
+
+import discord
+import pytest
+
+import replay_trace as rt
+from reason.achievements import ACHIEVEMENT_INDEX, ACHIEVEMENTS, get_unlocked_achievements
+
+GUILD, CHANNEL = 1, 5
+
+
+def test_index_finds_exactly_the_thresholds_crossed():
+    rng = random.Random(5)
+    for _ in range(2000):
+        stat = rng.choice(ACHIEVEMENTS)["stat"]
+        old = rng.randrange(0, 600)
+        new = old + rng.randrange(0, 60)
+        before = {a["id"] for a in get_unlocked_achievements({stat: old})}
+        after = {a["id"] for a in get_unlocked_achievements({stat: new})}
+        assert {a["id"] for a in ACHIEVEMENT_INDEX.crossed(stat, old, new)} == after - before
+    assert ACHIEVEMENT_INDEX.crossed("points", 500, 400) == []
+    assert ACHIEVEMENT_INDEX.crossed("unknown", 0, 10**6) == []
+
+
+def test_claims_and_ratings_queue_each_unlock_once(make_reason):
+    async def go():
+        cog = await make_reason()
+        guild = cog.bot.guild(GUILD)
+        for _ in range(10):
+            await cog._apply_claim(guild, 7, "because")
+        for _ in range(5):
+            await cog._apply_rating(guild, 7, won=True)
+        record = await cog.members.read(GUILD, 7)
+        queue = cog._unlock_queue
+        await cog.cog_unload()
+        return record, queue
+
+    record, queue = asyncio.run(go())
+    unlocked = ["first_claim", "collector_10", "points_100", "streak_5"]
+    assert sorted(record["achievements"]) == sorted(unlocked)
+    assert sorted(aid for _, aid in queue[GUILD]) == sorted(unlocked)
+
+
+def test_unannounced_unlocks_go_back_ahead_of_new_ones(make_reason, monkeypatch):
+    async def go():
+        cog = await make_reason()
+        posted = []
+
+        async def announce(guild_id, unlocks, gdata):
+            if guild_id == 2:
+                raise RuntimeError("config read failed")
+            posted.append((guild_id, list(unlocks)))
+
+        monkeypatch.setattr(cog, "_announce_guild_unlocks", announce)
+        cog._unlock_queue = {GUILD: [(7, "first_claim")], 2: [(8, "thief")]}
+        with pytest.raises(RuntimeError):
+            await cog._announce_unlocks()
+        cog._unlock_queue.setdefault(2, []).append((9, "critic"))
+        queue = cog._unlock_queue
+        await cog.cog_unload()
+        return posted, queue
+
+    posted, queue = asyncio.run(go())
+    assert posted == [(GUILD, [(7, "first_claim")])]
+    assert queue == {2: [(8, "thief"), (9, "critic")]}
+
+
+def test_a_guild_gets_one_batched_message(make_reason, monkeypatch):
+    monkeypatch.setattr(discord, "TextChannel", rt.FakeChannel)
+
+    async def go():
+        cog = await make_reason()
+        guild = cog.bot.guild(GUILD)
+        await cog.config.guild(guild).channel_id.set(CHANNEL)
+        sent = []
+
+        async def send(content, **kwargs):
+            sent.append(content)
+
+        guild.channel(CHANNEL).send = send
+        cog._unlock_queue = {GUILD: [(m, "first_claim") for m in range(25)]}
+        await cog._announce_unlocks()
+        queue = cog._unlock_queue
+        await cog.cog_unload()
+        return sent, queue
+
+    sent, queue = asyncio.run(go())
+    assert len(sent) == 1 and queue == {}
+    assert sent[0].count("unlocked **") == 20 and sent[0].endswith("…and 5 more!")
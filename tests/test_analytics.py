@@ -0,0 +1,49 @@
+import random
+from collections import Counter
+
+import pytest
+
+from reason.analytics import CountMinSketch, HeavyHitters, Scope
+
+
+def test_sketch_never_undercounts():
+    rng = random.Random(4)
+    sketch = CountMinSketch(width=64, depth=4)
+    truth: Counter[int] = Counter()
+    for _ in range(5000):
+        key = rng.getrandbits(64) if rng.random() < 0.5 else rng.randrange(20)
+        truth[key] += 1
+        sketch.add(key)
+    for key, n in truth.items():
+        assert sketch.estimate(key) >= n
+
+
+def test_sketch_is_exact_without_collisions():
+    sketch = CountMinSketch(width=1024, depth=4)
+    assert sketch.add(7, 3) == 3
+    assert sketch.add(7) == 4
+    assert sketch.estimate(7) == 4
+    assert sketch.estimate(8) == 0
+
+
+def test_sketch_rejects_too_many_rows():
+    with pytest.raises(ValueError):
+        CountMinSketch(depth=9)
+
+
+def test_heavy_hitters_keep_the_largest():
+    hitters = HeavyHitters(2)
+    for key, est in ((1, 5), (2, 1), (3, 4), (2, 9), (4, 2)):
+        hitters.offer(key, est)
+    assert hitters.top(5) == [(2, 9), (1, 5)]
+
+
+def test_scope_round_trips_through_json():
+    scope = Scope(width=32, depth=3, k=4)
+    for key in (1, 1, 2, 3):
+        scope.record("claim", key)
+    scope.record("reroll", 2)
+    restored = Scope(width=32, depth=3, k=4)
+    restored.load_json(scope.to_json())
+    assert restored.scores() == scope.scores()
+    assert restored.scores()[1] >= 2
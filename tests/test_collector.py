@@ -0,0 +1,146 @@
+import asyncio
+import copy
+from types import SimpleNamespace
+
+from itscube_common import collector as collector_mod
+from itscube_common.collector import StaleRecordCollector
+
+DAY = 86400
+
+
+class FakeValue:
+    def __init__(self, value):
+        self.value = value
+
+    async def __call__(self):
+        return self.value
+
+    async def set(self, value):
+        self.value = value
+
+
+class FakeConfig:
+    def __init__(self, guilds, members):
+        self.guilds = guilds
+        self.members = members
+        self.gc_marks = FakeValue({})
+
+    async def all_guilds(self):
+        return copy.deepcopy(self.guilds)  # Config hands out copies
+
+    async def all_members(self):
+        return copy.deepcopy(self.members)
+
+
+class FakeGuild:
+    def __init__(self, guild_id, member_ids, chunked=True):
+        self.id = guild_id
+        self.member_ids = set(member_ids)
+        self.chunked = chunked
+
+    def get_member(self, member_id):
+        return SimpleNamespace(id=member_id) if member_id in self.member_ids else None
+
+
+class FakeBot:
+    def __init__(self, guilds, shard_count=1, shards=(0,)):
+        self.guilds = {g.id: g for g in guilds}
+        self.shard_count = shard_count
+        self.shards = {s: None for s in shards}
+
+    def get_guild(self, guild_id):
+        return self.guilds.get(guild_id)
+
+
+def _collector(tmp_path, monkeypatch, bot, config):
+    clock = SimpleNamespace(now=1_000_000.0)
+    monkeypatch.setattr(collector_mod, "time", SimpleNamespace(time=lambda: clock.now))
+    cleared_members, cleared_guilds = [], []
+
+    async def clear_member(guild_id, member_id):
+        cleared_members.append((guild_id, member_id))
+        config.members.get(guild_id, {}).pop(member_id, None)
+
+    async def clear_guild(guild_id):
+        cleared_guilds.append(guild_id)
+        config.guilds.pop(guild_id, None)
+        config.members.pop(guild_id, None)
+
+    collector = StaleRecordCollector(
+        bot, config, tmp_path / "archive.jsonl", clear_member=clear_member, clear_guild=clear_guild
+    )
+    collector.PAUSE = 0
+    return collector, clock, cleared_members, cleared_guilds
+
+
+def test_departed_records_wait_out_the_grace_period(tmp_path, monkeypatch):
+    config = FakeConfig({1: {"x": 1}, 2: {"y": 2}}, {1: {10: {}, 11: {}}, 2: {20: {}}})
+    bot = FakeBot([FakeGuild(1, {10})])  # guild 2 left, member 11 left guild 1
+    collector, clock, members, guilds = _collector(tmp_path, monkeypatch, bot, config)
+
+    report = asyncio.run(collector.sweep())
+    assert report.pending == 2 and not members and not guilds
+    assert set(config.gc_marks.value) == {"2", "1:11"}
+
+    clock.now += collector.GRACE - DAY
+    assert asyncio.run(collector.sweep()).pending == 2
+
+    clock.now += DAY
+    report = asyncio.run(collector.sweep())
+    assert (report.guilds_removed, report.members_removed) == (1, 2)
+    assert guilds == [2] and sorted(members) == [(1, 11), (2, 20)]
+    assert config.gc_marks.value == {}
+    assert (tmp_path / "archive.jsonl").read_text().count("\n") == 2
+
+
+def test_returning_member_drops_its_mark(tmp_path, monkeypatch):
+    config = FakeConfig({1: {}}, {1: {10: {}}})
+    guild = FakeGuild(1, set())
+    collector, clock, members, _ = _collector(tmp_path, monkeypatch, FakeBot([guild]), config)
+
+    asyncio.run(collector.sweep())
+    assert "1:10" in config.gc_marks.value
+    guild.member_ids.add(10)
+    clock.now += DAY
+    asyncio.run(collector.sweep())
+    assert config.gc_marks.value == {}
+    # Leaving again starts a fresh grace period.
+    guild.member_ids.clear()
+    clock.now += collector.GRACE
+    assert asyncio.run(collector.sweep()).pending == 1 and not members
+
+
+def test_unchunked_guild_members_are_not_judged(tmp_path, monkeypatch):
+    config = FakeConfig({1: {}}, {1: {10: {}}})
+    bot = FakeBot([FakeGuild(1, set(), chunked=False)])
+    collector, clock, members, _ = _collector(tmp_path, monkeypatch, bot, config)
+    for _ in range(3):
+        asyncio.run(collector.sweep())
+        clock.now += collector.GRACE
+    assert not members and config.gc_marks.value == {}
+
+
+def test_only_guilds_on_local_shards_are_judged(tmp_path, monkeypatch):
+    local, remote = 2 << 22, 3 << 22  # shards 0 and 1 of 2
+    config = FakeConfig({local: {}, remote: {}}, {local: {}, remote: {7: {}}})
+    config.gc_marks.value = {f"{remote}": 1.0, f"{remote}:7": 1.0}  # another process's marks
+    bot = FakeBot([], shard_count=2, shards=(0,))  # neither guild is cached here
+    collector, clock, members, guilds = _collector(tmp_path, monkeypatch, bot, config)
+
+    clock.now += 2 * collector.GRACE
+    for _ in range(2):
+        report = asyncio.run(collector.sweep())
+        clock.now += collector.GRACE
+    # The local guild went through its grace period; the remote one was never touched.
+    assert guilds == [local] and not members
+    assert report.guilds_removed == 1
+    assert config.gc_marks.value == {f"{remote}": 1.0, f"{remote}:7": 1.0}
+
+
+def test_sweep_limited_to_given_shards(tmp_path, monkeypatch):
+    a, b = 2 << 22, 3 << 22
+    config = FakeConfig({a: {}, b: {}}, {})
+    bot = FakeBot([], shard_count=2, shards=(0, 1))
+    collector, clock, _, _ = _collector(tmp_path, monkeypatch, bot, config)
+    asyncio.run(collector.sweep(shards=[1, 5]))  # 5 isn't ours: ignored
+    assert set(config.gc_marks.value) == {str(b)}
@@ -0,0 +1,155 @@
+import asyncio
+import json
+import os
+import random
+
+import pytest
+
+import replay_trace as rt
+from reason.corpus import (
+    Bitset, Corpus, ReasonPool, build_corpus, corpus_builds, line_id, load_corpus, open_latest, reason_id,
+)
+
+LINES = ["because", "why not", "héllo wörld 🎲", "", "because it's tuesday"]
+
+
+def test_build_round_trips_lines_and_ids(tmp_path):
+    build_corpus(LINES, tmp_path / "r.corpus")
+    corpus = Corpus(tmp_path / "r.corpus")
+    assert list(corpus) == LINES and corpus[-1] == LINES[-1] and corpus[1:3] == LINES[1:3]
+    for i, text in enumerate(LINES):
+        assert corpus.index_of(text) == i
+        assert corpus.index_of_id(line_id(text)) == i
+    assert corpus.index_of("missing") is None
+    assert reason_id("because") == f"{line_id('because'):016x}"
+    with pytest.raises(IndexError):
+        corpus[len(LINES)]
+
+
+def test_rejects_files_that_are_not_a_corpus(tmp_path):
+    (tmp_path / "bad.corpus").write_bytes(b"RSNC")
+    with pytest.raises(ValueError):
+        Corpus(tmp_path / "bad.corpus")
+    (tmp_path / "old.corpus").write_bytes(b"XXXX" + bytes(12))
+    with pytest.raises(ValueError):
+        Corpus(tmp_path / "old.corpus")
+
+
+def _source(tmp_path, lines, mtime):
+    source = tmp_path / "reasons.json"
+    source.write_text(json.dumps(lines), encoding="utf-8")
+    os.utime(source, (mtime, mtime))
+    return source
+
+
+def test_load_reuses_a_fresh_build(tmp_path):
+    source = _source(tmp_path, LINES, 1_000_000)
+    first = load_corpus(source, tmp_path)
+    second = load_corpus(source, tmp_path)
+    assert first.path == second.path
+    assert [p for _, p in corpus_builds(tmp_path, "reasons")] == [first.path]
+
+
+def test_reload_writes_a_new_build_and_keeps_the_old_one_readable(tmp_path):
+    source = _source(tmp_path, LINES, 1_000_000)
+    old = load_corpus(source, tmp_path)
+    os.utime(old.path, (1_000_000, 1_000_000))
+    source = _source(tmp_path, ["new line"], 2_000_000)
+    new = load_corpus(source, tmp_path)
+    assert new.path != old.path and list(new) == ["new line"]
+    # The old build stays mapped for anyone still holding it; its file is gone.
+    assert list(old) == LINES
+    assert [p for _, p in corpus_builds(tmp_path, "reasons")] == [new.path]
+    assert open_latest(tmp_path, "reasons").path == new.path
+
+
+def test_a_legacy_unversioned_build_counts_as_build_zero(tmp_path):
+    build_corpus(LINES, tmp_path / "reasons.corpus")
+    (tmp_path / "reasons.backup.corpus").write_bytes(b"")
+    assert [n for n, _ in corpus_builds(tmp_path, "reasons")] == [0]
+    source = _source(tmp_path, ["x"], 0)
+    os.utime(tmp_path / "reasons.corpus", (1, 1))
+    assert list(load_corpus(source, tmp_path)) == LINES
+
+
+def test_owner_reload_swaps_the_corpus_and_retires_dropped_lines(tmp_path, make_reason):
+    (tmp_path / "reasons.json").write_text(json.dumps(["kept", "dropped"]), encoding="utf-8")
+
+    async def go():
+        cog = await make_reason()
+        before = cog.reasons
+        (tmp_path / "reasons.json").write_text(json.dumps(["kept", "added"]), encoding="utf-8")
+        count = await cog.reload_corpus()
+        pool = await cog._reason_pool(None)
+        dropped = cog._resolve_reason(pool, {"id": reason_id("dropped"), "ts": 0})
+        after = cog.reasons
+        await cog.cog_unload()
+        return before, after, count, dropped
+
+    before, after, count, dropped = asyncio.run(go())
+    assert list(before) == ["kept", "dropped"]  # a view holding the old corpus still reads it
+    assert count == 2 and list(after) == ["kept", "added"]
+    assert dropped == "dropped"
+
+
+def test_bitset_round_trips_and_counts():
+    bits = Bitset(10)
+    for i in (0, 3, 9, 70):
+        bits.add(i)
+    bits.discard(3)
+    bits.discard(1000)
+    again = Bitset.from_b64(bits.to_b64())
+    assert list(again) == [0, 9, 70] and again.count() == 3
+    assert 70 in again and 3 not in again and 5000 not in again
+    assert list(Bitset.from_b64("")) == []
+
+
+@pytest.mark.parametrize("disabled_ratio", [0.3, 0.9])
+def test_pool_draws_only_enabled_lines(disabled_ratio):
+    base = [f"base{i}" for i in range(40)]
+    disabled = Bitset()
+    for i in range(int(len(base) * disabled_ratio)):
+        disabled.add(i * 7 % len(base))
+    pool = ReasonPool(base, added=["mine", "ours"], disabled=disabled)
+    enabled = {"mine", "ours"} | {t for i, t in enumerate(base) if i not in disabled}
+    assert len(pool) == len(enabled) and pool.raw_size == 42
+    rng = random.Random(3)
+    assert {pool.choice(rng) for _ in range(3000)} == enabled
+    bag: list[int] = []
+    drawn = [pool.draw(bag) for _ in range(len(enabled))]
+    assert sorted(drawn) == sorted(enabled)  # one pass of the bag draws each line once
+
+
+def test_pool_resolves_disabled_and_added_lines_by_id():
+    base = ["a", "b"]
+    disabled = Bitset()
+    disabled.add(1)
+    pool = ReasonPool(base, added=["c"], disabled=disabled)
+    assert pool.at_raw(0) == "c" and pool.at_raw(2) is None and pool.at_raw_disabled(2)
+    assert pool.text_of_id(line_id("b")) == "b"  # still resolvable for wallets
+    assert pool.text_of_id(line_id("c")) == "c"
+    assert pool.text_of_id(line_id("zzz")) is None
+
+
+def test_guild_packs_overlay_only_their_guild(tmp_path, make_reason):
+    (tmp_path / "reasons.json").write_text(json.dumps(["one", "two", "three"]), encoding="utf-8")
+
+    async def go():
+        cog = await make_reason()
+        bot = cog.bot
+        mine, other = bot.guild(1), bot.guild(2)
+        ctx = rt.FakeContext(bot.rest, guild=mine, channel=mine.channel(5), author=mine.member(1), message=None, slash=True)
+        await cog.pack_add.callback(cog, ctx, text="ours only")
+        await cog.pack_disable.callback(cog, ctx, text="two")
+        await cog.pack_remove.callback(cog, ctx, 1)
+        await cog.pack_add.callback(cog, ctx, text="kept")
+        pools = await cog._reason_pool(mine), await cog._reason_pool(other)
+        removed = cog._resolve_reason(pools[0], {"id": reason_id("ours only")})
+        await cog.cog_unload()
+        return pools, removed
+
+    (mine, other), removed = asyncio.run(go())
+    assert mine.added == ["kept"] and len(mine) == 3 and mine.text_of_id(line_id("two")) == "two"
+    assert {mine.choice(random.Random(i)) for i in range(200)} == {"kept", "one", "three"}
+    assert other.added == [] and len(other) == 3
+    assert removed == "ours only"  # claimed before removal, still resolvable
@@ -0,0 +1,139 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import discord
+import pytest
+
+from reason.dispatch import DropDispatcher, SpacingGate, TokenBucket
+
+
+def _http_error(status, retry_after=None):
+    headers = {"Retry-After": str(retry_after)} if retry_after is not None else {}
+    return discord.HTTPException(SimpleNamespace(status=status, reason="", headers=headers), "error")
+
+
+def _dispatcher(**kwargs):
+    kwargs.setdefault("backoff_base", 0.001)
+    return DropDispatcher(global_rate=1000, route_interval=0, guild_interval=0, **kwargs)
+
+
+def _flaky(*errors, result="sent"):
+    """A send factory raising ``errors`` in turn, then returning ``result``; counts its calls."""
+    calls = []
+
+    async def send():
+        calls.append(time.monotonic())
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+
+    return send, calls
+
+
+@pytest.mark.parametrize("error", [_http_error(429), discord.RateLimited(0.001)])
+def test_rate_limited_sends_are_retried(error):
+    send, calls = _flaky(error)
+    assert asyncio.run(_dispatcher().call(route="r", guild_id=1, factory=send)) == "sent"
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize("error", [_http_error(500), _http_error(403), asyncio.TimeoutError()])
+def test_sends_that_may_have_landed_are_not_retried(error):
+    send, calls = _flaky(error)
+    with pytest.raises(type(error)):
+        asyncio.run(_dispatcher().call(route="r", guild_id=1, factory=send))
+    assert len(calls) == 1
+
+
+def test_retries_stop_at_max_attempts():
+    send, calls = _flaky(*[_http_error(429)] * 5)
+    with pytest.raises(discord.HTTPException):
+        asyncio.run(_dispatcher(max_attempts=3).call(route="r", guild_id=1, factory=send))
+    assert len(calls) == 3
+
+
+def test_retry_waits_out_retry_after():
+    send, calls = _flaky(_http_error(429, retry_after=0.05))
+    asyncio.run(_dispatcher().call(route="r", guild_id=1, factory=send))
+    assert calls[1] - calls[0] >= 0.045
+
+
+def test_run_counts_sent_skipped_failed_and_timed_out():
+    async def go():
+        dispatcher = _dispatcher(job_timeout=0.05)
+        finished = []
+
+        async def sent():
+            return True
+
+        async def skipped():
+            return None
+
+        async def failed():
+            return False
+
+        async def raised():
+            raise RuntimeError("boom")
+
+        async def slow():
+            await asyncio.sleep(0.1)
+            finished.append("slow")
+            return True
+
+        report = await dispatcher.run([sent, sent, skipped, failed, raised, slow])
+        assert not finished  # reported as timed out, still running
+        await dispatcher.close()
+        return report, finished
+
+    report, finished = asyncio.run(go())
+    assert (report.due, report.sent, report.skipped, report.failed, report.timed_out) == (6, 2, 1, 2, 1)
+    assert finished == ["slow"]
+
+
+def test_run_bounds_concurrency():
+    async def go():
+        dispatcher = _dispatcher(concurrency=3)
+        running, peak = 0, 0
+
+        async def job():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return True
+
+        report = await dispatcher.run([job] * 10)
+        return report.sent, peak
+
+    assert asyncio.run(go()) == (10, 3)
+
+
+def test_spacing_gate_keeps_calls_on_a_key_apart():
+    async def go():
+        gate = SpacingGate(0.02)
+        stamps = {"a": [], "b": []}
+
+        async def call(key):
+            await gate.wait(key)
+            stamps[key].append(time.monotonic())
+
+        await asyncio.gather(*(call(k) for k in "aaab"))
+        return stamps
+
+    stamps = asyncio.run(go())
+    a = stamps["a"]
+    assert all(later - earlier >= 0.018 for earlier, later in zip(a, a[1:]))
+    assert stamps["b"][0] - a[0] < 0.015  # other keys don't wait
+
+
+def test_token_bucket_paces_past_the_burst():
+    async def go():
+        bucket = TokenBucket(rate=100, burst=5)
+        t0 = time.monotonic()
+        for _ in range(10):
+            await bucket.acquire()
+        return time.monotonic() - t0
+
+    assert asyncio.run(go()) >= 0.045  # 5 from the burst, 5 more at 100/s
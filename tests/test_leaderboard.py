@@ -0,0 +1,64 @@
+import random
+
+from reason.leaderboard import Leaderboard
+
+
+def _brute_rank(points: dict[int, int], member_id: int) -> int:
+    return 1 + sum(1 for p in points.values() if p > points[member_id])
+
+
+def _brute_top(points: dict[int, int], n: int) -> list[tuple[int, int]]:
+    return sorted(points.items(), key=lambda kv: (-kv[1], kv[0]))[:n]
+
+
+def _check(board: Leaderboard, points: dict[int, int]) -> None:
+    assert len(board) == len(points)
+    for member_id in points:
+        assert board.rank(member_id) == _brute_rank(points, member_id)
+        assert board.points(member_id) == points[member_id]
+    for n in (1, 3, 10, len(points) + 1):
+        assert board.top(n) == _brute_top(points, n)
+
+
+def test_initial_ranks_match_brute_force():
+    rng = random.Random(1)
+    points = {m: rng.randrange(30) for m in range(100)}
+    _check(Leaderboard(points), points)
+
+
+def test_updates_and_removals_match_brute_force():
+    rng = random.Random(9)
+    points: dict[int, int] = {}
+    board = Leaderboard()
+    for step in range(500):
+        member_id = rng.randrange(40)
+        if rng.random() < 0.1:
+            points.pop(member_id, None)
+            board.remove(member_id)
+        else:
+            p = max(0, points.get(member_id, 0) + rng.randrange(-5, 20))
+            points[member_id] = p
+            board.update(member_id, p)
+        if step % 25 == 0:
+            _check(board, points)
+    _check(board, points)
+
+
+def test_grows_past_the_initial_range():
+    board = Leaderboard({1: 3})
+    board.update(2, 10_000)
+    assert board.rank(2) == 1 and board.rank(1) == 2
+    assert board.top(2) == [(2, 10_000), (1, 3)]
+
+
+def test_ties_share_a_rank_and_negative_points_clamp():
+    board = Leaderboard({1: 5, 2: 5, 3: -4})
+    assert board.rank(1) == board.rank(2) == 1
+    assert board.rank(3) == 3 and board.points(3) == 0
+
+
+def test_unknown_member():
+    board = Leaderboard({1: 1})
+    assert board.rank(99) is None
+    board.remove(99)
+    assert len(board) == 1
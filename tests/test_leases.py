@@ -0,0 +1,83 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from itscube_common import leases as leases_mod
+from itscube_common.leases import LeaseStore
+
+NAMES = [f"guild:{i}" for i in range(6)]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(leases_mod, "time", SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+def _run(tmp_path, fn):
+    async def go():
+        a = LeaseStore(tmp_path / "leases.sqlite3", ttl=90, owner="a")
+        b = LeaseStore(tmp_path / "leases.sqlite3", ttl=90, owner="b")
+        try:
+            return await fn(a, b)
+        finally:
+            await a.close()
+            await b.close()
+
+    return asyncio.run(go())
+
+
+def test_each_lease_has_one_owner(tmp_path, clock):
+    async def go(a, b):
+        held_a = await a.renew(NAMES[:4])
+        held_b = await b.renew(NAMES)
+        return held_a, held_b, await a.owners()
+
+    held_a, held_b, owners = _run(tmp_path, go)
+    assert held_a == set(NAMES[:4])
+    assert held_b == set(NAMES[4:])
+    assert owners == {"a": 4, "b": 2}
+
+
+def test_expired_leases_pass_to_the_next_renewer(tmp_path, clock):
+    async def go(a, b):
+        await a.renew(NAMES)
+        clock.now += 60
+        assert await b.renew(NAMES) == set()  # a's leases are still live
+        clock.now += 31  # a stopped renewing 91s ago
+        return await b.renew(NAMES)
+
+    assert _run(tmp_path, go) == set(NAMES)
+
+
+def test_holds_stops_trusting_a_lease_early(tmp_path, clock):
+    async def go(a, b):
+        await a.renew(["gc"])
+        assert a.holds("gc") and not b.holds("gc")
+        clock.now += 59  # more than ttl * 2/3 since the last renewal
+        assert a.holds("gc")
+        clock.now += 2
+        return a.holds("gc")
+
+    assert _run(tmp_path, go) is False
+
+
+def test_renew_gives_up_names_no_longer_asked_for(tmp_path, clock):
+    async def go(a, b):
+        await a.renew(NAMES)
+        await a.renew(NAMES[:2])
+        return await b.renew(NAMES)
+
+    assert _run(tmp_path, go) == set(NAMES[2:])
+
+
+def test_release_all_hands_over_at_once(tmp_path, clock):
+    async def go(a, b):
+        await a.renew(NAMES)
+        await a.release_all()
+        assert not a.holds(NAMES[0])
+        return await b.renew(NAMES)
+
+    assert _run(tmp_path, go) == set(NAMES)
@@ -0,0 +1,170 @@
+import asyncio
+import copy
+
+import pytest
+
+from reason.members import MemberStore
+
+DEFAULTS = {"points": 0, "wallet": []}
+
+
+class MemoryBackend:
+    """Dict-backed MemberStore backend; ``gate`` (when set) holds writes until released."""
+
+    def __init__(self):
+        self.stored: dict = {}
+        self.reads = 0
+        self.writes: list[dict] = []
+        self.gate: asyncio.Event | None = None
+        self.fail = False
+
+    async def read(self, key):
+        self.reads += 1
+        return copy.deepcopy(self.stored.get(key, DEFAULTS))
+
+    async def write_many(self, records):
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.fail:
+            raise RuntimeError("disk full")
+        self.writes.append(records)
+        self.stored.update(copy.deepcopy(records))
+
+    async def delete(self, key):
+        self.stored.pop(key, None)
+
+    async def wallet_page(self, key, cursor, limit):
+        return None
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_changes_are_coalesced_into_one_write():
+    async def go():
+        backend = MemoryBackend()
+        store = MemberStore(backend)
+        for _ in range(3):
+            async with store.member(1, 2) as record:
+                record["points"] += 1
+        assert store.pending == 1 and backend.reads == 1
+        assert await store.flush() == 1
+        assert store.pending == 0
+        return backend
+
+    backend = _run(go())
+    assert backend.writes == [{(1, 2): {"points": 3, "wallet": []}}]
+
+
+def test_same_member_transactions_do_not_interleave():
+    async def go():
+        store = MemberStore(MemoryBackend())
+
+        async def bump():
+            async with store.member(1, 2) as record:
+                points = record["points"]
+                await asyncio.sleep(0)
+                record["points"] = points + 1
+
+        await asyncio.gather(*(bump() for _ in range(50)))
+        return (await store.read(1, 2))["points"]
+
+    assert _run(go()) == 50
+
+
+def test_flush_cancelled_before_writing_keeps_records_dirty():
+    async def go():
+        backend = MemoryBackend()
+        store = MemberStore(backend)
+        async with store.member(1, 2) as record:
+            record["points"] = 7
+        held, release = asyncio.Event(), asyncio.Event()
+
+        async def hold():
+            async with store.member(1, 2):
+                held.set()
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await held.wait()
+        flush = asyncio.create_task(store.flush())
+        await asyncio.sleep(0)  # now waiting to snapshot the held record
+        flush.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await flush
+        assert store.pending == 1 and not backend.writes
+        release.set()
+        await holder
+        assert await store.flush() == 1
+        return backend
+
+    assert _run(go()).stored == {(1, 2): {"points": 7, "wallet": []}}
+
+
+def test_flush_cancelled_mid_write_lets_the_write_land():
+    async def go():
+        backend = MemoryBackend()
+        backend.gate = asyncio.Event()
+        store = MemberStore(backend)
+        async with store.member(1, 2) as record:
+            record["points"] = 7
+        flush = asyncio.create_task(store.flush())
+        await asyncio.sleep(0)  # now parked inside write_many
+        flush.cancel()
+        await asyncio.sleep(0)
+        backend.gate.set()
+        with pytest.raises(asyncio.CancelledError):
+            await flush
+        assert store.pending == 0
+        return backend
+
+    assert _run(go()).stored == {(1, 2): {"points": 7, "wallet": []}}
+
+
+def test_failed_flush_keeps_records_dirty():
+    async def go():
+        backend = MemoryBackend()
+        backend.fail = True
+        store = MemberStore(backend)
+        async with store.member(1, 2) as record:
+            record["points"] = 1
+        with pytest.raises(RuntimeError):
+            await store.flush()
+        assert store.pending == 1
+        backend.fail = False
+        await store.flush()
+        return backend
+
+    assert _run(go()).stored[(1, 2)]["points"] == 1
+
+
+def test_eviction_keeps_unwritten_records():
+    async def go():
+        backend = MemoryBackend()
+        store = MemberStore(backend, max_cached=4)
+        for m in range(10):
+            async with store.member(1, m) as record:
+                record["points"] = m
+        assert store.cached == 10  # all dirty, none evictable
+        await store.flush()
+        for m in range(10, 20):
+            await store.read(1, m)
+        assert store.cached == 4
+        # Evicted records reload with what was flushed.
+        assert (await store.read(1, 3))["points"] == 3
+
+    _run(go())
+
+
+def test_delete_drops_a_pending_write():
+    async def go():
+        backend = MemoryBackend()
+        store = MemberStore(backend)
+        async with store.member(1, 2) as record:
+            record["points"] = 5
+        await store.delete(1, 2)
+        assert await store.flush() == 0
+        return backend
+
+    assert _run(go()).stored == {}
@@ -0,0 +1,148 @@
+import asyncio
+
+import pytest
+
+import replay_trace as rt
+from model import model as model_mod
+from reason_button_storm import MemoryConfig, MemoryStore
+
+GUILD, CHANNEL = 1, 5
+
+
+class FakeLeases:
+    """A LeaseStore stand-in holding exactly ``held``."""
+
+    def __init__(self, held=()):
+        self.held = set(held)
+
+    def holds(self, name):
+        return name in self.held
+
+    async def renew(self, names):
+        return self.held & set(names)
+
+    async def release_all(self):
+        self.held = set()
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def make_model(tmp_path, monkeypatch):
+    monkeypatch.setattr(MemoryConfig, "store", MemoryStore(0), raising=False)
+    monkeypatch.setattr(model_mod, "Config", MemoryConfig)
+    monkeypatch.setattr(model_mod, "cog_data_path", lambda cog=None, raw_name=None: tmp_path)
+
+    async def make(claim_window=0.0):
+        rest = rt.Rest()
+        bot = rt.FakeBot(rest)
+        bot.shard_count, bot.shards = 1, {0: None}
+        cog = model_mod.Model(bot)
+        await cog.cog_load()
+        guild = bot.guild(GUILD)
+        channel = guild.channel(CHANNEL)
+        await cog.config.guild(guild).drop_channel_id.set(CHANNEL)
+        await cog.config.guild(guild).claim_window.set(claim_window)
+        return cog, rest, guild, channel
+
+    return make
+
+
+async def _drop(cog, rest, guild, channel, message_id=1000):
+    channel.next_message_id = message_id
+    ctx = rt.FakeContext(rest, guild=guild, channel=channel, author=guild.member(1), message=None, slash=True)
+    await cog.model_debug.callback(cog, ctx, "dropnow")
+    return cog._states[guild.id]
+
+
+def _slash(rest, guild, channel, member_id, interaction_id=0):
+    return rt.FakeContext(
+        rest, guild=guild, channel=channel, author=guild.member(member_id), message=None, slash=True,
+        interaction_id=interaction_id,
+    )
+
+
+def test_slash_claim_ignored_without_the_lease(make_model):
+    async def go():
+        cog, rest, guild, channel = await make_model()
+        state = await _drop(cog, rest, guild, channel)
+        cog._leases = FakeLeases()  # another process holds guild:1 and answers
+        await cog.model_cmd.callback(cog, _slash(rest, guild, channel, 7))
+        ignored = (state.claimed_by, rest.calls["reply"])
+        cog._leases = FakeLeases({f"guild:{GUILD}"})
+        await cog.model_cmd.callback(cog, _slash(rest, guild, channel, 7))
+        await cog.cog_unload()
+        return ignored, state.claimed_by
+
+    (claimed, replies), winner = asyncio.run(go())
+    assert claimed is None and replies == 0
+    assert winner == 7
+
+
+def test_losing_the_lease_ends_the_active_drop(make_model):
+    async def go():
+        cog, rest, guild, channel = await make_model()
+        state = await _drop(cog, rest, guild, channel)
+        waiting = state.waiting_for_claim
+        cog._leases = FakeLeases({f"guild:{GUILD}"})
+        await cog._renew_leases()
+        assert state.active_message_id == 1000  # still ours
+        cog._leases = FakeLeases()
+        await cog._renew_leases()
+        await cog._outbound.close()
+        edits = rest.calls["edit"]
+        await cog.cog_unload()
+        return state, waiting, edits
+
+    state, waiting, edits = asyncio.run(go())
+    assert state.active_message_id is None and state.claimed_by is None
+    assert waiting is None or waiting.is_set()
+    assert edits == 1  # the drop message now says it faded
+
+
+def _recording(ctx, answers):
+    """Have ``ctx`` note each reply as (member id, "reveal" or the text)."""
+    async def reply(content=None, **kwargs):
+        answers.append((ctx.author.id, "reveal" if "embed" in kwargs else content))
+
+    ctx.reply = reply
+    return ctx
+
+
+def test_arbitration_picks_the_earliest_snowflake(make_model):
+    async def go():
+        cog, rest, guild, channel = await make_model(claim_window=0.05)
+        await cog.config.guild(guild).user_attempt_cooldown.set(0)
+        state = await _drop(cog, rest, guild, channel)
+        answers = []
+        # Arrival order 7, 8, 9, 7; Discord received 8 first.
+        await asyncio.gather(*(
+            cog.model_cmd.callback(cog, _recording(_slash(rest, guild, channel, member, snowflake), answers))
+            for member, snowflake in ((7, 30), (8, 10), (9, 20), (7, 40))
+        ))
+        await cog.cog_unload()
+        return state, answers, rest.calls["defer"]
+
+    state, answers, deferred = asyncio.run(go())
+    assert state.claimed_by == 8
+    lost = "❌ Someone else already revealed it."
+    assert sorted(answers) == [(7, lost), (7, lost), (8, "reveal"), (9, lost)]
+    assert deferred == 4  # every slash claim answered before the window closes
+
+
+def test_arbitration_does_not_tell_the_winner_they_lost_to_themselves(make_model):
+    async def go():
+        cog, rest, guild, channel = await make_model(claim_window=0.05)
+        await cog.config.guild(guild).user_attempt_cooldown.set(0)
+        state = await _drop(cog, rest, guild, channel)
+        answers = []
+        await asyncio.gather(*(
+            cog.model_cmd.callback(cog, _recording(_slash(rest, guild, channel, 7, snowflake), answers))
+            for snowflake in (20, 10)
+        ))
+        await cog.cog_unload()
+        return state, answers
+
+    state, answers = asyncio.run(go())
+    assert state.claimed_by == 7 and answers == [(7, "reveal")]
@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+import itscube_common.outbound as outbound_mod
+from itscube_common.outbound import EDIT, IDLE, NORMAL, URGENT, OutboundQueue
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(outbound_mod, "time", clock)
+    return clock
+
+
+async def _noop(fields):
+    return None
+
+
+def _queue(*jobs):
+    """A queue holding ``jobs`` of (key, channel id, priority) without starting its worker."""
+    queue = OutboundQueue()
+    for key, channel, priority in jobs:
+        queue._jobs[key] = outbound_mod._Job(priority, next(queue._seq), key, (EDIT, channel), _noop, {})
+        queue._enqueue(queue._jobs[key])
+    return queue
+
+
+def _drain(queue):
+    sent = []
+    while True:
+        job, _ = queue._next_ready()
+        if job is None:
+            return sent
+        sent.append(job.key)
+        queue._inflight.discard(job.key)
+
+
+def test_priority_then_order_within_a_route(clock):
+    queue = _queue(("a", 1, NORMAL), ("b", 1, IDLE), ("c", 1, URGENT), ("d", 1, NORMAL))
+    assert _drain(queue) == ["c", "a", "d", "b"]
+
+
+def test_a_rate_limited_route_does_not_hold_up_others(clock):
+    rate, burst = outbound_mod.ROUTE_LIMITS[EDIT]
+    queue = _queue(*[(f"busy{i}", 1, URGENT) for i in range(burst + 3)], ("quiet", 2, IDLE))
+    sent = _drain(queue)
+    assert sent[:burst] == [f"busy{i}" for i in range(burst)] and sent[burst:] == ["quiet"]
+    job, wait = queue._next_ready()
+    assert job is None and wait == pytest.approx(1 / rate)
+    clock.now += wait
+    assert _drain(queue) == [f"busy{burst}"]
+
+
+def test_calls_held_behind_a_busy_route_are_not_touched(clock, monkeypatch):
+    _, burst = outbound_mod.ROUTE_LIMITS[EDIT]
+    queue = _queue(*[(i, 1, NORMAL) for i in range(1000)])
+    assert len(_drain(queue)) == burst
+    pushes = []
+    real_push = outbound_mod.heapq.heappush
+    monkeypatch.setattr(outbound_mod.heapq, "heappush", lambda heap, item: (pushes.append(item), real_push(heap, item)))
+    for _ in range(10):
+        clock.now += 0.01
+        assert queue._next_ready()[0] is None
+    assert pushes == []
+
+
+def test_same_key_waits_for_the_call_in_flight_and_merges(clock):
+    async def go():
+        release = asyncio.Event()
+        calls = []
+
+        async def send(fields):
+            calls.append(dict(fields))
+            if len(calls) == 1:
+                await release.wait()
+
+        queue = OutboundQueue()
+        queue.submit("k", (EDIT, 1), send, content="one")
+        await asyncio.sleep(0)
+        queue.submit("k", (EDIT, 1), send, content="two")
+        queue.submit("k", (EDIT, 1), send, priority=URGENT, content="three")
+        queue.submit("other", (EDIT, 1), send, content="other")
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert calls == [{"content": "one"}, {"content": "other"}]
+        release.set()
+        await queue.close()
+        return calls
+
+    assert asyncio.run(go())[2:] == [{"content": "three"}]
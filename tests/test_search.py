@@ -0,0 +1,55 @@
+from reason.search import InvertedIndex, tokenize
+
+LINES = [
+    "the cat sat on the mat",
+    "a dog chased the cat",
+    "Catalogue of dogs",
+    "nothing to see here",
+    "the cat and the dog",
+    "cats are not dogs",
+]
+
+
+def _brute(query: str, skip=()) -> list[int]:
+    words = tokenize(query)
+    out = []
+    for i, line in enumerate(LINES):
+        toks = set(tokenize(line))
+        last = words[-1]
+        last_ok = last in toks or (len(last) >= 3 and any(t.startswith(last) for t in toks))
+        if all(w in toks for w in words[:-1]) and last_ok and i not in skip:
+            out.append(i)
+    return out
+
+
+def test_matches_brute_force():
+    index = InvertedIndex.build(LINES)
+    for query in ("cat", "the cat", "dog", "cat dog", "the", "dogs", "cat the", "Cat", "nothing here"):
+        assert index.search(query, limit=100) == _brute(query), query
+
+
+def test_last_word_matches_as_a_prefix():
+    index = InvertedIndex.build(LINES)
+    assert index.search("cat", limit=100) == [0, 1, 2, 4, 5]  # cat, catalogue, cats
+    assert index.search("the do", limit=100) == []  # too short to expand
+    assert index.search("the dog", limit=100) == [1, 4]
+
+
+def test_earlier_words_must_match_whole():
+    index = InvertedIndex.build(LINES)
+    assert index.search("ca the", limit=100) == []
+
+
+def test_limit_and_empty_queries():
+    index = InvertedIndex.build(LINES)
+    assert index.search("cat", limit=2) == [0, 1]
+    assert index.search("", limit=5) == []
+    assert index.search("!!", limit=5) == []
+    assert index.search("zebra", limit=5) == []
+
+
+def test_skipped_lines_do_not_count_toward_limit():
+    index = InvertedIndex.build(LINES)
+    disabled = {0, 1}
+    assert index.search("cat", limit=2, skip=disabled.__contains__) == [2, 4]
+    assert index.search("the cat", limit=100, skip=disabled.__contains__) == _brute("the cat", disabled)
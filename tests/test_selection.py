@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from reason.selection import FenwickTree, draw_index, new_bag, permute
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 100, 1000, 4097])
+def test_permute_is_a_bijection(size):
+    for seed in (0, 1, 0xDEADBEEF):
+        assert sorted(permute(i, size, seed) for i in range(size)) == list(range(size))
+
+
+def test_permute_depends_on_seed():
+    assert [permute(i, 100, 1) for i in range(100)] != [permute(i, 100, 2) for i in range(100)]
+
+
+def test_bag_draws_every_index_once_per_epoch():
+    rng = random.Random(3)
+    bag = new_bag(50, rng)
+    first = [draw_index(bag, 50, rng) for _ in range(50)]
+    second = [draw_index(bag, 50, rng) for _ in range(50)]
+    assert sorted(first) == sorted(second) == list(range(50))
+
+
+def test_bag_reseeds_when_size_changes():
+    rng = random.Random(5)
+    bag = new_bag(10, rng)
+    for _ in range(4):
+        draw_index(bag, 10, rng)
+    drawn = [draw_index(bag, 20, rng) for _ in range(20)]
+    assert bag[2] == 20
+    assert sorted(drawn) == list(range(20))
+
+
+def test_bag_reseeds_malformed_state():
+    bag: list[int] = []
+    assert 0 <= draw_index(bag, 5, random.Random(0)) < 5
+    assert len(bag) == 3
+
+
+def test_fenwick_prefix_and_weight():
+    rng = random.Random(7)
+    weights = [rng.randrange(10) for _ in range(37)]
+    tree = FenwickTree(weights)
+    assert len(tree) == 37
+    assert tree.total == sum(weights)
+    for i in range(len(weights) + 1):
+        assert tree.prefix(i) == sum(weights[:i])
+    for i, w in enumerate(weights):
+        assert tree.weight(i) == w
+
+
+def test_fenwick_add_keeps_prefixes():
+    rng = random.Random(11)
+    weights = [rng.randrange(1, 5) for _ in range(20)]
+    tree = FenwickTree(weights)
+    for _ in range(100):
+        i, delta = rng.randrange(20), rng.randrange(-1, 4)
+        if weights[i] + delta < 0:
+            continue
+        weights[i] += delta
+        tree.add(i, delta)
+    assert tree.total == sum(weights)
+    assert [tree.prefix(i) for i in range(21)] == [sum(weights[:i]) for i in range(21)]
+
+
+@pytest.mark.parametrize("n", [1, 2, 5, 16, 33])
+def test_fenwick_find_matches_brute_force(n):
+    rng = random.Random(n)
+    weights = [rng.choice((0, 0, 1, 3, 8)) for _ in range(n)]
+    weights[rng.randrange(n)] += 1  # at least one non-zero weight
+    tree = FenwickTree(weights)
+    for r in range(tree.total):
+        expected = next(i for i in range(n) if sum(weights[:i + 1]) > r)
+        assert tree.find(r) == expected
+        assert weights[tree.find(r)] > 0
+
+
+def test_fenwick_sample_never_picks_zero_weight():
+    tree = FenwickTree([0, 5, 0, 0, 1, 0])
+    rng = random.Random(1)
+    assert {tree.sample(rng) for _ in range(200)} == {1, 4}
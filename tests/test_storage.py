@@ -0,0 +1,148 @@
+import asyncio
+import random
+
+import pytest
+
+from reason.members import MemberStore, wallet_key, wallet_page
+from reason.storage import SQLiteMembers
+
+DEFAULTS = {"points": 0, "streak": 0, "wallet": []}
+KEY = (1, 2)
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+async def _with_store(path, fn):
+    store = SQLiteMembers(path, DEFAULTS)
+    try:
+        return await fn(store)
+    finally:
+        await store.db.close()
+        store.db._executor.shutdown()
+
+
+def _wallet_rows(store):
+    return store.db.run(
+        lambda conn: conn.execute("SELECT rowid, reason_id, ts FROM wallet ORDER BY rowid").fetchall()
+    )
+
+
+def test_round_trip_keeps_columns_extras_and_wallet_order(tmp_path):
+    record = {"points": 5, "streak": 2, "nick": "x", "wallet": [{"id": "b", "ts": 2}, {"id": "a", "ts": 1}]}
+
+    async def go(store):
+        await store.write_many({KEY: record})
+        return await store.read(KEY), await store.read((1, 3))
+
+    got, missing = _run(_with_store(tmp_path / "m.db", go))
+    assert {k: got[k] for k in record} == record
+    assert got["total_claims"] == 0  # columns the record left out come back as defaults
+    assert missing == DEFAULTS
+
+
+def test_wallet_is_written_as_a_diff(tmp_path):
+    wallet = [{"id": "a", "ts": 1}, {"id": "b", "ts": 2}, {"id": "b", "ts": 2}]
+
+    async def go(store):
+        await store.write_many({KEY: {"points": 0, "wallet": wallet}})
+        before = await _wallet_rows(store)
+        # One duplicate stolen, one new claim: the untouched rows keep their rowids.
+        await store.write_many({KEY: {"points": 0, "wallet": [wallet[0], wallet[1], {"id": "c", "ts": 3}]}})
+        after = await _wallet_rows(store)
+        return before, after, await store.read(KEY)
+
+    before, after, record = _run(_with_store(tmp_path / "m.db", go))
+    # One surplus row deleted and one inserted; the other two rows are untouched.
+    assert len(set(before) & set(after)) == 2
+    assert [row[1:] for row in set(after) - set(before)] == [("c", 3)]
+    assert sorted(map(wallet_key, record["wallet"])) == [(1, "a"), (2, "b"), (3, "c")]
+
+
+def test_member_store_writes_only_wallet_changes(tmp_path):
+    rng = random.Random(7)
+
+    async def go(store):
+        members = MemberStore(store)
+        statements: list[str] = []
+        expected = []
+        for round_ in range(20):
+            async with members.member(*KEY) as record:
+                for _ in range(rng.randint(1, 4)):
+                    record["wallet"].append({"id": rng.choice("abc"), "ts": round_})
+                if len(record["wallet"]) > 30:
+                    del record["wallet"][:-30]  # the claim path's trim
+                expected = list(record["wallet"])
+            await store.db.run(lambda conn: conn.set_trace_callback(statements.append))
+            await members.flush()
+            await store.db.run(lambda conn: conn.set_trace_callback(None))
+        return statements, expected, await store.read(KEY)
+
+    statements, expected, record = _run(_with_store(tmp_path / "m.db", go))
+    # Flushes never read the stored wallet back...
+    assert not [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+    # ...and the trims deleted the oldest rows, leaving the wallet in order.
+    assert record["wallet"] == expected
+
+
+def test_delete_removes_member_and_wallet(tmp_path):
+    async def go(store):
+        await store.write_many({KEY: {"points": 3, "wallet": [{"id": "a", "ts": 1}]}})
+        await store.delete(KEY)
+        return await store.read(KEY), await store.all_points()
+
+    record, points = _run(_with_store(tmp_path / "m.db", go))
+    assert record == DEFAULTS and points == {}
+
+
+def _pages(fetch, limit):
+    """Walk every page via the cursor; returns the pages and their start indexes."""
+    pages, starts, cursor = [], [], None
+    while True:
+        start, entries, total = fetch(cursor, limit)
+        if not entries:
+            return pages, starts, total
+        pages.append(entries)
+        starts.append(start)
+        cursor = wallet_key(entries[-1])
+
+
+def _wallet(n, seed):
+    rng = random.Random(seed)
+    # Few distinct timestamps, so ties are broken by reason id.
+    return [{"id": f"r{rng.randrange(n)}", "ts": rng.randrange(4)} for _ in range(n)]
+
+
+@pytest.mark.parametrize("n,limit", [(0, 3), (1, 3), (3, 3), (10, 3), (10, 1), (7, 50)])
+def test_wallet_page_walks_newest_first(n, limit):
+    wallet = _wallet(n, n)
+    pages, starts, total = _pages(lambda cursor, lim: wallet_page(wallet, cursor, lim), limit)
+    flat = [e for page in pages for e in page]
+    expected = sorted(wallet, key=wallet_key, reverse=True)
+    assert total == n
+    # Identical (id, ts) duplicates collapse at a page boundary, so compare the distinct keys.
+    assert sorted({wallet_key(e) for e in flat}, reverse=True) == sorted({wallet_key(e) for e in expected}, reverse=True)
+    assert all(len(page) <= limit for page in pages)
+    assert starts == sorted(starts) and (not starts or starts[0] == 0)
+
+
+def test_wallet_page_cursor_past_the_end():
+    wallet = [{"id": "a", "ts": 5}]
+    assert wallet_page(wallet, (0, ""), 10) == (1, [], 1)
+    assert wallet_page(wallet, (9, "z"), 10) == (0, wallet, 1)
+
+
+@pytest.mark.parametrize("n,limit", [(0, 3), (1, 1), (10, 3), (25, 4)])
+def test_sqlite_wallet_page_matches_in_memory(tmp_path, n, limit):
+    wallet = _wallet(n, n + 100)
+
+    async def go(store):
+        await store.write_many({KEY: {"points": 0, "wallet": wallet}})
+        cursors = [None] + [wallet_key(e) for e in wallet] + [(-1, ""), (99, "z")]
+        return [(c, await store.wallet_page(KEY, c, limit)) for c in cursors]
+
+    for cursor, got in _run(_with_store(tmp_path / "m.db", go)):
+        start, entries, total = wallet_page(wallet, cursor, limit)
+        assert got[0] == start and got[2] == total
+        assert [wallet_key(e) for e in got[1]] == [wallet_key(e) for e in entries]
@@ -0,0 +1,47 @@
+import random
+
+from reason.votes import GuildVotes, TopK
+
+
+def _brute_top(counts: dict[str, int], n: int) -> list[tuple[str, int]]:
+    return sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))[:n]
+
+
+def test_topk_matches_brute_force_as_counts_grow():
+    rng = random.Random(2)
+    top = TopK(10)
+    counts: dict[str, int] = {}
+    for _ in range(2000):
+        key = f"r{rng.randrange(60)}"
+        counts[key] = counts.get(key, 0) + 1
+        top.update(key, counts[key])
+        assert top.top(10) == _brute_top(counts, 10)
+
+
+def test_topk_heap_stays_bounded_when_the_same_keys_keep_rising():
+    top = TopK(5)
+    for count in range(1, 200):
+        for key in "abcde":
+            top.update(key, count)
+    assert len(top._heap) <= 10
+    assert top.top(5) == [(key, 199) for key in "abcde"]
+
+
+def test_topk_ignores_keys_below_the_minimum_when_full():
+    top = TopK(2)
+    top.update("a", 5)
+    top.update("b", 4)
+    top.update("c", 1)
+    assert top.top(5) == [("a", 5), ("b", 4)]
+    top.update("c", 6)
+    assert top.top(5) == [("c", 6), ("a", 5)]
+
+
+def test_guild_votes_tracks_dirty_ids_and_weights():
+    votes = GuildVotes({"x": [1, 0]})
+    assert votes.top.top(1) == [("x", 1)]
+    before, after = votes.vote("y", won=True)
+    assert (before, after) == (4, 6)
+    votes.vote("x", won=False)
+    assert votes.take_dirty() == {"x": [1, 1], "y": [1, 0]}
+    assert votes.take_dirty() == {}